@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Benchmark compression ratio and throughput per codec and level.
+
+Saves typical payloads through each CompressedHandler into memory and
+reports the compression ratio plus compress/decompress MB/s, measured
+against the uncompressed size.
+
+Run with: uv run python scripts/bench_compression.py
+       or: uv run python scripts/bench_compression.py --levels 1 9 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.compression import COMPRESSIONS, CompressedHandler
+from files_api.files.handlers.json_handler import JsonHandler
+from files_api.files.handlers.numpy_handler import NumpyHandler
+
+
+def make_payloads() -> dict[str, tuple[IFileHandler, object]]:
+    """Build payloads resembling what is stored, with their base handler."""
+    rng = np.random.default_rng(0)
+    config = {
+        f"section{i}": {
+            f"key{j}": {"value": j, "label": f"item-{j}", "enabled": True} for j in range(50)
+        }
+        for i in range(200)
+    }
+    sparse = np.zeros((1000, 1000), dtype=np.float32)
+    mask = rng.random(sparse.shape) < 0.05
+    sparse[mask] = rng.random(mask.sum(), dtype=np.float32)
+    return {
+        "json-config": (JsonHandler("json"), config),
+        "sparse-f32": (NumpyHandler(), sparse),
+        "random-f64": (NumpyHandler(), rng.random(500_000)),
+    }
+
+
+def best_time(fn, repeat: int) -> float:
+    """Return the fastest of repeat runs in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def encode(handler: IFileHandler, obj: object) -> bytes:
+    buffer = BytesIO()
+    handler.to_file(obj, buffer)
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9], help="levels to test")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    args = parser.parse_args()
+
+    print(
+        f"{'payload':<12} {'codec':<6} {'level':>5} {'ratio':>7} "
+        f"{'compress MB/s':>14} {'decompress MB/s':>16}"
+    )
+    for payload_name, (base, obj) in make_payloads().items():
+        raw_mb = len(encode(base, obj)) / 1e6
+        for compression in COMPRESSIONS:
+            for level in args.levels:
+                handler = CompressedHandler(base, compression, level)
+                data = encode(handler, obj)
+                write = best_time(lambda h=handler, o=obj: encode(h, o), args.repeat)
+                read = best_time(lambda h=handler, d=data: h.from_file(BytesIO(d)), args.repeat)
+                print(
+                    f"{payload_name:<12} {compression:<6} {level:>5} "
+                    f"{raw_mb * 1e6 / len(data):>7.1f} {raw_mb / write:>14.1f} {raw_mb / read:>16.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
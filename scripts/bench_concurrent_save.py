@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Benchmark LocalFileSystem.save() with many concurrent writer processes.
+
+Starts --writers processes that each save --keys small JSON objects into
+one store, once on disjoint keys (pure throughput) and once all on the
+same keys (every key contended by every writer). Reports saves/s and
+checks that each contended key was won by exactly one writer.
+
+Run with: uv run python scripts/bench_concurrent_save.py
+       or: uv run python scripts/bench_concurrent_save.py --writers 8 --keys 5000
+"""
+
+import argparse
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from files_api.files import LocalFileSystem
+from files_api.files.exceptions import FileExistsError
+
+
+def writer(base_path: str, writer_id: int, keys: int, shared: bool, use_index: bool) -> int:
+    """Save every key; returns how many saves succeeded."""
+    fs = LocalFileSystem(base_path, use_index=use_index)
+    won = 0
+    for i in range(keys):
+        key = f"key{i}" if shared else f"w{writer_id}-key{i}"
+        try:
+            fs.save(key, {"writer": writer_id, "i": i})
+            won += 1
+        except FileExistsError:
+            pass
+    return won
+
+
+def run(args: argparse.Namespace, shared: bool) -> None:
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        LocalFileSystem(tmpdir, use_index=args.index)
+        with context.Pool(args.writers) as pool:
+            start = time.perf_counter()
+            won = pool.starmap(
+                writer,
+                [(tmpdir, w, args.keys, shared, args.index) for w in range(args.writers)],
+            )
+            elapsed = time.perf_counter() - start
+        stored = LocalFileSystem(tmpdir, use_index=False).count()
+
+    attempts = args.writers * args.keys
+    expected = args.keys if shared else attempts
+    status = "ok" if sum(won) == stored == expected else "MISMATCH"
+    print(
+        f"{'contended' if shared else 'disjoint':>9}: {attempts} saves in {elapsed:6.2f} s "
+        f"({attempts / elapsed:9.0f} saves/s), {sum(won)} succeeded, {stored} stored: {status}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=32, help="writer processes")
+    parser.add_argument("--keys", type=int, default=1000, help="keys per writer")
+    parser.add_argument("--no-index", dest="index", action="store_false", help="no key index")
+    args = parser.parse_args()
+    # Lost races are expected here; don't print a warning for each
+    logging.disable(logging.WARNING)
+    print(f"{args.writers} writers x {args.keys} keys (index={args.index})")
+    run(args, shared=False)
+    run(args, shared=True)
+
+
+if __name__ == "__main__":
+    main()
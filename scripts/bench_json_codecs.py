@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Benchmark JSON codec throughput on typical payload shapes.
+
+Encodes and decodes each payload (wrapped in the handler envelope) with
+every available codec and reports MB/s of encoded JSON.
+
+Run with: uv run python scripts/bench_json_codecs.py
+       or: uv run python scripts/bench_json_codecs.py --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from files_api.files.handlers.json_codecs import JSON_CODECS, JsonCodec
+
+
+def make_payloads() -> dict[str, object]:
+    """Build payloads resembling what is stored as JSON."""
+    rng = np.random.default_rng(0)
+    records = [
+        {
+            "id": i,
+            "name": f"user-{i}",
+            "score": float(i) / 7,
+            "tags": ["a", "b"],
+            "active": i % 2 == 0,
+        }
+        for i in range(20_000)
+    ]
+    config = {
+        f"section{i}": {
+            f"key{j}": {"value": j, "label": f"é{j}", "enabled": True} for j in range(50)
+        }
+        for i in range(200)
+    }
+    return {
+        "records": records,
+        "config": config,
+        "numbers": rng.random(200_000).tolist(),
+        "numpy": {"weights": rng.random((500, 200)), "step": np.int64(3)},
+    }
+
+
+def best_time(fn, repeat: int) -> float:
+    """Return the fastest of repeat runs in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    args = parser.parse_args()
+
+    codecs: list[JsonCodec] = []
+    for name, cls in JSON_CODECS.items():
+        try:
+            codecs.append(cls())
+        except ImportError:
+            print(f"skipping {name}: not installed")
+
+    print(f"{'payload':<10} {'codec':<8} {'size MB':>8} {'encode MB/s':>12} {'decode MB/s':>12}")
+    for payload_name, payload in make_payloads().items():
+        envelope = {"__type__": type(payload).__name__, "__version__": 1, "data": payload}
+        for codec in codecs:
+            data = codec.encode(envelope)
+            mb = len(data) / 1e6
+            encode = best_time(lambda c=codec, e=envelope: c.encode(e), args.repeat)
+            decode = best_time(lambda c=codec, d=data: c.decode(d), args.repeat)
+            print(
+                f"{payload_name:<10} {codec.name:<8} {mb:>8.2f} {mb / encode:>12.1f} {mb / decode:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
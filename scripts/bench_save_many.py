@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Benchmark save_many() executors on JSON-heavy batches.
+
+Saves --objects nested dicts with each save_many() executor ("serial",
+"thread" and "process") and reports objects/s and the speedup over
+serial. JSON encoding holds the GIL, so threads can't beat serial by
+much while worker processes scale with the number of cores.
+
+Run with: uv run python scripts/bench_save_many.py
+       or: uv run python scripts/bench_save_many.py --objects 500 --codec orjson
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from files_api.files import LocalFileSystem
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.process_pool import EXECUTORS
+
+
+def make_object(i: int, width: int) -> dict:
+    """A nested dict that takes a while to encode."""
+    return {
+        "id": i,
+        "rows": [
+            {"row": j, "name": f"item-{i}-{j}", "score": j / 7, "tags": ["a", "b", "c"]}
+            for j in range(width)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objects", type=int, default=200, help="objects per batch")
+    parser.add_argument("--width", type=int, default=2000, help="rows per object")
+    parser.add_argument("--codec", default="json", help='JSON codec ("json" or "orjson")')
+    parser.add_argument("--processes", type=int, default=None, help="worker processes")
+    args = parser.parse_args()
+
+    items = {f"obj/{i}": make_object(i, args.width) for i in range(args.objects)}
+    print(
+        f"{args.objects} objects x {args.width} rows, codec={args.codec}, "
+        f"cpus={os.cpu_count()}, processes={args.processes or os.cpu_count()}"
+    )
+
+    baseline = None
+    for executor in EXECUTORS:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(
+                tmpdir,
+                factory=FileHandlerFactory(json_codec=args.codec),
+                max_processes=args.processes,
+            )
+            if executor == "process":
+                # Start the workers outside the timed run
+                fs.save_many({"warmup": {}}, executor="process")
+            start = time.perf_counter()
+            result = fs.save_many(items, executor=executor)
+            elapsed = time.perf_counter() - start
+            fs.close()
+        result.raise_first()
+        baseline = baseline or elapsed
+        print(
+            f"{executor:>8}: {elapsed:7.2f} s  {args.objects / elapsed:8.1f} objects/s  "
+            f"{baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
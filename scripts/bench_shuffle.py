@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Benchmark the shuffle/delta array handler against plain .npy.
+
+Reports the compression ratio and encode/decode GB/s (of uncompressed
+array bytes) for .npy, gzip-compressed .npy and several .npc settings.
+
+Run with: uv run python scripts/bench_shuffle.py
+       or: uv run python scripts/bench_shuffle.py --size 20000000 --workers 4
+"""
+
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.compression import CompressedHandler
+from files_api.files.handlers.numpy_handler import NumpyHandler
+from files_api.files.handlers.shuffle_handler import ShuffleHandler
+
+
+def make_arrays(size: int) -> dict[str, np.ndarray]:
+    """Build numeric arrays resembling what is stored."""
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 200, size)
+    return {
+        "signal-f32": (np.sin(t) + 0.01 * rng.standard_normal(size)).astype(np.float32),
+        "timestamps-f64": 1.7e9 + np.cumsum(rng.exponential(0.01, size)),
+        "counters-i64": np.cumsum(rng.integers(0, 5, size)),
+        "random-f64": rng.random(size),
+    }
+
+
+def make_handlers(workers: int | None) -> dict[str, IFileHandler]:
+    return {
+        "npy": NumpyHandler(),
+        "npy+gzip1": CompressedHandler(NumpyHandler(), "gzip", 1),
+        "npc zlib": ShuffleHandler(max_workers=workers),
+        "npc zlib+delta": ShuffleHandler(delta=True, max_workers=workers),
+        "npc lzma+delta": ShuffleHandler("lzma", delta=True, max_workers=workers),
+    }
+
+
+def best_time(fn, repeat: int) -> float:
+    """Return the fastest of repeat runs in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def encode(handler: IFileHandler, arr: np.ndarray) -> bytes:
+    buffer = BytesIO()
+    handler.to_file(arr, buffer)
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5_000_000, help="elements per array")
+    parser.add_argument("--workers", type=int, default=None, help="threads per .npc file")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    args = parser.parse_args()
+
+    print(f"{'array':<15} {'format':<15} {'ratio':>6} {'encode GB/s':>12} {'decode GB/s':>12}")
+    for array_name, arr in make_arrays(args.size).items():
+        gb = arr.nbytes / 1e9
+        for handler_name, handler in make_handlers(args.workers).items():
+            data = encode(handler, arr)
+            write = best_time(lambda h=handler, a=arr: encode(h, a), args.repeat)
+            read = best_time(lambda h=handler, d=data: h.from_file(BytesIO(d)), args.repeat)
+            np.testing.assert_array_equal(handler.from_file(BytesIO(data)), arr)
+            print(
+                f"{array_name:<15} {handler_name:<15} {arr.nbytes / len(data):>6.2f} "
+                f"{gb / write:>12.2f} {gb / read:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Benchmark SQLiteFileSystem against LocalFileSystem on many small objects.
+
+Saves --keys small JSON objects into each backend (in batches of
+--batch keys through save_many), then times random get()s, exists()
+and count(prefix), and reports the on-disk footprint.
+
+Run with: uv run python scripts/bench_sqlite.py
+       or: uv run python scripts/bench_sqlite.py --keys 100000 --reads 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from files_api.files import LocalFileSystem, SQLiteFileSystem
+from files_api.files.interface import IFileSystem
+
+
+def key_for(i: int) -> str:
+    return f"user-{i % 1000:03d}-{i:08d}"
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def disk_usage(path: Path) -> int:
+    """Bytes allocated on disk under path (st_blocks counts 512-byte units)."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.stat(os.path.join(root, name)).st_blocks * 512
+    return total
+
+
+def bench(name: str, fs: IFileSystem, root: Path, args: argparse.Namespace) -> None:
+    def load() -> None:
+        for start in range(0, args.keys, args.batch):
+            stop = min(start + args.batch, args.keys)
+            fs.save_many({key_for(i): {"id": i, "name": f"user-{i}"} for i in range(start, stop)})
+
+    rng = random.Random(0)
+    sample = [key_for(rng.randrange(args.keys)) for _ in range(args.reads)]
+
+    write = timed(load)
+    read = timed(lambda: [fs.get(key) for key in sample])
+    exists = timed(lambda: [fs.exists(key) for key in sample])
+    count = timed(lambda: [fs.count(f"user-{i:03d}-") for i in range(100)])
+    print(
+        f"{name:<8} {args.keys / write:>12,.0f} {args.reads / read:>12,.0f} "
+        f"{args.reads / exists:>12,.0f} {count * 10:>14.2f} {disk_usage(root) / 1e6:>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1_000_000, help="objects to store")
+    parser.add_argument("--reads", type=int, default=100_000, help="random reads to time")
+    parser.add_argument("--batch", type=int, default=10_000, help="keys per save_many call")
+    args = parser.parse_args()
+
+    print(
+        f"{'backend':<8} {'saves/s':>12} {'gets/s':>12} {'exists/s':>12} "
+        f"{'count ms/call':>14} {'disk MB':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / "local"
+        bench("local", LocalFileSystem(root), root, args)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        with SQLiteFileSystem(root / "objects.db") as fs:
+            bench("sqlite", fs, root, args)
+
+
+if __name__ == "__main__":
+    main()
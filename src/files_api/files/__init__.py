@@ -1,21 +1,50 @@
 """Intelligent file storage API with automatic format selection."""
 
+from files_api.files.async_fs import AsyncFileSystem
+from files_api.files.batch import BatchResult
+from files_api.files.cache import CachedFileSystem, CacheStats
 from files_api.files.exceptions import (
     DeserializationError,
     FileExistsError,
     FileNotFoundError,
     FilesError,
+    MemoryLimitError,
+    ObjectStoreError,
     SerializationError,
 )
+from files_api.files.info import ObjectInfo
 from files_api.files.interface import IFileSystem
+from files_api.files.layout import migrate_layout
 from files_api.files.local import LocalFileSystem
+from files_api.files.memory import MemoryFileSystem
+from files_api.files.object_store import ObjectStoreFileSystem
+from files_api.files.pack import PackFileSystem
+from files_api.files.sqlite_fs import SQLiteFileSystem
+from files_api.files.tiered import Tier, TieredFileSystem, TierStats
+from files_api.files.write_behind import WriteBehindFileSystem
 
 __all__ = [
+    "AsyncFileSystem",
+    "BatchResult",
+    "CacheStats",
+    "CachedFileSystem",
     "DeserializationError",
     "FileExistsError",
     "FileNotFoundError",
     "FilesError",
     "IFileSystem",
     "LocalFileSystem",
+    "MemoryFileSystem",
+    "MemoryLimitError",
+    "ObjectInfo",
+    "ObjectStoreError",
+    "ObjectStoreFileSystem",
+    "PackFileSystem",
+    "SQLiteFileSystem",
     "SerializationError",
+    "Tier",
+    "TierStats",
+    "TieredFileSystem",
+    "WriteBehindFileSystem",
+    "migrate_layout",
 ]
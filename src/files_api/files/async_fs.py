@@ -0,0 +1,218 @@
+"""Asyncio front-end for any IFileSystem."""
+
+import asyncio
+import contextlib
+import functools
+import logging
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from files_api.files.batch import BatchResult
+from files_api.files.interface import IFileSystem
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncFileSystem:
+    """Asyncio counterpart to IFileSystem.
+
+    Wraps a synchronous file system and runs every blocking call (disk
+    I/O plus handler encode/decode) on an executor, so the event loop is
+    never blocked. Handler selection is unchanged since the wrapped file
+    system still goes through its FileHandlerFactory.
+
+    At most ``max_concurrency`` calls are in flight at once; further calls
+    wait on a semaphore without occupying executor threads, and can be
+    cancelled while waiting. A call that is cancelled after it started
+    still runs to completion in its worker thread, but its result is
+    discarded.
+    """
+
+    def __init__(
+        self,
+        fs: IFileSystem,
+        max_concurrency: int = 8,
+        executor: Executor | None = None,
+    ):
+        """Initialize the async file system.
+
+        Args:
+            fs: The synchronous file system to wrap.
+            max_concurrency: Maximum number of blocking calls in flight.
+            executor: Executor to run blocking calls on. A private thread
+                pool of ``max_concurrency`` threads is created if omitted.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        self.fs = fs
+        self.max_concurrency = max_concurrency
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_concurrency, thread_name_prefix="files-async"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        logger.info(
+            "Initialized AsyncFileSystem over %s (max_concurrency=%d)",
+            type(fs).__name__,
+            max_concurrency,
+        )
+
+    async def save(self, key: str, obj: Any) -> None:
+        """Save object with given key.
+
+        Args:
+            key: The key to save the object under (without extension).
+            obj: The object to save.
+
+        Raises:
+            FileExistsError: If a file with this key already exists.
+            SerializationError: If the object cannot be serialized.
+        """
+        await self._run(self.fs.save, key, obj)
+
+    async def get(self, key: str) -> Any:
+        """Get object by key.
+
+        Args:
+            key: The key to retrieve (without extension).
+
+        Returns:
+            The deserialized object.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the file cannot be deserialized.
+        """
+        return await self._run(self.fs.get, key)
+
+    async def count(self, prefix: str = "") -> int:
+        """Count files matching prefix.
+
+        Args:
+            prefix: Optional prefix to filter files.
+
+        Returns:
+            The number of matching files.
+        """
+        return await self._run(self.fs.count, prefix)
+
+    async def keys(self, prefix: str = "") -> list[str]:
+        """List keys matching prefix.
+
+        Args:
+            prefix: Optional prefix to filter keys.
+
+        Returns:
+            The matching keys (without extension).
+        """
+        return await self._run(lambda: list(self.fs.keys(prefix)))
+
+    async def delete(self, key: str) -> None:
+        """Delete the object stored under key.
+
+        Args:
+            key: The key to delete (without extension).
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            NotImplementedError: If the wrapped file system can't delete.
+        """
+        await self._run(self.fs.delete, key)
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists.
+
+        Args:
+            key: The key to check (without extension).
+
+        Returns:
+            True if the key exists, False otherwise.
+        """
+        return await self._run(self.fs.exists, key)
+
+    async def save_many(self, items: Mapping[str, Any]) -> BatchResult:
+        """Save many objects concurrently, collecting per-key errors.
+
+        Cancelling the batch cancels every key that hasn't started yet.
+
+        Args:
+            items: Mapping of key (without extension) to object.
+
+        Returns:
+            A BatchResult with None for every saved key and the exception
+            for every key that failed.
+        """
+        keys = list(items)
+        outcomes = await asyncio.gather(
+            *(self.save(key, items[key]) for key in keys), return_exceptions=True
+        )
+        return self._to_result(keys, outcomes)
+
+    async def get_many(self, keys: Iterable[str]) -> BatchResult:
+        """Get many objects concurrently, collecting per-key errors.
+
+        Cancelling the batch cancels every key that hasn't started yet.
+
+        Args:
+            keys: The keys to retrieve (without extension).
+
+        Returns:
+            A BatchResult with the loaded object for every key that was
+            read and the exception for every key that failed.
+        """
+        unique = list(dict.fromkeys(keys))
+        outcomes = await asyncio.gather(*(self.get(key) for key in unique), return_exceptions=True)
+        return self._to_result(unique, outcomes)
+
+    async def close(self) -> None:
+        """Shut down the private executor, waiting for running calls."""
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self._executor.shutdown, wait=True)
+            )
+
+    async def __aenter__(self) -> "AsyncFileSystem":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the executor under the concurrency limit.
+
+        The semaphore slot is released when the worker actually finishes,
+        not when the awaiting coroutine is cancelled, so cancelled calls
+        can't push the number of busy threads past the limit.
+        """
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._release_from(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release_from(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Release a semaphore slot from any thread."""
+        # If the loop already closed, nobody is left waiting on the slot
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(self._semaphore.release)
+
+    @staticmethod
+    def _to_result(keys: list[str], outcomes: list[Any]) -> BatchResult:
+        """Split gathered outcomes into a BatchResult."""
+        result = BatchResult()
+        for key, outcome in zip(keys, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                logger.warning("Async batch operation for key %r failed: %s", key, outcome)
+                result.errors[key] = outcome
+            else:
+                result.values[key] = outcome
+        return result
@@ -0,0 +1,335 @@
+"""Atomic file publishing with configurable fsync durability."""
+
+import contextlib
+import errno
+import fcntl
+import io
+import logging
+import os
+import secrets
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("none", "batch", "always")
+
+# link() errors meaning the file system has no hard links
+_NO_LINKS = {errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EMLINK}
+
+
+class Durability:
+    """Decides when written files and their directories are fsynced.
+
+    Modes:
+        none: Never fsync; the OS writes data back on its own schedule.
+        batch: Group commit. Written files are remembered and fsynced,
+            together with their directories, once ``batch_size`` writes are
+            pending or the oldest has waited ``batch_interval`` seconds
+            (checked on each write), or when sync() is called. A file
+            written many times (e.g. appended to) is fsynced once.
+        always: fsync every file before it is published and its directory
+            right after, so a returned save survives a crash.
+
+    Publishing is atomic in every mode; the mode only trades how many
+    recent writes a crash may lose for throughput.
+    """
+
+    def __init__(self, mode: str = "none", batch_size: int = 128, batch_interval: float = 1.0):
+        """Initialize the policy.
+
+        Args:
+            mode: One of "none", "batch" or "always".
+            batch_size: Pending writes that trigger a group commit ("batch").
+            batch_interval: Maximum age in seconds of the oldest pending
+                file before a group commit ("batch").
+
+        Raises:
+            ValueError: If mode is unknown.
+        """
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: '{mode}'")
+        self.mode = mode
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._pending: dict[Path, None] = {}  # ordered set
+        self._writes = 0
+        self._oldest = 0.0
+        self._lock = threading.Lock()
+
+    def before_publish(self, fd: int) -> None:
+        """Called with the temp file's descriptor before it is renamed."""
+        if self.mode == "always":
+            os.fsync(fd)
+
+    def after_publish(self, path: Path) -> None:
+        """Called once a file has been renamed to its final path."""
+        if self.mode == "always":
+            fsync_dir(path.parent)
+        elif self.mode == "batch":
+            with self._lock:
+                if not self._pending:
+                    self._oldest = time.monotonic()
+                self._pending[path] = None
+                self._writes += 1
+                due = (
+                    self._writes >= self.batch_size
+                    or time.monotonic() - self._oldest >= self.batch_interval
+                )
+            if due:
+                self.sync()
+
+    def after_update(self, fd: int, path: Path) -> None:
+        """Called once an existing file has been modified in place."""
+        if self.mode == "always":
+            os.fsync(fd)
+        elif self.mode == "batch":
+            self.after_publish(path)
+
+    def sync(self) -> None:
+        """Group-commit every pending file and directory."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._writes = 0
+        if not pending:
+            return
+        for path in pending:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        for directory in {path.parent for path in pending}:
+            fsync_dir(directory)
+        logger.debug("Group-committed %d files", len(pending))
+
+
+class AtomicWriter(io.BufferedWriter):
+    """Write-only file that appears at its final path only when complete.
+
+    Data goes to a hidden temp file in the destination directory (or a
+    given temp directory), which is renamed over the final path on a
+    clean close. If the ``with`` block raises (or the writer is garbage
+    collected unclosed), the temp file is removed instead, so readers
+    never see partial files and a failed write never blocks the key.
+
+    An exclusive writer publishes under a claim: a lock file it creates
+    with O_EXCL and holds an exclusive flock on. Writers that find a
+    locked claim fail with FileExistsError. Stores whose keys can be saved
+    under several names (one per extension) pass a claim name shared by
+    all of them, plus a ``stored`` check the claim holder runs for every
+    name. The holder then hard-links its temp file to the final path, or,
+    on file systems without hard links, renames it there, so the final
+    path only ever holds complete data, and removes the claim. The kernel
+    drops the flock of a writer that crashes, so the claim it leaves is
+    taken over at once by the next writer.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        durability: Durability,
+        exclusive: bool = False,
+        claim: Path | None = None,
+        stored: Callable[[], bool] | None = None,
+        tmp_dir: Path | None = None,
+    ):
+        """Create the temp file next to path, or in tmp_dir.
+
+        Args:
+            path: The final path to publish to.
+            durability: The fsync policy to apply when publishing.
+            exclusive: Fail with FileExistsError instead of replacing an
+                existing file.
+            claim: For exclusive writers, the lock file reserving the
+                key while publishing (defaults to a hidden name next to path).
+            stored: For exclusive writers, returns True if the key is
+                stored under a name other than path; asked while holding
+                the claim.
+            tmp_dir: Directory for the temp file, on the same file system
+                as path. Keeps failed writes from touching path's directory.
+        """
+        self.path = path
+        tmp_name = f".{path.name}.{secrets.token_hex(8)}.tmp"
+        self.tmp_path = (tmp_dir or path.parent) / tmp_name
+        self.exclusive = exclusive
+        self.claim = claim if claim is not None else path.with_name(f".{path.name}.claim")
+        self._stored = stored
+        self._durability = durability
+        fd = os.open(self.tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        super().__init__(io.FileIO(fd, "wb"))
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def __del__(self) -> None:
+        # Also reached when __init__ failed before the buffer was set up
+        with contextlib.suppress(ValueError, AttributeError):
+            if not self.closed:
+                self.discard()
+
+    def close(self) -> None:
+        """Flush, apply the durability policy and publish the file."""
+        if self.closed:
+            return
+        try:
+            self.flush()
+            self._durability.before_publish(self.fileno())
+        except BaseException:
+            self.discard()
+            raise
+        super().close()
+        try:
+            self._publish()
+        except BaseException:
+            self.tmp_path.unlink(missing_ok=True)
+            raise
+        self._durability.after_publish(self.path)
+        logger.debug("Published %s", self.path)
+
+    def discard(self) -> None:
+        """Close and delete the temp file without publishing."""
+        if not self.closed:
+            # The data is thrown away, so a failing final flush is irrelevant
+            with contextlib.suppress(OSError, ValueError):
+                super().close()
+        self.tmp_path.unlink(missing_ok=True)
+        logger.debug("Discarded %s", self.tmp_path)
+
+    def _publish(self) -> None:
+        """Move the finished temp file to its final path."""
+        try:
+            self._move()
+        except FileNotFoundError:
+            if self.path.parent.is_dir():
+                raise
+            # Only created now, so failed writes don't create directories
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._move()
+
+    def _move(self) -> None:
+        """Rename, or claim and link, the temp file to its final path."""
+        if not self.exclusive:
+            os.replace(self.tmp_path, self.path)
+            return
+        fd = self._take_claim()
+        try:
+            if self._stored is not None and self._stored():
+                raise FileExistsError(errno.EEXIST, "File exists", str(self.path))
+            self._link()
+        finally:
+            # Unlinked while still locked, so a writer that opened it in
+            # the meantime sees that it was released
+            self.claim.unlink(missing_ok=True)
+            os.close(fd)
+        self.tmp_path.unlink(missing_ok=True)
+
+    def _take_claim(self) -> int:
+        """Create and lock the claim file, or lock one left by a crashed writer.
+
+        Returns:
+            The claim's descriptor, holding the lock until it is closed.
+
+        Raises:
+            FileExistsError: If another writer holds the claim.
+        """
+        while True:
+            try:
+                fd = os.open(self.claim, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+                created = True
+            except FileExistsError:
+                try:
+                    fd = os.open(self.claim, os.O_WRONLY)
+                except FileNotFoundError:
+                    continue  # released in the meantime
+                created = False
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                raise FileExistsError(errno.EEXIST, "Key is being saved", str(self.claim)) from None
+            except BaseException:
+                os.close(fd)
+                raise
+            try:
+                current = os.stat(self.claim).st_ino
+            except FileNotFoundError:
+                current = None
+            if current == os.fstat(fd).st_ino:
+                if not created:
+                    logger.warning("Taking over abandoned claim %s", self.claim)
+                return fd
+            # Released (unlinked) by its holder before we locked it
+            os.close(fd)
+
+    def _link(self) -> None:
+        """Hard-link the temp file to its final path."""
+        try:
+            os.link(self.tmp_path, self.path)
+        except OSError as e:
+            if e.errno not in _NO_LINKS:
+                raise
+            # No hard links: the claim keeps other exclusive writers out,
+            # so renaming this writer's own complete file is safe
+            if self.path.exists():
+                raise FileExistsError(errno.EEXIST, "File exists", str(self.path)) from None
+            os.replace(self.tmp_path, self.path)
+
+
+class CommitBuffer(io.BytesIO):
+    """In-memory write buffer handed to a commit callback on a clean close.
+
+    Used by stores that keep objects as records rather than files. As
+    with AtomicWriter, a ``with`` block that raises (or a buffer that is
+    garbage collected unclosed) commits nothing.
+    """
+
+    def __init__(self, commit: Callable[[bytes], None]):
+        """Create an empty buffer.
+
+        Args:
+            commit: Called with the buffered bytes when the buffer is closed.
+        """
+        super().__init__()
+        self._commit = commit
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def __del__(self) -> None:
+        with contextlib.suppress(ValueError, AttributeError):
+            if not self.closed:
+                self.discard()
+
+    def close(self) -> None:
+        """Commit the buffered bytes."""
+        if self.closed:
+            return
+        try:
+            self._commit(self.getvalue())
+        finally:
+            super().close()
+
+    def discard(self) -> None:
+        """Drop the buffered bytes without committing them."""
+        super().close()
+
+
+def fsync_dir(path: Path) -> None:
+    """fsync a directory so renames inside it are durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,71 @@
+"""Result type and thread-pool helpers for batched file system operations."""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """Per-key outcome of a batched operation.
+
+    A failing key never aborts the batch; its exception is collected in
+    ``errors`` while every other key is still processed.
+
+    Attributes:
+        values: Successful keys mapped to their result (the loaded object
+            for reads, None for writes).
+        errors: Failed keys mapped to the exception they raised.
+    """
+
+    values: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if every key succeeded."""
+        return not self.errors
+
+    def raise_first(self) -> None:
+        """Re-raise the first collected error, if any.
+
+        Raises:
+            Exception: The first per-key error, in batch order.
+        """
+        for error in self.errors.values():
+            raise error
+
+
+def run_batch(
+    calls: dict[str, tuple[Callable[..., Any], ...]], max_workers: int | None = None
+) -> dict[str, Future]:
+    """Submit one (fn, *args) call per key to a bounded thread pool.
+
+    Returns once every call has finished.
+
+    Args:
+        calls: Mapping of key to a (function, *args) tuple.
+        max_workers: Maximum number of threads (ThreadPoolExecutor's default if None).
+
+    Returns:
+        The finished future for every key, in submission order.
+    """
+    if not calls:
+        return {}
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="files-io") as pool:
+        return {key: pool.submit(*call) for key, call in calls.items()}
+
+
+def collect(futures: dict[str, Future], result: BatchResult) -> None:
+    """Move finished futures into result, in submission order."""
+    for key, future in futures.items():
+        error = future.exception()
+        if error is None:
+            result.values[key] = future.result()
+        else:
+            logger.warning("Batch operation for key %r failed: %s", key, error)
+            result.errors[key] = error
@@ -0,0 +1,342 @@
+"""Size-bounded read cache wrapping any IFileSystem."""
+
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import IO, Any
+
+import numpy as np
+
+from files_api.files.batch import BatchResult
+from files_api.files.handlers.dataframe_handler import is_dataframe
+from files_api.files.interface import IFileSystem
+from files_api.files.sizing import estimate_size
+
+logger = logging.getLogger(__name__)
+
+CACHE_POLICIES = ("lru", "lfu")
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Snapshot of cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+class LRUPolicy:
+    """Least-recently-used eviction order."""
+
+    def __init__(self):
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def add(self, key: str) -> None:
+        self._order[key] = None
+
+    def touch(self, key: str) -> None:
+        self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        del self._order[key]
+
+    def victim(self) -> str:
+        return next(iter(self._order))
+
+    def __iter__(self) -> Iterator[str]:
+        """Keys in eviction order, first victim first."""
+        return iter(self._order)
+
+
+class LFUPolicy:
+    """Least-frequently-used eviction order, LRU among equal frequencies.
+
+    Keys are bucketed by access count so every operation is O(1).
+    """
+
+    def __init__(self):
+        self._freq: dict[str, int] = {}
+        self._buckets: defaultdict[int, OrderedDict[str, None]] = defaultdict(OrderedDict)
+        self._min_freq = 0
+
+    def add(self, key: str) -> None:
+        self._freq[key] = 1
+        self._buckets[1][key] = None
+        self._min_freq = 1
+
+    def touch(self, key: str) -> None:
+        freq = self._freq[key]
+        self._unlink(key, freq)
+        if freq == self._min_freq and freq not in self._buckets:
+            self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets[freq + 1][key] = None
+
+    def remove(self, key: str) -> None:
+        freq = self._freq.pop(key)
+        self._unlink(key, freq)
+        if freq == self._min_freq and self._buckets:
+            self._min_freq = min(self._buckets)
+
+    def victim(self) -> str:
+        return next(iter(self._buckets[self._min_freq]))
+
+    def __iter__(self) -> Iterator[str]:
+        """Keys in eviction order, first victim first."""
+        for freq in sorted(self._buckets):
+            yield from self._buckets[freq]
+
+    def _unlink(self, key: str, freq: int) -> None:
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+
+class CachedFileSystem(IFileSystem):
+    """Caches decoded objects from another file system, bounded by size.
+
+    Entries are weighed by their in-memory size: ``nbytes`` for numpy
+    arrays and an estimate for JSON payloads. Objects larger than the
+    whole budget are never cached. Saving through this instance
+    invalidates the key; writes made directly to the inner file system
+    are not seen until the entry is evicted or invalidated.
+
+    Cached arrays are returned read-only and cached pandas DataFrames as
+    copies, so callers can't corrupt the cache. Other objects are
+    returned by reference and must be treated as immutable.
+
+    Reads from the inner file system happen outside the lock. Keys being
+    read carry a generation that invalidation bumps, so a value loaded
+    before a concurrent delete or invalidate is returned but not cached.
+    """
+
+    def __init__(self, inner: IFileSystem, max_bytes: int, policy: str = "lru"):
+        """Initialize the cache.
+
+        Args:
+            inner: The file system to read through to.
+            max_bytes: Maximum total size of cached objects.
+            policy: Eviction policy, "lru" or "lfu".
+
+        Raises:
+            ValueError: If max_bytes is negative or policy is unknown.
+        """
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy: '{policy}'")
+        self.inner = inner
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._policy = LRUPolicy() if policy == "lru" else LFUPolicy()
+        self._entries: dict[str, tuple[Any, int]] = {}
+        # Only for keys being read from the inner file system
+        self._loads: dict[str, int] = {}  # key -> reads in flight
+        self._generations: dict[str, int] = {}  # key -> invalidations during them
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        logger.info(
+            "Initialized CachedFileSystem over %s (max_bytes=%d, policy=%s)",
+            type(inner).__name__,
+            max_bytes,
+            policy,
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        """Current hit/miss/eviction counters and occupancy."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._current_bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def save(self, key: str, obj: Any) -> None:
+        """Save through to the inner file system, invalidating the key."""
+        self.invalidate(key)
+        self.inner.save(key, obj)
+
+    def save_many(self, items: Mapping[str, Any]) -> BatchResult:
+        """Save many objects through to the inner file system."""
+        for key in items:
+            self.invalidate(key)
+        return self.inner.save_many(items)
+
+    def get(self, key: str) -> Any:
+        """Get object by key, from the cache when possible.
+
+        Args:
+            key: The key to retrieve (without extension).
+
+        Returns:
+            The deserialized object (arrays are read-only, pandas
+            DataFrames are private copies).
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the file cannot be deserialized.
+        """
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        generation = self._start_load(key)
+        try:
+            value = self.inner.get(key)
+        except BaseException:
+            with self._lock:
+                self._finish_load(key, generation)
+            raise
+        return self._insert(key, value, generation)
+
+    def get_many(self, keys: Iterable[str]) -> BatchResult:
+        """Get many objects, reading only cache misses from the inner file system."""
+        result = BatchResult()
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            hit, value = self._lookup(key)
+            if hit:
+                result.values[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            generations = {key: self._start_load(key) for key in missing}
+            loaded = BatchResult()
+            try:
+                loaded = self.inner.get_many(missing)
+            finally:
+                for key, generation in generations.items():
+                    if key in loaded.values:
+                        result.values[key] = self._insert(key, loaded.values[key], generation)
+                    else:
+                        with self._lock:
+                            self._finish_load(key, generation)
+            result.errors.update(loaded.errors)
+        return result
+
+    def delete(self, key: str) -> None:
+        """Delete from the inner file system, invalidating the key."""
+        try:
+            self.inner.delete(key)
+        finally:
+            # Afterwards, so a read racing the delete can't cache the old value
+            self.invalidate(key)
+
+    def count(self, prefix: str = "") -> int:
+        """Count files matching prefix in the inner file system."""
+        return self.inner.count(prefix)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys matching prefix in the inner file system."""
+        return self.inner.keys(prefix)
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists, answering from the cache when possible."""
+        if key in self._entries:
+            return True
+        return self.inner.exists(key)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key from the cache if present, and keep reads in flight from caching it."""
+        with self._lock:
+            if key in self._loads:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            if key in self._entries:
+                self._drop(key)
+                logger.debug("Invalidated cached key %r", key)
+
+    def clear(self) -> None:
+        """Drop every cached entry (counters are kept)."""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        """Delegate to the inner file system."""
+        return self.inner._open(key, mode)
+
+    def _lookup(self, key: str) -> tuple[bool, Any]:
+        """Return (hit, value) and update counters and recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._hits += 1
+            self._policy.touch(key)
+            value = entry[0]
+        return True, _private(value)
+
+    def _start_load(self, key: str) -> int:
+        """Register a read of key from the inner file system, returning its generation."""
+        with self._lock:
+            self._loads[key] = self._loads.get(key, 0) + 1
+            return self._generations.get(key, 0)
+
+    def _finish_load(self, key: str, generation: int) -> bool:
+        """Unregister a read of key. Caller must hold the lock.
+
+        Returns:
+            Whether key was not invalidated since the read started.
+        """
+        current = self._generations.get(key, 0) == generation
+        self._loads[key] -= 1
+        if not self._loads[key]:
+            del self._loads[key]
+            self._generations.pop(key, None)
+        return current
+
+    def _insert(self, key: str, value: Any, generation: int) -> Any:
+        """Cache a freshly loaded value if it fits and is current, returning what callers see."""
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        size = estimate_size(value)
+
+        with self._lock:
+            if not self._finish_load(key, generation):
+                logger.debug("Not caching key %r, invalidated while it was read", key)
+                return value
+            if size > self.max_bytes:
+                logger.debug("Not caching key %r (%d bytes > max_bytes)", key, size)
+                return value
+            if key in self._entries:
+                self._drop(key)
+            while self._current_bytes + size > self.max_bytes:
+                victim = self._policy.victim()
+                self._drop(victim)
+                self._evictions += 1
+                logger.debug("Evicted key %r", victim)
+            self._entries[key] = (value, size)
+            self._policy.add(key)
+            self._current_bytes += size
+        return _private(value)
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry. Caller must hold the lock."""
+        _, size = self._entries.pop(key)
+        self._policy.remove(key)
+        self._current_bytes -= size
+
+
+def _private(value: Any) -> Any:
+    """What a caller may receive of a cached value without corrupting it.
+
+    pandas DataFrames are mutable in place, so callers get a copy.
+    """
+    if is_dataframe(value) == "pandas":
+        return value.copy()
+    return value
@@ -40,3 +40,22 @@ class FileExistsError(FilesError):
     def __init__(self, key: str):
         self.key = key
         super().__init__(f"File already exists for key: '{key}'")
+
+
+class MemoryLimitError(FilesError):
+    """Raised when saving an object would exceed an in-memory store's limit."""
+
+    def __init__(self, key: str, size: int, max_bytes: int):
+        self.key = key
+        self.size = size
+        self.max_bytes = max_bytes
+        super().__init__(f"Saving key '{key}' ({size} bytes) would exceed max_bytes={max_bytes}")
+
+
+class ObjectStoreError(FilesError):
+    """Raised when an object store answers a request with an unexpected status."""
+
+    def __init__(self, status: int, message: str):
+        self.status = status
+        self.message = message
+        super().__init__(f"Object store request failed with status {status}: {message}")
@@ -1,60 +1,124 @@
 """Factory for selecting appropriate file handlers."""
 
 import logging
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 
 from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.compression import COMPRESSIONS, CompressedHandler
+from files_api.files.handlers.dataframe_handler import DataFrameHandler, is_dataframe
 from files_api.files.handlers.json_handler import JsonHandler
 from files_api.files.handlers.numpy_handler import NumpyHandler
+from files_api.files.handlers.shuffle_handler import ShuffleHandler
 
 logger = logging.getLogger(__name__)
 
+# A compression name, optionally with a level: "gzip" or ("gzip", 9)
+Compression = str | tuple[str, int]
+
 
 class FileHandlerFactory:
     """Factory for selecting the appropriate file handler.
 
     Selects handlers based on object type (for saving) or file extension
     (for loading). Only numpy ndarrays use NumpyHandler, everything else
-    falls back to JsonHandler.
+    falls back to JsonHandler. Either may be wrapped in a CompressedHandler,
+    which adds a compression suffix such as ``.json.gz``. Arrays can
+    instead be routed to ShuffleHandler (``.npc``), and polars/pandas
+    DataFrames are stored as Arrow IPC (``.arrow``/``.pdarrow``).
     """
 
-    def __init__(self):
-        """Initialize the factory with default handlers."""
+    def __init__(
+        self,
+        json_codec: str = "json",
+        compression: Mapping[str, Compression] | None = None,
+        array_handler: str | ShuffleHandler = "numpy",
+    ):
+        """Initialize the factory with default handlers.
+
+        Args:
+            json_codec: The JSON codec used by JsonHandler ("json" or the
+                opt-in "orjson").
+            compression: Default compression per handler type name, e.g.
+                ``{"json": "gzip", "numpy": ("lzma", 3)}``. Handlers not
+                listed are stored uncompressed.
+            array_handler: How arrays are saved: "numpy" (.npy), "shuffle"
+                (.npc with the default ShuffleHandler settings) or a
+                configured ShuffleHandler. Object arrays always use .npy.
+
+        Raises:
+            ValueError: If a handler type, compression or array handler
+                is unknown.
+        """
         self._numpy_handler = NumpyHandler()
-        self._json_handler = JsonHandler()
+        self._json_handler = JsonHandler(json_codec)
+        if isinstance(array_handler, ShuffleHandler):
+            self._shuffle_handler = array_handler
+        elif array_handler in ("numpy", "shuffle"):
+            self._shuffle_handler = ShuffleHandler()
+        else:
+            raise ValueError(f"Unknown array handler: '{array_handler}'")
+        self._use_shuffle = array_handler != "numpy"
+        base_handlers = [self._numpy_handler, self._json_handler]
         self._extension_map: dict[str, IFileHandler] = {
-            ".npy": self._numpy_handler,
-            ".json": self._json_handler,
+            handler.extension: handler for handler in base_handlers
         }
-
-    def get_handler_for_object(self, obj: Any) -> IFileHandler:
+        self._frame_handlers = {flavor: DataFrameHandler(flavor) for flavor in ("polars", "pandas")}
+        for handler in [self._shuffle_handler, *self._frame_handlers.values()]:
+            self._extension_map[handler.extension] = handler
+        for handler in base_handlers:
+            for name in COMPRESSIONS:
+                compressed = CompressedHandler(handler, name)
+                self._extension_map[compressed.extension] = compressed
+
+        self._compressed: dict[tuple[str, str, int | None], IFileHandler] = {}
+        self._policy: dict[str, IFileHandler] = {}
+        type_names = {handler.type_name: handler for handler in base_handlers}
+        for type_name, spec in (compression or {}).items():
+            if type_name not in type_names:
+                raise ValueError(f"Unknown handler type: '{type_name}'")
+            self._policy[type_name] = self._with_compression(type_names[type_name], spec)
+
+    @property
+    def extensions(self) -> list[str]:
+        """All file extensions this factory can load, in lookup order."""
+        return list(self._extension_map)
+
+    def get_handler_for_object(
+        self, obj: Any, compression: Compression | None = None
+    ) -> IFileHandler:
         """Select handler based on object type.
 
         Priority:
-        1. np.ndarray → NumpyHandler
-        2. Everything else → JsonHandler (fallback)
+        1. polars/pandas DataFrame → DataFrameHandler
+        2. np.ndarray → ShuffleHandler if configured and the dtype allows,
+           else NumpyHandler
+        3. Everything else → JsonHandler (fallback)
+
+        Compression only applies to NumpyHandler and JsonHandler;
+        the other formats compress on their own.
 
         Args:
             obj: The object to find a handler for.
+            compression: Overrides the factory's compression policy for
+                this object: a compression name, (name, level), or "none".
 
         Returns:
-            The appropriate handler for the object type.
-        """
-        # Only numpy ndarrays use NumpyHandler
-        if isinstance(obj, np.ndarray):
-            logger.debug(
-                "Selected NumpyHandler for ndarray (shape=%s, dtype=%s)",
-                obj.shape,
-                obj.dtype,
-            )
-            return self._numpy_handler
+            The appropriate handler for the object type, wrapped in a
+            CompressedHandler when compression applies.
 
-        # Fallback to JSON for everything else
-        logger.debug("Selected JsonHandler for type %s", type(obj).__name__)
-        return self._json_handler
+        Raises:
+            ValueError: If the compression is unknown.
+        """
+        handler = self._select_handler(obj)
+        if handler not in (self._numpy_handler, self._json_handler):
+            return handler
+        if compression is not None:
+            return self._with_compression(handler, compression)
+        return self._policy.get(handler.type_name, handler)
 
     def get_handler_for_file(self, path: Path) -> IFileHandler:
         """Select handler based on file extension.
@@ -68,10 +132,47 @@ class FileHandlerFactory:
         Raises:
             ValueError: If the extension is not recognized.
         """
-        suffix = path.suffix.lower()
-        if suffix not in self._extension_map:
+        name = path.name.lower()
+        matches = [ext for ext in self._extension_map if name.endswith(ext) and name != ext]
+        if not matches:
+            suffix = path.suffix.lower()
             logger.error("Unknown file extension %r for path %s", suffix, path)
             raise ValueError(f"Unknown file extension: '{suffix}'")
-        handler = self._extension_map[suffix]
-        logger.debug("Selected %s handler for extension %r", handler.type_name, suffix)
+        extension = max(matches, key=len)
+        handler = self._extension_map[extension]
+        logger.debug("Selected %s handler for extension %r", handler.type_name, extension)
         return handler
+
+    def _select_handler(self, obj: Any) -> IFileHandler:
+        """Select the uncompressed handler for an object."""
+        flavor = is_dataframe(obj)
+        if flavor is not None:
+            logger.debug("Selected DataFrameHandler for %s DataFrame", flavor)
+            return self._frame_handlers[flavor]
+
+        if self._use_shuffle and self._shuffle_handler.supports(obj):
+            logger.debug("Selected ShuffleHandler for ndarray (dtype=%s)", obj.dtype)
+            return self._shuffle_handler
+
+        # Only numpy ndarrays use NumpyHandler
+        if isinstance(obj, np.ndarray):
+            logger.debug(
+                "Selected NumpyHandler for ndarray (shape=%s, dtype=%s)",
+                obj.shape,
+                obj.dtype,
+            )
+            return self._numpy_handler
+
+        # Fallback to JSON for everything else
+        logger.debug("Selected JsonHandler for type %s", type(obj).__name__)
+        return self._json_handler
+
+    def _with_compression(self, handler: IFileHandler, compression: Compression) -> IFileHandler:
+        """Wrap a base handler according to a compression spec, reusing instances."""
+        name, level = (compression, None) if isinstance(compression, str) else compression
+        if name == "none":
+            return handler
+        cache_key = (handler.type_name, name, level)
+        if cache_key not in self._compressed:
+            self._compressed[cache_key] = CompressedHandler(handler, name, level)
+        return self._compressed[cache_key]
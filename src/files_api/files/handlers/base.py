@@ -42,3 +42,20 @@ class IFileHandler(ABC):
             DeserializationError: If the object cannot be read.
         """
         ...
+
+    def read_info(self, file_obj: IO[bytes]) -> dict[str, Any]:
+        """Read metadata from the start of a file without loading the object.
+
+        Handlers override this to report what their header records; keys
+        are ObjectInfo field names.
+
+        Args:
+            file_obj: A file-like object opened in binary read mode.
+
+        Returns:
+            ObjectInfo fields found in the header (none by default).
+
+        Raises:
+            DeserializationError: If the header is invalid.
+        """
+        return {}
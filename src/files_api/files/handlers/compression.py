@@ -0,0 +1,125 @@
+"""Transparent compression around other file handlers."""
+
+import bz2
+import gzip
+import logging
+import lzma
+from typing import IO, Any
+
+from files_api.files.exceptions import DeserializationError
+from files_api.files.handlers.base import IFileHandler
+
+logger = logging.getLogger(__name__)
+
+# Compression name -> file suffix appended to the inner handler's extension
+COMPRESSIONS: dict[str, str] = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "lzma": ".xz",
+}
+
+# Level used when none is given; gzip's own default of 9 is rarely worth it
+DEFAULT_LEVELS: dict[str, int] = {
+    "gzip": 6,
+    "bz2": 9,
+    "lzma": 6,
+}
+
+# Errors the decompressors raise on corrupt or truncated input
+_DECOMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+
+class CompressedHandler(IFileHandler):
+    """Compresses the stream another handler writes and reads.
+
+    The compression is recorded as a compound extension (e.g.
+    ``.json.gz``), so files are detected on load without any extra
+    metadata. Data is streamed through the compressor, never buffered
+    whole.
+    """
+
+    def __init__(self, inner: IFileHandler, compression: str, level: int | None = None):
+        """Initialize the handler.
+
+        Args:
+            inner: The handler that serializes the object.
+            compression: One of "gzip", "bz2" or "lzma".
+            level: Compression level (gzip and bz2: 1-9, lzma preset: 0-9).
+                Defaults to DEFAULT_LEVELS. Only affects writing.
+
+        Raises:
+            ValueError: If the compression is unknown.
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: '{compression}'")
+        self.inner = inner
+        self.compression = compression
+        self.level = DEFAULT_LEVELS[compression] if level is None else level
+        self.extension = inner.extension + COMPRESSIONS[compression]
+        self.type_name = f"{inner.type_name}+{compression}"
+
+    def to_file(self, obj: Any, file_obj: IO[bytes]) -> None:
+        """Serialize obj with the inner handler, compressing on the fly.
+
+        Args:
+            obj: The object to write.
+            file_obj: A file-like object opened in binary write mode.
+
+        Raises:
+            SerializationError: If the object cannot be serialized.
+        """
+        logger.debug("Writing %s (level=%d)", self.type_name, self.level)
+        with self.writer(file_obj) as f:
+            self.inner.to_file(obj, f)
+
+    def from_file(self, file_obj: IO[bytes]) -> Any:
+        """Decompress and deserialize with the inner handler.
+
+        Args:
+            file_obj: A file-like object opened in binary read mode.
+
+        Returns:
+            The deserialized object.
+
+        Raises:
+            DeserializationError: If the data is corrupt or cannot be read.
+        """
+        logger.debug("Reading %s", self.type_name)
+        try:
+            with self.reader(file_obj) as f:
+                return self.inner.from_file(f)
+        except _DECOMPRESSION_ERRORS as e:
+            logger.error("Failed to decompress %s data: %s", self.compression, e)
+            raise DeserializationError(str(e)) from e
+
+    def read_info(self, file_obj: IO[bytes]) -> dict[str, Any]:
+        """Read the inner handler's header from the decompressed stream.
+
+        Only the start of the stream is decompressed.
+
+        Raises:
+            DeserializationError: If the data is corrupt or the header invalid.
+        """
+        try:
+            with self.reader(file_obj) as f:
+                return self.inner.read_info(f)
+        except _DECOMPRESSION_ERRORS as e:
+            logger.error("Failed to decompress %s data: %s", self.compression, e)
+            raise DeserializationError(str(e)) from e
+
+    def writer(self, file_obj: IO[bytes]) -> IO[bytes]:
+        """Wrap file_obj in a compressing writer (closing it leaves file_obj open)."""
+        if self.compression == "gzip":
+            # mtime=0 keeps the output deterministic
+            return gzip.GzipFile(fileobj=file_obj, mode="wb", compresslevel=self.level, mtime=0)
+        if self.compression == "bz2":
+            return bz2.BZ2File(file_obj, mode="wb", compresslevel=self.level)
+        return lzma.LZMAFile(file_obj, mode="wb", preset=self.level)
+
+    def reader(self, file_obj: IO[bytes]) -> IO[bytes]:
+        """Wrap file_obj in a decompressing reader (closing it leaves file_obj open)."""
+        if self.compression == "gzip":
+            return gzip.GzipFile(fileobj=file_obj, mode="rb")
+        if self.compression == "bz2":
+            return bz2.BZ2File(file_obj, mode="rb")
+        return lzma.LZMAFile(file_obj, mode="rb")
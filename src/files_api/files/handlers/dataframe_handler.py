@@ -0,0 +1,244 @@
+"""Handler for polars and pandas DataFrames (Arrow IPC files)."""
+
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import IO, Any
+
+from files_api.files.exceptions import DeserializationError, SerializationError
+from files_api.files.handlers.base import IFileHandler
+
+logger = logging.getLogger(__name__)
+
+# Frame libraries and the extension their frames are stored under. Each is
+# a single suffix: a two-part ".pandas.arrow" would make the polars key
+# "x.pandas" (file "x.pandas.arrow") read back as the pandas key "x".
+FLAVORS: dict[str, str] = {
+    "polars": ".arrow",
+    "pandas": ".pdarrow",
+}
+
+# Column names used to store a non-default pandas index
+_INDEX_COLUMN = re.compile(r"__index_level_(\d+)__(.*)")
+
+
+def is_dataframe(obj: Any) -> str | None:
+    """Return the flavor of a polars or pandas DataFrame, else None.
+
+    Checks sys.modules instead of importing, so objects that can't be
+    frames never pay for importing pandas or polars.
+    """
+    pl = sys.modules.get("polars")
+    if pl is not None and isinstance(obj, pl.DataFrame):
+        return "polars"
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(obj, pd.DataFrame):
+        return "pandas"
+    return None
+
+
+class DataFrameHandler(IFileHandler):
+    """Handler for DataFrames, stored in the Arrow IPC (Feather v2) format.
+
+    IPC is columnar and its footer records where each column's buffers
+    live, so reading from a local path memory-maps the file and decodes
+    only the requested columns; uncompressed files are read zero-copy.
+    pandas frames are converted to polars on write and back on read,
+    and get their own extension so they come back as pandas.
+    """
+
+    def __init__(self, flavor: str = "polars", compression: str = "uncompressed"):
+        """Initialize the handler.
+
+        Args:
+            flavor: "polars" or "pandas": the frame type written and returned.
+            compression: IPC buffer compression ("uncompressed", "lz4" or
+                "zstd"). Compressed files can't be read zero-copy.
+
+        Raises:
+            ValueError: If the flavor is unknown.
+        """
+        if flavor not in FLAVORS:
+            raise ValueError(f"Unknown DataFrame flavor: '{flavor}'")
+        self.flavor = flavor
+        self.compression = compression
+        self.extension = FLAVORS[flavor]
+        self.type_name = flavor
+
+    def to_file(self, obj: Any, file_obj: IO[bytes]) -> None:
+        """Write a DataFrame to a file-like object as Arrow IPC.
+
+        Args:
+            obj: A polars or pandas DataFrame.
+            file_obj: A file-like object opened in binary write mode.
+
+        Raises:
+            SerializationError: If the frame cannot be written.
+        """
+        flavor = is_dataframe(obj)
+        if flavor is None:
+            raise SerializationError(obj, "not a polars or pandas DataFrame")
+        try:
+            df = _from_pandas(obj) if flavor == "pandas" else obj
+            df.write_ipc(file_obj, compression=self.compression)
+        except Exception as e:
+            logger.error("Failed to write DataFrame: %s", e)
+            raise SerializationError(obj, str(e)) from e
+        logger.info("Wrote %s DataFrame (shape=%s)", self.flavor, df.shape)
+
+    def from_file(self, file_obj: IO[bytes], columns: list[str] | None = None) -> Any:
+        """Read a DataFrame from a file-like object.
+
+        The whole file is read into memory; use from_path() for local
+        files to avoid that.
+
+        Args:
+            file_obj: A file-like object opened in binary read mode.
+            columns: Only decode these columns.
+
+        Returns:
+            The DataFrame, as polars or pandas depending on the flavor.
+
+        Raises:
+            DeserializationError: If the data cannot be read.
+        """
+        return self._read(file_obj, columns)
+
+    def from_path(self, path: Path, columns: list[str] | None = None) -> Any:
+        """Read a DataFrame stored at a local path.
+
+        The file is memory-mapped, so columns that aren't requested are
+        never read from disk.
+
+        Args:
+            path: Path to an Arrow IPC file.
+            columns: Only read these columns.
+
+        Returns:
+            The DataFrame, as polars or pandas depending on the flavor.
+
+        Raises:
+            DeserializationError: If the data cannot be read.
+        """
+        return self._read(path, columns)
+
+    def read_info(self, source: Path | IO[bytes]) -> dict[str, Any]:
+        """Read the column schema from the IPC footer.
+
+        Args:
+            source: A local path (only the footer is read) or a file-like
+                object opened in binary read mode.
+
+        Returns:
+            The columns ObjectInfo field.
+
+        Raises:
+            DeserializationError: If the data is not an Arrow IPC file.
+        """
+        import polars as pl
+
+        try:
+            schema = pl.read_ipc_schema(source)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.error("Failed to read DataFrame schema: %s", e)
+            raise DeserializationError(str(e)) from e
+        return {"columns": {name: str(dtype) for name, dtype in schema.items()}}
+
+    def scan(self, path: Path) -> Any:
+        """Lazily scan a stored frame as a polars LazyFrame.
+
+        Columns holding a stored pandas index are left out, so pandas
+        and polars frames with the same columns scan alike.
+
+        Args:
+            path: Path to an Arrow IPC file.
+
+        Returns:
+            A polars LazyFrame.
+        """
+        import polars as pl
+
+        lf = pl.scan_ipc(path)
+        if self.flavor == "pandas":
+            lf = lf.select(pl.exclude(f"^{_INDEX_COLUMN.pattern}$"))
+        return lf
+
+    def _read(self, source: Path | IO[bytes], columns: list[str] | None) -> Any:
+        """Read IPC data from a path or file object and convert to the flavor."""
+        import polars as pl
+
+        logger.debug("Reading %s DataFrame (columns=%s)", self.flavor, columns)
+        if columns is not None and self.flavor == "pandas":
+            # Keep the stored index along with the selected columns
+            schema = pl.read_ipc_schema(source)
+            columns = [name for name in schema if _INDEX_COLUMN.fullmatch(name)] + list(columns)
+            if not isinstance(source, Path):
+                source.seek(0)
+        try:
+            df = pl.read_ipc(source, columns=columns)
+        except FileNotFoundError:
+            # A missing file is not a format problem
+            raise
+        except Exception as e:
+            logger.error("Failed to read DataFrame: %s", e)
+            raise DeserializationError(str(e)) from e
+        logger.info("Read %s DataFrame (shape=%s)", self.flavor, df.shape)
+        return _to_pandas(df) if self.flavor == "pandas" else df
+
+
+def _from_pandas(pdf: Any) -> Any:
+    """Convert a pandas DataFrame to polars, keeping a non-default index.
+
+    Uses pyarrow when installed; otherwise simple numpy-backed columns
+    convert without copying and the rest go through Python objects.
+    """
+    import pandas as pd
+    import polars as pl
+
+    index = pdf.index
+    default_index = (
+        isinstance(index, pd.RangeIndex)
+        and index.start == 0
+        and index.step == 1
+        and index.name is None
+    )
+    if not default_index:
+        names = [
+            f"__index_level_{i}__{'' if name is None else name}"
+            for i, name in enumerate(index.names)
+        ]
+        pdf = pdf.rename_axis(names).reset_index()
+
+    columns = []
+    for name in pdf.columns:
+        series = pdf[name]
+        try:
+            columns.append(pl.from_pandas(series).alias(str(name)))
+        except ImportError:
+            values = series.to_numpy(dtype=object, na_value=None)
+            columns.append(pl.Series(str(name), values))
+    return pl.DataFrame(columns)
+
+
+def _to_pandas(df: Any) -> Any:
+    """Convert a polars DataFrame to pandas, restoring a stored index.
+
+    Uses pyarrow when installed; otherwise columns are converted through
+    NumPy, where integer columns with nulls become float.
+    """
+    import pandas as pd
+
+    try:
+        pdf = df.to_pandas()
+    except ImportError:
+        pdf = pd.DataFrame({name: df[name].to_numpy() for name in df.columns})
+
+    index_columns = [name for name in pdf.columns if _INDEX_COLUMN.fullmatch(name)]
+    if index_columns:
+        names = [_INDEX_COLUMN.fullmatch(name).group(2) or None for name in index_columns]
+        pdf = pdf.set_index(index_columns)
+        pdf.index.names = names
+    return pdf
@@ -0,0 +1,202 @@
+"""Pluggable JSON encoders/decoders for JsonHandler."""
+
+import json
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from typing import IO, Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Integer literals of 20+ digits may exceed 64 bits, which orjson reads as floats
+_LONG_NUMBER = re.compile(rb"\d{20}")
+
+
+class JsonCodec(ABC):
+    """Encodes objects to UTF-8 JSON bytes and decodes them back.
+
+    Encoders raise TypeError or ValueError for objects they can't
+    represent; decoders raise ValueError for invalid input.
+    """
+
+    name: str  # codec identifier for logging and lookup
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        """Encode an object to UTF-8 JSON bytes."""
+        ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode UTF-8 JSON bytes to an object."""
+        ...
+
+    def write(self, obj: Any, file_obj: IO[bytes]) -> int:
+        """Encode an object into a binary file-like object.
+
+        Returns:
+            The number of bytes written.
+        """
+        data = self.encode(obj)
+        file_obj.write(data)
+        return len(data)
+
+
+def _numpy_default(obj: Any) -> Any:
+    """json.dumps fallback converting numpy scalars and arrays to Python."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class StdlibJsonCodec(JsonCodec):
+    """The standard library json module.
+
+    Output is compact UTF-8. write() streams the encoder's chunks into
+    the file, so the document is never held as one str plus a full
+    bytes copy.
+    """
+
+    name = "json"
+
+    def __init__(self, numpy: bool = True, allow_nan: bool = True):
+        """Initialize the codec.
+
+        Args:
+            numpy: Accept numpy scalars and arrays by converting them to
+                Python numbers and lists.
+            allow_nan: Write NaN and infinity as the non-standard tokens
+                NaN and Infinity; if False they raise ValueError.
+        """
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=_numpy_default if numpy else None,
+            allow_nan=allow_nan,
+        )
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def write(self, obj: Any, file_obj: IO[bytes]) -> int:
+        # The one-shot path runs the C encoder, several times faster than
+        # the pure-Python generator, and still returns the output in chunks
+        written = 0
+        for chunk in self._encoder.iterencode(obj, _one_shot=True):
+            data = chunk.encode("utf-8")
+            file_obj.write(data)
+            written += len(data)
+        return written
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson, which encodes straight to bytes with native numpy support.
+
+    Requires the optional ``orjson`` package. Non-string dict keys are
+    stringified like the stdlib does. It reads every file the stdlib
+    codec writes: input orjson can't parse exactly (NaN and Infinity
+    tokens, integers beyond 64 bits) is decoded by the stdlib instead,
+    and integers beyond 64 bits, which orjson refuses, are encoded by
+    it. NaN and infinity, which orjson would silently write as null,
+    raise ValueError.
+    """
+
+    name = "orjson"
+
+    def __init__(self, numpy: bool = True):
+        """Initialize the codec.
+
+        Args:
+            numpy: Serialize numpy scalars and arrays natively.
+
+        Raises:
+            ImportError: If orjson is not installed.
+        """
+        if orjson is None:
+            raise ImportError("The 'orjson' codec requires the orjson package")
+        self._options = orjson.OPT_NON_STR_KEYS
+        if numpy:
+            self._options |= orjson.OPT_SERIALIZE_NUMPY
+        self._default = _numpy_default if numpy else None
+        self._stdlib = StdlibJsonCodec(numpy, allow_nan=False)
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            data = orjson.dumps(obj, default=self._default, option=self._options)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits; truly unserializable objects fail again
+            return self._stdlib.encode(obj)
+        # orjson has no option to reject NaN and infinity; they always
+        # come out as null, so only output containing null needs a look
+        if b"null" in data and _has_non_finite(obj):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return data
+
+    def decode(self, data: bytes) -> Any:
+        if not _LONG_NUMBER.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN or Infinity written by the stdlib codec
+        return json.loads(data.decode("utf-8"))
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether obj contains a NaN or infinite float, at any depth."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float | np.floating):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+            stack.extend(key for key in value if isinstance(key, float | np.floating))
+        elif isinstance(value, list | tuple):
+            stack.extend(value)
+        elif isinstance(value, np.ndarray):
+            if value.dtype.kind in "fc":
+                if not np.isfinite(value).all():
+                    return True
+            elif value.dtype.kind == "O":
+                stack.extend(value.ravel().tolist())
+    return False
+
+
+JSON_CODECS: dict[str, type[JsonCodec]] = {
+    StdlibJsonCodec.name: StdlibJsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_json_codec(name: str = "json") -> JsonCodec:
+    """Build a codec by name.
+
+    Args:
+        name: "json" (the standard library) or "orjson".
+
+    Returns:
+        The codec instance.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the codec's package is not installed.
+    """
+    if name not in JSON_CODECS:
+        raise ValueError(f"Unknown JSON codec: '{name}'")
+    codec = JSON_CODECS[name]()
+    logger.debug("Using %s JSON codec", codec.name)
+    return codec
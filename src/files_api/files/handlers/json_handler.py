@@ -1,17 +1,22 @@
 """Handler for JSON-serializable objects (.json files)."""
 
-import json
 import logging
+from collections.abc import Iterator
 from typing import IO, Any
 
 from files_api.files.exceptions import DeserializationError, SerializationError
 from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.json_codecs import JsonCodec, get_json_codec
+from files_api.files.handlers.json_stream import DEFAULT_CHUNK_SIZE, EnvelopeParser
 
 logger = logging.getLogger(__name__)
 
 # Current envelope version
 ENVELOPE_VERSION = 1
 
+# Bytes read_info() reads at most looking for the envelope header
+INFO_READ_LIMIT = 64 * 1024
+
 
 class JsonHandler(IFileHandler):
     """Handler for JSON-serializable objects.
@@ -19,11 +24,21 @@ class JsonHandler(IFileHandler):
     Saves objects as .json files with a metadata envelope containing
     type information for future extensibility.
     Works with any file-like object (local files, S3 via s3fs, etc.).
+    Encoding and decoding go through a pluggable JsonCodec; all codecs
+    read each other's files.
     """
 
     extension: str = ".json"
     type_name: str = "json"
 
+    def __init__(self, codec: str | JsonCodec = "json"):
+        """Initialize the handler.
+
+        Args:
+            codec: A JsonCodec instance or codec name ("json", "orjson").
+        """
+        self.codec = get_json_codec(codec) if isinstance(codec, str) else codec
+
     def to_file(self, obj: Any, file_obj: IO[bytes]) -> None:
         """Write object to a file-like object as JSON.
 
@@ -47,12 +62,13 @@ class JsonHandler(IFileHandler):
             "data": obj,
         }
         try:
-            data = json.dumps(envelope, ensure_ascii=False).encode("utf-8")
-            file_obj.write(data)
-            logger.info("Wrote JSON object (type=%s, %d bytes)", obj_type, len(data))
-        except TypeError as e:
+            size = self.codec.write(envelope, file_obj)
+        except (TypeError, ValueError) as e:
             logger.error("Failed to serialize object of type %s: %s", obj_type, e)
             raise SerializationError(obj, str(e)) from e
+        logger.info(
+            "Wrote JSON object (type=%s, %d bytes, codec=%s)", obj_type, size, self.codec.name
+        )
 
     def from_file(self, file_obj: IO[bytes]) -> Any:
         """Read object from a file-like object as JSON.
@@ -68,9 +84,8 @@ class JsonHandler(IFileHandler):
         """
         logger.debug("Reading JSON object from file")
         try:
-            data = file_obj.read()
-            envelope = json.loads(data.decode("utf-8"))
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            envelope = self.codec.decode(file_obj.read())
+        except ValueError as e:
             logger.error("Failed to parse JSON: %s", e)
             raise DeserializationError(str(e)) from e
 
@@ -82,3 +97,71 @@ class JsonHandler(IFileHandler):
         version = envelope.get("__version__", "unknown")
         logger.info("Read JSON object (type=%s, version=%s)", obj_type, version)
         return envelope["data"]
+
+    def iter_items(
+        self, file_obj: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Any]:
+        """Stream the elements of a stored list without loading it whole.
+
+        The envelope is parsed incrementally, so memory use is bounded by
+        the largest single element. Works on any file written by
+        to_file(), including files from older versions.
+
+        Args:
+            file_obj: A file-like object opened in binary read mode.
+            chunk_size: Number of bytes read at a time.
+
+        Yields:
+            The elements of the envelope's 'data' array, in order.
+
+        Raises:
+            DeserializationError: If the data is not a valid envelope or
+                'data' is not an array.
+        """
+        logger.debug("Streaming JSON items from file (chunk_size=%d)", chunk_size)
+        parser = EnvelopeParser(file_obj, chunk_size)
+        header = parser.header()
+        logger.info(
+            "Streaming JSON object (type=%s, version=%s)",
+            header.get("__type__", "unknown"),
+            header.get("__version__", "unknown"),
+        )
+        yield from parser.items()
+
+    def read_info(self, file_obj: IO[bytes], limit: int = INFO_READ_LIMIT) -> dict[str, Any]:
+        """Read the envelope's __type__ and __version__ from a bounded prefix.
+
+        Args:
+            file_obj: A file-like object opened in binary read mode.
+            limit: Maximum number of bytes to read.
+
+        Returns:
+            The type_name and version ObjectInfo fields, or nothing if the
+            envelope header doesn't fit within limit bytes.
+
+        Raises:
+            DeserializationError: If the envelope is malformed.
+        """
+        prefix = _Prefix(file_obj, limit)
+        try:
+            header = EnvelopeParser(prefix, chunk_size=min(limit, 4096)).header()
+        except DeserializationError:
+            if prefix.remaining == 0:
+                logger.debug("JSON envelope header not within %d bytes", limit)
+                return {}
+            raise
+        return {"type_name": header.get("__type__"), "version": header.get("__version__")}
+
+
+class _Prefix:
+    """Read-only view of the first limit bytes of a file-like object."""
+
+    def __init__(self, file_obj: IO[bytes], limit: int):
+        self._file = file_obj
+        self.remaining = limit
+
+    def read(self, size: int = -1) -> bytes:
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self._file.read(size)
+        self.remaining -= len(data)
+        return data
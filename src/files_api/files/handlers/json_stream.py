@@ -0,0 +1,154 @@
+"""Incremental parsing of JSON envelopes."""
+
+import codecs
+import json
+from collections.abc import Iterator
+from typing import IO, Any
+
+from files_api.files.exceptions import DeserializationError
+
+# Bytes read per refill of the parse buffer
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class EnvelopeParser:
+    """Pull parser for the ``{"__type__": ..., "data": [...]}`` envelope.
+
+    Reads the file in chunks and decodes one JSON value at a time with
+    ``json.JSONDecoder.raw_decode``, so memory stays bounded by the
+    largest single value rather than the whole payload. Whenever a value
+    is cut off at the end of the buffer, the buffer grows geometrically
+    and the value is decoded again, keeping the total work linear.
+    """
+
+    def __init__(self, file_obj: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Initialize the parser.
+
+        Args:
+            file_obj: A file-like object opened in binary read mode.
+            chunk_size: Number of bytes read per refill.
+        """
+        self._file = file_obj
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._in_data = False
+
+    def header(self) -> dict[str, Any]:
+        """Parse envelope fields up to the start of the 'data' value.
+
+        Returns:
+            The fields that precede 'data' (e.g. __type__ and __version__).
+
+        Raises:
+            DeserializationError: If the envelope is malformed or has no
+                'data' field.
+        """
+        fields: dict[str, Any] = {}
+        self._expect("{")
+        while True:
+            if self._peek() == "}":
+                raise DeserializationError("Invalid envelope: missing 'data' field")
+            name = self._value()
+            if not isinstance(name, str):
+                raise DeserializationError("Invalid envelope: non-string key")
+            self._expect(":")
+            if name == "data":
+                self._in_data = True
+                return fields
+            fields[name] = self._value()
+            if self._next_delimiter(",}") == "}":
+                raise DeserializationError("Invalid envelope: missing 'data' field")
+
+    def items(self) -> Iterator[Any]:
+        """Yield the elements of the envelope's 'data' array one at a time.
+
+        Raises:
+            DeserializationError: If 'data' is not an array or the JSON is
+                malformed or truncated.
+        """
+        if not self._in_data:
+            self.header()
+        if self._peek() != "[":
+            raise DeserializationError("Envelope 'data' is not an array")
+        self._pos += 1
+        if self._peek() == "]":
+            return
+        while True:
+            yield self._value()
+            if self._next_delimiter(",]") == "]":
+                return
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise DeserializationError(str(e)) from e
+                self._fill(grow=True)
+                continue
+            # A number at the end of the buffer may continue in the next chunk,
+            # including after a dangling "." or exponent the decoder stopped at
+            if (
+                not self._eof
+                and isinstance(value, int | float)
+                and all(c in _NUMBER_CHARS for c in self._buf[end:])
+            ):
+                self._fill(grow=True)
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                raise DeserializationError("Unexpected end of JSON data")
+            self._fill()
+
+    def _expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = self._peek()
+        if found != char:
+            raise DeserializationError(f"Expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def _next_delimiter(self, allowed: str) -> str:
+        """Consume and return the next delimiter, which must be in allowed."""
+        found = self._peek()
+        if found not in allowed:
+            raise DeserializationError(f"Expected one of {allowed!r}, found {found!r}")
+        self._pos += 1
+        return found
+
+    def _fill(self, grow: bool = False) -> None:
+        """Read more input, dropping already consumed text first.
+
+        With grow=True at least as much as is currently buffered is read,
+        so re-decoding a large value costs amortized linear time.
+        """
+        self._buf = self._buf[self._pos :]
+        self._pos = 0
+        size = max(self._chunk_size, len(self._buf)) if grow else self._chunk_size
+        chunk = self._file.read(size)
+        try:
+            if chunk:
+                self._buf += self._utf8.decode(chunk)
+            else:
+                self._buf += self._utf8.decode(b"", final=True)
+                self._eof = True
+        except UnicodeDecodeError as e:
+            raise DeserializationError(str(e)) from e
@@ -0,0 +1,55 @@
+"""Helpers for reading .npy headers without loading array data."""
+
+from dataclasses import dataclass
+from typing import IO
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class NpyHeader:
+    """Parsed .npy header.
+
+    Attributes:
+        shape: The array shape.
+        dtype: The array dtype.
+        fortran_order: Whether the data is stored in Fortran (column-major) order.
+        data_offset: Byte offset of the first data byte in the file.
+    """
+
+    shape: tuple[int, ...]
+    dtype: np.dtype
+    fortran_order: bool
+    data_offset: int
+
+
+def read_npy_header(file_obj: IO[bytes]) -> NpyHeader:
+    """Parse the .npy header at the current position of a file-like object.
+
+    Only the magic string and header dict are read; the file position is
+    left at the start of the array data.
+
+    Args:
+        file_obj: A file-like object opened in binary read mode.
+
+    Returns:
+        The parsed header.
+
+    Raises:
+        ValueError: If the data is not a valid .npy header.
+    """
+    start = file_obj.tell()
+    version = np.lib.format.read_magic(file_obj)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file_obj)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file_obj)
+    else:
+        # Version 3.0 only differs in the header encoding (utf8)
+        shape, fortran_order, dtype = np.lib.format._read_array_header(file_obj, version)
+    return NpyHeader(
+        shape=tuple(shape),
+        dtype=dtype,
+        fortran_order=fortran_order,
+        data_offset=file_obj.tell() - start,
+    )
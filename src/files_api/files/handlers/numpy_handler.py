@@ -1,15 +1,48 @@
 """Handler for numpy arrays (.npy files)."""
 
+import io
 import logging
+import math
+import operator
+import os
+from collections.abc import Callable
+from pathlib import Path
 from typing import IO, Any
 
 import numpy as np
 
 from files_api.files.exceptions import DeserializationError, SerializationError
 from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.npy_header import NpyHeader, read_npy_header
 
 logger = logging.getLogger(__name__)
 
+# np.memmap modes that never create or truncate the file
+MMAP_MODES = ("r", "r+", "c")
+
+# Row index accepted by read_slice: an integer (anything with __index__,
+# such as np.int64), a slice, or either followed by indexes for the
+# remaining axes
+RowIndex = int | slice | tuple[Any, ...]
+
+# Strided slices read the whole span when it is at most this many times
+# larger than the selected rows, and row by row otherwise
+_SPAN_READ_FACTOR = 4
+
+
+def _row_number(rows: Any) -> int:
+    """Convert an integer row index (e.g. np.int64) to int, as ndarray indexing does.
+
+    Raises:
+        TypeError: If rows is not an integer, or is a boolean.
+    """
+    if not isinstance(rows, bool | np.bool_):
+        try:
+            return operator.index(rows)
+        except TypeError:
+            pass
+    raise TypeError(f"Row index must be an integer or slice, got {type(rows).__name__}")
+
 
 class NumpyHandler(IFileHandler):
     """Handler for numpy arrays.
@@ -63,3 +96,257 @@ class NumpyHandler(IFileHandler):
         except Exception as e:
             logger.error("Failed to read numpy array: %s", e)
             raise DeserializationError(str(e)) from e
+
+    def read_info(self, file_obj: IO[bytes]) -> dict[str, Any]:
+        """Read shape, dtype and memory order from the .npy header only.
+
+        Args:
+            file_obj: A file-like object opened in binary read mode.
+
+        Returns:
+            The shape, dtype and fortran_order ObjectInfo fields.
+
+        Raises:
+            DeserializationError: If the header is invalid.
+        """
+        try:
+            header = read_npy_header(file_obj)
+        except ValueError as e:
+            logger.error("Failed to read numpy header: %s", e)
+            raise DeserializationError(str(e)) from e
+        return {"shape": header.shape, "dtype": header.dtype, "fortran_order": header.fortran_order}
+
+    def from_path(self, path: Path, mmap_mode: str = "r") -> np.ndarray:
+        """Memory-map a numpy array stored at a local path.
+
+        Pages are loaded lazily by the OS and shared between processes
+        mapping the same file. Object arrays cannot be mapped and are
+        loaded into memory instead.
+
+        Args:
+            path: Path to a .npy file.
+            mmap_mode: One of "r" (read-only), "r+" (read-write) or
+                "c" (copy-on-write).
+
+        Returns:
+            An np.memmap-backed array, or a regular array for object dtypes.
+
+        Raises:
+            ValueError: If mmap_mode is not supported.
+            DeserializationError: If the array cannot be read.
+        """
+        if mmap_mode not in MMAP_MODES:
+            raise ValueError(f"Unsupported mmap_mode: {mmap_mode!r}")
+
+        logger.debug("Mapping numpy array from %s (mode=%r)", path, mmap_mode)
+        try:
+            with open(path, "rb") as f:
+                header = read_npy_header(f)
+                if header.dtype.hasobject:
+                    logger.info("Object dtype in %s cannot be mapped, loading instead", path)
+                    f.seek(0)
+                    return self.from_file(f)
+            result = np.load(path, mmap_mode=mmap_mode)
+        except ValueError as e:
+            logger.error("Failed to map numpy array: %s", e)
+            raise DeserializationError(str(e)) from e
+
+        logger.info("Mapped numpy array (shape=%s, dtype=%s)", result.shape, result.dtype)
+        return result
+
+    def read_slice(self, file_obj: IO[bytes], index: RowIndex) -> np.ndarray:
+        """Read selected rows (axis 0) of a stored array without loading the rest.
+
+        Only the header and the byte ranges of the selected rows are
+        read, with positional reads when the file has a descriptor and
+        seek+read otherwise. Indexes for the remaining axes are applied
+        in memory afterwards. Object arrays are pickled and can't be
+        sliced on disk, so they are loaded whole and then indexed.
+
+        Args:
+            file_obj: A seekable file-like object opened in binary read mode,
+                positioned at the start of the .npy data.
+            index: An integer, a slice, or a tuple starting with one of
+                those. Integers include numpy integer scalars; booleans are
+                rejected, as ndarray treats them as masks, not rows.
+
+        Returns:
+            The selected data, as np.asarray(array)[index] would return it.
+
+        Raises:
+            IndexError: If the row index is out of range or the array is 0-d.
+            TypeError: If the index is not an integer, slice or tuple.
+            DeserializationError: If the file is not a valid .npy file.
+        """
+        rows, rest = (index[0], index[1:]) if isinstance(index, tuple) else (index, ())
+        if not isinstance(rows, slice):
+            rows = _row_number(rows)
+
+        start = file_obj.tell()
+        try:
+            header = read_npy_header(file_obj)
+        except ValueError as e:
+            logger.error("Failed to read numpy header: %s", e)
+            raise DeserializationError(str(e)) from e
+        if not header.shape:
+            raise IndexError("Cannot slice rows of a 0-d array")
+        if header.dtype.hasobject:
+            logger.info("Object dtype cannot be sliced on disk, loading whole array")
+            file_obj.seek(start)
+            return self.from_file(file_obj)[index]
+
+        n_rows = header.shape[0]
+        if isinstance(rows, int):
+            if not -n_rows <= rows < n_rows:
+                raise IndexError(f"Row {rows} is out of bounds for {n_rows} rows")
+            selected = range(rows % n_rows, rows % n_rows + 1)
+        else:
+            selected = range(*rows.indices(n_rows))
+
+        result = self._read_rows(file_obj, start + header.data_offset, header, selected)
+        logger.info("Read %d of %d rows (dtype=%s)", len(selected), n_rows, header.dtype)
+        if isinstance(rows, int):
+            return result[(0, *rest)]
+        return result[(slice(None), *rest)] if rest else result
+
+    def append_rows(
+        self,
+        file_obj: IO[bytes],
+        rows: np.ndarray,
+        sync: Callable[[], None] | None = None,
+    ) -> tuple[int, ...] | None:
+        """Append rows along axis 0 of a stored array, in place.
+
+        The rows are written after the existing data first, and only
+        then is the shape in the header rewritten (in place, within the
+        header's padding), so readers see either the old or the new
+        shape and never partial rows. np.save reserves padding for axis 0
+        to grow to 21 digits; files without room are left untouched.
+
+        Args:
+            file_obj: The stored file, opened for reading and writing ("r+b").
+            rows: Rows matching the stored trailing shape, or a single row.
+                They must be safely castable to the stored dtype.
+            sync: Called after the rows are written and before the header
+                is updated, e.g. to fsync the rows first.
+
+        Returns:
+            The new shape, or None if the header has no room to grow (the
+            file is not modified then).
+
+        Raises:
+            ValueError: If the array can't be appended to (0-d, Fortran
+                order or object dtype) or rows don't match it.
+            DeserializationError: If the file is not a valid .npy file.
+        """
+        file_obj.seek(0)
+        preamble = file_obj.read(8)
+        file_obj.seek(0)
+        try:
+            header = read_npy_header(file_obj)
+        except ValueError as e:
+            raise DeserializationError(str(e)) from e
+        if not header.shape or header.fortran_order or header.dtype.hasobject:
+            raise ValueError("Only C-order, non-object arrays with at least one axis can grow")
+
+        rows = np.asarray(rows)
+        if rows.shape == header.shape[1:]:
+            rows = rows[np.newaxis]
+        if rows.shape[1:] != header.shape[1:]:
+            raise ValueError(f"Rows of shape {rows.shape[1:]} don't match {header.shape[1:]}")
+        if not np.can_cast(rows.dtype, header.dtype, "safe"):
+            raise ValueError(f"Cannot safely cast {rows.dtype} rows to {header.dtype}")
+
+        shape = (header.shape[0] + len(rows), *header.shape[1:])
+        # Header text sits between the length field and the data
+        major = preamble[6]
+        length_size = 2 if major == 1 else 4
+        text_size = header.data_offset - 8 - length_size
+        text = _header_text(header.dtype, shape, text_size, "utf8" if major >= 3 else "latin1")
+        if text is None:
+            logger.warning("No room in .npy header to grow to shape %s", shape)
+            return None
+
+        data = np.ascontiguousarray(rows, dtype=header.dtype)
+        end = header.data_offset + math.prod(header.shape) * header.dtype.itemsize
+        file_obj.seek(end)
+        file_obj.write(data.tobytes())
+        # Drop leftovers of an earlier interrupted append
+        file_obj.truncate()
+        file_obj.flush()
+        if sync is not None:
+            sync()
+        file_obj.seek(8 + length_size)
+        file_obj.write(text)
+        file_obj.flush()
+        logger.info("Appended %d rows (shape=%s)", len(rows), shape)
+        return shape
+
+    def _read_rows(
+        self, file_obj: IO[bytes], data_offset: int, header: NpyHeader, rows: range
+    ) -> np.ndarray:
+        """Read the rows in a range, as a (len(rows), *shape[1:]) array."""
+        tail = header.shape[1:]
+        if not rows:
+            return np.empty((0, *tail), dtype=header.dtype)
+
+        lo, hi = min(rows), max(rows) + 1
+        if hi - lo > _SPAN_READ_FACTOR * len(rows):
+            # Sparse selection: read row by row instead of the whole span
+            return np.concatenate(
+                [self._read_rows(file_obj, data_offset, header, range(r, r + 1)) for r in rows]
+            )
+
+        count = hi - lo
+        row_items = math.prod(tail)
+        itemsize = header.dtype.itemsize
+        buf = bytearray(count * row_items * itemsize)
+        view = memoryview(buf)
+        if not header.fortran_order:
+            _read_into(file_obj, data_offset + lo * row_items * itemsize, view)
+            span = np.frombuffer(buf, dtype=header.dtype).reshape(count, *tail)
+        else:
+            # Column-major: axis 0 is contiguous within each trailing position
+            run = count * itemsize
+            for c in range(row_items):
+                offset = data_offset + (c * header.shape[0] + lo) * itemsize
+                _read_into(file_obj, offset, view[c * run : (c + 1) * run])
+            columns = np.frombuffer(buf, dtype=header.dtype).reshape(row_items, count)
+            span = columns.T.reshape((count, *tail), order="F")
+
+        if rows.step == 1:
+            return span
+        return span[np.asarray(rows) - lo]
+
+
+def _header_text(dtype: np.dtype, shape: tuple[int, ...], size: int, encoding: str) -> bytes | None:
+    """Format a C-order .npy header dict padded to exactly size bytes, if it fits."""
+    fields = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": shape}
+    text = "{" + "".join(f"'{key}': {value!r}, " for key, value in fields.items()) + "}"
+    data = text.encode(encoding)
+    if len(data) + 1 > size:
+        return None
+    return data.ljust(size - 1) + b"\n"
+
+
+def _read_into(file_obj: IO[bytes], offset: int, view: memoryview) -> None:
+    """Fill view with the bytes at offset, using positional reads when possible.
+
+    Raises:
+        DeserializationError: If the file ends before view is filled.
+    """
+    # Only plain OS files: wrappers such as GzipFile expose the fd of
+    # the encoded bytes underneath
+    raw = getattr(file_obj, "raw", file_obj)
+    fd = raw.fileno() if isinstance(raw, io.FileIO) else None
+
+    filled = 0
+    while filled < len(view):
+        if fd is not None:
+            n = os.preadv(fd, [view[filled:]], offset + filled)
+        else:
+            file_obj.seek(offset + filled)
+            n = file_obj.readinto(view[filled:])
+        if not n:
+            raise DeserializationError("Unexpected end of array data")
+        filled += n
@@ -0,0 +1,276 @@
+"""Persistent key index for local file storage."""
+
+import bisect
+import json
+import logging
+import os
+import secrets
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Journal file kept next to the stored objects
+INDEX_FILENAME = ".files_index.jsonl"
+
+
+def split_key(name: str, extensions: Sequence[str]) -> tuple[str, str] | None:
+    """Split a file name into (key, extension), preferring the longest match.
+
+    Args:
+        name: The file name (e.g., "data.npy").
+        extensions: Known file extensions.
+
+    Returns:
+        The (key, extension) pair, or None if no known extension matches.
+    """
+    best: str | None = None
+    for ext in extensions:
+        if name.endswith(ext) and len(name) > len(ext) and (best is None or len(ext) > len(best)):
+            best = ext
+    if best is None:
+        return None
+    return name[: -len(best)], best
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Return the smallest string greater than every string starting with prefix.
+
+    Args:
+        prefix: The key prefix.
+
+    Returns:
+        The exclusive upper bound, or None if the range is unbounded
+        (empty prefix, or a prefix made only of the maximum code point).
+    """
+    stripped = prefix.rstrip(chr(0x10FFFF))
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+
+class SortedKeys:
+    """Sorted set of keys answering prefix queries by binary search.
+
+    add() and discard() cost O(n) for the list shift but run at memmove
+    speed; count() is O(log n) and keys() O(log n + matches). Not
+    thread-safe: owners call it under their own lock.
+    """
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, keys: Iterable[str] = ()):
+        """Create the set from keys (which must be distinct)."""
+        self._keys = sorted(keys)
+
+    def add(self, key: str) -> None:
+        """Insert a key; adding a present key is a no-op."""
+        i = bisect.bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            self._keys.insert(i, key)
+
+    def discard(self, key: str) -> None:
+        """Remove a key if present."""
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def clear(self) -> None:
+        """Remove every key."""
+        self._keys.clear()
+
+    def count(self, prefix: str = "") -> int:
+        """Number of keys starting with prefix."""
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+    def keys(self, prefix: str = "") -> list[str]:
+        """Snapshot of the keys starting with prefix, in sorted order."""
+        lo, hi = self._range(prefix)
+        return self._keys[lo:hi]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        """Locate the slice of keys matching prefix."""
+        lo = bisect.bisect_left(self._keys, prefix)
+        upper = prefix_upper_bound(prefix)
+        if upper is None:
+            return lo, len(self._keys)
+        return lo, bisect.bisect_left(self._keys, upper, lo)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexEntry:
+    """Location and stat information for a stored key."""
+
+    extension: str
+    size: int
+    mtime_ns: int
+
+
+class KeyIndex:
+    """On-disk index mapping keys to their extension, size and mtime.
+
+    The index is an append-only JSON-lines journal stored in the base
+    directory. It is loaded into memory once, updated on every save, and
+    rebuilt from a directory scan when it is missing, corrupt, or older
+    than any directory holding files (meaning files were added behind
+    its back, or a save crashed before recording its file).
+
+    Keys are additionally kept in a sorted list, so prefix counts cost
+    O(log n) and prefix listings O(log n + matches).
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        extensions: Sequence[str],
+        scan: Callable[[], Iterable[os.DirEntry]] | None = None,
+        directories: Callable[[], Iterable[Path]] | None = None,
+    ):
+        """Initialize the index.
+
+        Args:
+            base_path: The directory whose files are indexed.
+            extensions: Known file extensions, in lookup priority order.
+            scan: Yields the stored files during a rebuild. Defaults to the
+                  visible files directly inside base_path.
+            directories: Yields every directory files are added to, whose
+                  mtimes decide whether the journal is stale. Defaults to
+                  base_path alone.
+        """
+        self.base_path = base_path
+        self.path = base_path / INDEX_FILENAME
+        self.extensions = tuple(extensions)
+        self._scan = scan or self._scan_base_path
+        self._directories = directories or (lambda: [base_path])
+        self._entries: dict[str, IndexEntry] = {}
+        self._sorted_keys = SortedKeys()
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Load the journal, rebuilding it from a scan if it is stale."""
+        if self._is_stale():
+            self.rebuild()
+            return
+
+        entries: dict[str, IndexEntry] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record["ext"] is None:
+                        entries.pop(record["key"], None)
+                    else:
+                        entries[record["key"]] = IndexEntry(
+                            record["ext"], record["size"], record["mtime_ns"]
+                        )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Corrupt key index at %s (%s), rebuilding", self.path, e)
+            self.rebuild()
+            return
+
+        with self._lock:
+            self._entries = entries
+            self._sorted_keys = SortedKeys(entries)
+        logger.debug("Loaded key index with %d entries from %s", len(entries), self.path)
+
+    def rebuild(self) -> None:
+        """Rescan the base directory and rewrite the journal from scratch."""
+        entries: dict[str, IndexEntry] = {}
+        for entry in self._scan():
+            split = split_key(entry.name, self.extensions)
+            if split is None or split[0] in entries:
+                continue
+            key, ext = split
+            st = entry.stat()
+            entries[key] = IndexEntry(ext, st.st_size, st.st_mtime_ns)
+
+        with self._lock:
+            self._entries = entries
+            self._sorted_keys = SortedKeys(entries)
+            self._write_snapshot()
+        logger.info("Rebuilt key index with %d entries at %s", len(entries), self.base_path)
+
+    def lookup(self, key: str) -> IndexEntry | None:
+        """Return the entry for a key, or None if it is not indexed."""
+        return self._entries.get(key)
+
+    def add(self, key: str, extension: str, size: int, mtime_ns: int) -> None:
+        """Record a newly written key and append it to the journal."""
+        entry = IndexEntry(extension, size, mtime_ns)
+        record = {"key": key, "ext": extension, "size": size, "mtime_ns": mtime_ns}
+        with self._lock:
+            if key not in self._entries:
+                self._sorted_keys.add(key)
+            self._entries[key] = entry
+            self._append(record)
+
+    def discard(self, key: str) -> None:
+        """Forget a key, e.g. after its file disappeared from disk."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._sorted_keys.discard(key)
+                self._append({"key": key, "ext": None})
+
+    def count(self, prefix: str = "") -> int:
+        """Count indexed keys starting with prefix in O(log n)."""
+        with self._lock:
+            return self._sorted_keys.count(prefix)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over indexed keys starting with prefix, in sorted order.
+
+        The matching range is snapshotted up front, so concurrent saves
+        don't affect an iteration in progress.
+        """
+        with self._lock:
+            return iter(self._sorted_keys.keys(prefix))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def _scan_base_path(self) -> Iterator[os.DirEntry]:
+        """Yield visible regular files directly inside base_path."""
+        with os.scandir(self.base_path) as it:
+            for entry in it:
+                if not entry.name.startswith(".") and entry.is_file():
+                    yield entry
+
+    def _is_stale(self) -> bool:
+        """Check whether the journal is missing or predates a file directory."""
+        try:
+            index_mtime = self.path.stat().st_mtime_ns
+            return any(d.stat().st_mtime_ns > index_mtime for d in self._directories())
+        except OSError:
+            return True
+
+    def _append(self, record: dict) -> None:
+        """Append one record to the journal. Caller must hold the lock."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _write_snapshot(self) -> None:
+        """Atomically replace the journal with the current entries."""
+        # Unique, as several processes may rebuild the same store at once
+        tmp_path = self.path.with_name(f"{INDEX_FILENAME}.{secrets.token_hex(8)}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, entry in self._entries.items():
+                record = {
+                    "key": key,
+                    "ext": entry.extension,
+                    "size": entry.size,
+                    "mtime_ns": entry.mtime_ns,
+                }
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, self.path)
+        # The rename bumps the directory mtime; touch the journal so it is
+        # not considered stale on the next load.
+        os.utime(self.path)
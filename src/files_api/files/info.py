@@ -0,0 +1,40 @@
+"""Metadata about stored objects, read without loading them."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectInfo:
+    """What is known about a stored object from its file and header.
+
+    Attributes:
+        key: The key (without extension).
+        format: The handler type name, e.g. "numpy", "json" or "json+gzip".
+        size: File size in bytes.
+        mtime_ns: Last modification time in nanoseconds since the epoch.
+        shape: Array shape (arrays only).
+        dtype: Array dtype (arrays only).
+        fortran_order: Whether array data is column-major (.npy only).
+        type_name: The envelope's ``__type__`` (JSON only, if within the
+            bounded header read).
+        version: The envelope's ``__version__`` (JSON only, as type_name).
+        columns: Column names mapped to dtype names (DataFrames only).
+    """
+
+    key: str
+    format: str
+    size: int
+    mtime_ns: int
+    shape: tuple[int, ...] | None = None
+    dtype: np.dtype | None = None
+    fortran_order: bool | None = None
+    type_name: str | None = None
+    version: int | None = None
+    columns: dict[str, str] | None = None
+
+    @property
+    def mtime(self) -> float:
+        """Last modification time in seconds since the epoch."""
+        return self.mtime_ns / 1e9
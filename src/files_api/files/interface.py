@@ -1,8 +1,14 @@
 """Abstract base class for file systems."""
 
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping
 from typing import IO, Any
 
+from files_api.files.batch import BatchResult
+
+logger = logging.getLogger(__name__)
+
 
 class IFileSystem(ABC):
     """Abstract base class for file system implementations.
@@ -42,6 +48,63 @@ class IFileSystem(ABC):
         """
         ...
 
+    def save_many(self, items: Mapping[str, Any]) -> BatchResult:
+        """Save many objects, collecting per-key errors.
+
+        The default implementation calls save() for each item in turn;
+        backends override it with a concurrent implementation.
+
+        Args:
+            items: Mapping of key (without extension) to object.
+
+        Returns:
+            A BatchResult with None for every saved key and the exception
+            for every key that failed.
+        """
+        result = BatchResult()
+        for key, obj in items.items():
+            try:
+                self.save(key, obj)
+                result.values[key] = None
+            except Exception as e:
+                logger.warning("save_many: key %r failed: %s", key, e)
+                result.errors[key] = e
+        return result
+
+    def get_many(self, keys: Iterable[str]) -> BatchResult:
+        """Get many objects, collecting per-key errors.
+
+        The default implementation calls get() for each key in turn;
+        backends override it with a concurrent implementation.
+
+        Args:
+            keys: The keys to retrieve (without extension).
+
+        Returns:
+            A BatchResult with the loaded object for every key that was
+            read and the exception for every key that failed.
+        """
+        result = BatchResult()
+        for key in dict.fromkeys(keys):
+            try:
+                result.values[key] = self.get(key)
+            except Exception as e:
+                logger.warning("get_many: key %r failed: %s", key, e)
+                result.errors[key] = e
+        return result
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete the object stored under key.
+
+        Args:
+            key: The key to delete (without extension).
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        ...
+
     @abstractmethod
     def count(self, prefix: str = "") -> int:
         """Count files matching prefix.
@@ -54,6 +117,18 @@ class IFileSystem(ABC):
         """
         ...
 
+    @abstractmethod
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys matching prefix.
+
+        Args:
+            prefix: Optional prefix to filter keys.
+
+        Returns:
+            An iterator over matching keys (without extension).
+        """
+        ...
+
     @abstractmethod
     def exists(self, key: str) -> bool:
         """Check if key exists.
@@ -0,0 +1,309 @@
+"""Directory layouts for local file storage."""
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.index import INDEX_FILENAME, split_key
+
+logger = logging.getLogger(__name__)
+
+# Marker recording the layout of a store, kept in its base directory
+LAYOUT_FILENAME = ".files_layout.json"
+
+LAYOUTS = ("flat", "sharded")
+
+# Directory in the base directory holding files being written, so that
+# failed writes leave the mtimes of the file directories alone
+TMP_DIRNAME = ".tmp"
+
+# Suffix of the hidden lock file held while a key is being published
+CLAIM_SUFFIX = ".claim"
+
+
+class FlatLayout:
+    """Every file lives directly in the base directory."""
+
+    name = "flat"
+
+    def __init__(self, base_path: Path):
+        """Initialize the layout.
+
+        Args:
+            base_path: The base directory for file storage.
+        """
+        self.base_path = base_path
+
+    def path_for(self, filename: str) -> Path:
+        """Return the path a stored file lives at.
+
+        Raises:
+            ValueError: If filename contains a path separator.
+        """
+        _check_filename(filename)
+        return self.base_path / filename
+
+    def scan(self) -> Iterator[os.DirEntry]:
+        """Yield every visible regular file in the store."""
+        yield from _scan_dir(self.base_path)
+
+    def directories(self) -> Iterator[Path]:
+        """Yield every directory whose mtime changes when a file is added."""
+        yield self.base_path
+
+
+class ShardedLayout:
+    """Files are fanned out into hex-prefix directories from a key hash.
+
+    With the default two levels of two hex digits, a key lands in one of
+    65,536 directories (e.g. ``ab/cd/key.json``), keeping each directory
+    small even with tens of millions of keys. All extensions of a key
+    hash to the same directory.
+    """
+
+    name = "sharded"
+
+    def __init__(self, base_path: Path, extensions: Sequence[str], levels: int = 2):
+        """Initialize the layout.
+
+        Args:
+            base_path: The base directory for file storage.
+            extensions: Known file extensions, used to hash on the bare key.
+            levels: Number of two-hex-digit directory levels.
+        """
+        self.base_path = base_path
+        self.extensions = tuple(extensions)
+        self.levels = levels
+
+    def path_for(self, filename: str) -> Path:
+        """Return the path a stored file lives at.
+
+        Raises:
+            ValueError: If filename contains a path separator.
+        """
+        _check_filename(filename)
+        split = split_key(filename, self.extensions)
+        key = split[0] if split is not None else filename
+        digest = hashlib.md5(key.encode("utf-8"), usedforsecurity=False).hexdigest()
+        shards = [digest[2 * i : 2 * i + 2] for i in range(self.levels)]
+        return self.base_path.joinpath(*shards, filename)
+
+    def scan(self) -> Iterator[os.DirEntry]:
+        """Yield every visible regular file in the shard directories."""
+        for d in self._levels()[-1]:
+            yield from _scan_dir(d)
+
+    def directories(self) -> Iterator[Path]:
+        """Yield every directory whose mtime changes when a file is added.
+
+        That is the base directory and every shard directory: a new file
+        only touches its leaf shard, a new shard only its parent.
+        """
+        for level in self._levels():
+            yield from level
+
+    def _levels(self) -> list[list[Path]]:
+        """The existing directories at each depth, from the base down to the leaves."""
+        levels = [[self.base_path]]
+        for _ in range(self.levels):
+            levels.append(
+                [
+                    Path(entry.path)
+                    for d in levels[-1]
+                    for entry in _scandir(d)
+                    if _is_shard(entry.name) and entry.is_dir()
+                ]
+            )
+        return levels
+
+
+def make_layout(
+    name: str, base_path: Path, extensions: Sequence[str]
+) -> FlatLayout | ShardedLayout:
+    """Build a layout by name.
+
+    Args:
+        name: "flat" or "sharded".
+        base_path: The base directory for file storage.
+        extensions: Known file extensions.
+
+    Returns:
+        The layout instance.
+
+    Raises:
+        ValueError: If the layout name is unknown.
+    """
+    if name == "flat":
+        return FlatLayout(base_path)
+    if name == "sharded":
+        return ShardedLayout(base_path, extensions)
+    raise ValueError(f"Unknown layout: '{name}'")
+
+
+def read_layout(base_path: Path) -> str | None:
+    """Return the layout recorded in a store's marker, if any.
+
+    Args:
+        base_path: The base directory of the store.
+
+    Returns:
+        The recorded layout name, or None for stores without a marker.
+
+    Raises:
+        ValueError: If a migration into the recorded layout never finished.
+    """
+    try:
+        marker = json.loads((base_path / LAYOUT_FILENAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    if marker.get("migrating"):
+        raise ValueError(
+            f"Incomplete migration to '{marker['layout']}' layout in {base_path}; "
+            "run migrate_layout() again"
+        )
+    return marker["layout"]
+
+
+def write_layout(base_path: Path, name: str, migrating: bool = False) -> None:
+    """Record a store's layout in its marker file.
+
+    Args:
+        base_path: The base directory of the store.
+        name: The layout name.
+        migrating: Whether a migration into this layout is in progress.
+    """
+    marker = {"layout": name, "migrating": migrating}
+    tmp_path = base_path / f"{LAYOUT_FILENAME}.tmp"
+    tmp_path.write_text(json.dumps(marker), encoding="utf-8")
+    os.replace(tmp_path, base_path / LAYOUT_FILENAME)
+
+
+def resolve_layout(base_path: Path, layout: str | None, extensions: Sequence[str]) -> str:
+    """Reconcile a requested layout with the one recorded in a store.
+
+    New stores opened with a non-flat layout get a marker recording it.
+
+    Args:
+        base_path: The base directory of the store.
+        layout: The requested layout, or None to use the recorded one.
+        extensions: Known file extensions.
+
+    Returns:
+        The layout to use ("flat" for unmarked stores by default).
+
+    Raises:
+        ValueError: If the layout is unknown or conflicts with the files
+            already in the store.
+    """
+    if layout is not None and layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: '{layout}'")
+    recorded = read_layout(base_path)
+    if layout is None:
+        return recorded or "flat"
+    if recorded is None and layout != "flat":
+        flat_files = FlatLayout(base_path).scan()
+        if any(split_key(entry.name, extensions) for entry in flat_files):
+            raise ValueError(f"{base_path} holds a flat store; convert it with migrate_layout()")
+        write_layout(base_path, layout)
+    elif recorded is not None and recorded != layout:
+        raise ValueError(
+            f"{base_path} uses the '{recorded}' layout, not '{layout}'; "
+            "convert it with migrate_layout()"
+        )
+    return layout
+
+
+def migrate_layout(
+    base_path: str | Path, layout: str, extensions: Sequence[str] | None = None
+) -> int:
+    """Convert an existing store to another layout in place.
+
+    Files are moved with atomic renames and the marker records that a
+    migration is in progress, so an interrupted migration is detected
+    on open and can simply be run again. The key index is dropped and
+    rebuilt on the next open.
+
+    Args:
+        base_path: The base directory of the store.
+        layout: The target layout ("flat" or "sharded").
+        extensions: Known file extensions (defaults to the factory's).
+
+    Returns:
+        The number of files moved.
+    """
+    base_path = Path(base_path)
+    if extensions is None:
+        extensions = FileHandlerFactory().extensions
+    target = make_layout(layout, base_path, extensions)
+    write_layout(base_path, layout, migrating=True)
+
+    # Scan both layouts so files left behind by an interrupted run are found
+    sources = [FlatLayout(base_path), ShardedLayout(base_path, extensions)]
+    moved = 0
+    for source in sources:
+        if source.name == layout:
+            continue
+        for entry in list(source.scan()):
+            if split_key(entry.name, extensions) is None:
+                continue
+            dest = target.path_for(entry.name)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(entry.path, dest)
+            moved += 1
+
+    if layout == "flat":
+        _remove_empty_shards(base_path)
+    (base_path / INDEX_FILENAME).unlink(missing_ok=True)
+    write_layout(base_path, layout)
+    logger.info("Migrated %d files in %s to %s layout", moved, base_path, layout)
+    return moved
+
+
+def claim_path(file_path: Path, key: str) -> Path:
+    """Return the claim file of key, which lives next to its stored file."""
+    return file_path.with_name(f".{key}{CLAIM_SUFFIX}")
+
+
+def _check_filename(filename: str) -> None:
+    """Reject names that would place a file outside the layout's directories.
+
+    Scans and the key index only look at the directories the layout
+    creates, so a key saved into a subdirectory would be lost on rebuild.
+    """
+    if "/" in filename or (os.altsep is not None and os.altsep in filename) or os.sep in filename:
+        raise ValueError(f"Keys can't contain a path separator: {filename!r}")
+
+
+def _is_shard(name: str) -> bool:
+    """Check whether a directory name looks like a two-hex-digit shard."""
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+
+def _scandir(path: Path) -> list[os.DirEntry]:
+    """List all entries of one directory."""
+    with os.scandir(path) as it:
+        return list(it)
+
+
+def _scan_dir(path: Path) -> Iterator[os.DirEntry]:
+    """Yield visible regular files in one directory."""
+    with os.scandir(path) as it:
+        for entry in it:
+            if not entry.name.startswith(".") and entry.is_file():
+                yield entry
+
+
+def _remove_empty_shards(base_path: Path) -> None:
+    """Remove shard directories left empty by a migration to flat."""
+    for top in _scandir(base_path):
+        if not (_is_shard(top.name) and top.is_dir()):
+            continue
+        for dirpath, _, _ in sorted(os.walk(top.path), key=lambda w: -len(w[0])):
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                logger.warning("Shard directory %s is not empty, leaving it", dirpath)
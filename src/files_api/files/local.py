@@ -1,120 +1,280 @@
 """Local filesystem implementation."""
 
+import builtins
+import errno
 import logging
+import os
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
 from typing import IO, Any
 
+from files_api.files.atomic import AtomicWriter, Durability
+from files_api.files.batch import BatchResult, collect, run_batch
 from files_api.files.exceptions import FileExistsError, FileNotFoundError
-from files_api.files.factory import FileHandlerFactory
+from files_api.files.factory import Compression, FileHandlerFactory
+from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.dataframe_handler import DataFrameHandler
+from files_api.files.index import KeyIndex, split_key
 from files_api.files.interface import IFileSystem
+from files_api.files.layout import TMP_DIRNAME, claim_path, make_layout, resolve_layout
+from files_api.files.local_access import LocalAccessMixin
+from files_api.files.process_pool import EXECUTORS, SerializerPool
 
 logger = logging.getLogger(__name__)
 
 
-class LocalFileSystem(IFileSystem):
+class LocalFileSystem(LocalAccessMixin, IFileSystem):
     """Local filesystem implementation.
 
     Stores files on the local disk with automatic format selection
-    based on object type.
+    based on object type. By default a persistent key index is kept in
+    the base directory so lookups don't have to probe every extension.
+    Memory maps, streaming and lazy scans come from LocalAccessMixin.
     """
 
-    def __init__(self, base_path: str | Path):
+    def __init__(
+        self,
+        base_path: str | Path,
+        use_index: bool = True,
+        max_workers: int | None = None,
+        layout: str | None = None,
+        durability: str = "none",
+        factory: FileHandlerFactory | None = None,
+        max_processes: int | None = None,
+    ):
         """Initialize the local filesystem.
 
         Args:
             base_path: The base directory for file storage.
                        Will be created if it doesn't exist.
+            use_index: Keep a persistent key index instead of probing the
+                       disk for every known extension on each lookup.
+                       Index misses still probe the disk, so keys saved by
+                       other instances are found; count() and keys() only
+                       see those once looked up or after refresh().
+            max_workers: Maximum number of concurrent I/O threads used by
+                         batch operations (defaults to ThreadPoolExecutor's).
+            layout: Directory layout, "flat" or "sharded" (hash fan-out into
+                    two levels of hex-prefix directories). Defaults to the
+                    layout recorded in the store, or "flat" for new stores.
+            durability: When writes are fsynced: "none", "batch" (periodic
+                        group commit, see sync()) or "always". Writes are
+                        atomic in every mode.
+            factory: Handler factory to use, e.g. one configured with a
+                     different JSON codec. Defaults to FileHandlerFactory().
+            max_processes: Worker processes for save_many(executor="process")
+                           (defaults to the CPU count; started on first use).
+
+        Raises:
+            ValueError: If layout conflicts with the store's existing layout,
+                        or layout or durability is unknown.
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
-        self.factory = FileHandlerFactory()
-        logger.info("Initialized LocalFileSystem at %s", self.base_path)
-
-    def save(self, key: str, obj: Any) -> None:
+        self.factory = factory or FileHandlerFactory()
+        self.max_workers = max_workers
+        self.durability = Durability(durability)
+        self._serializers = SerializerPool(max_processes)
+        extensions = self.factory.extensions
+        self.layout = make_layout(
+            resolve_layout(self.base_path, layout, extensions), self.base_path, extensions
+        )
+        # Created before the index checks the base directory's mtime
+        self._tmp_dir = self.base_path / TMP_DIRNAME
+        self._tmp_dir.mkdir(exist_ok=True)
+        self.index: KeyIndex | None = None
+        if use_index:
+            self.index = KeyIndex(
+                self.base_path, extensions, self.layout.scan, self.layout.directories
+            )
+            self.index.load()
+        logger.info(
+            "Initialized LocalFileSystem at %s (index=%s, layout=%s, durability=%s)",
+            self.base_path,
+            use_index,
+            self.layout.name,
+            durability,
+        )
+
+    def save(self, key: str, obj: Any, compression: Compression | None = None) -> None:
         """Save object with given key.
 
         The file extension is determined automatically based on the object type.
         Raises FileExistsError if a file with this key already exists
-        (with any extension).
+        (with any extension). The file is published under a claim, a
+        lock file held only while it is linked into place, so concurrent
+        savers of one key, in any threads or processes, can't both succeed.
 
         Args:
             key: The key to save the object under (without extension).
             obj: The object to save.
+            compression: Overrides the factory's compression policy: a
+                compression name ("gzip", "bz2", "lzma"), (name, level),
+                or "none".
 
         Raises:
             FileExistsError: If a file with this key already exists.
             SerializationError: If the object cannot be serialized.
+            ValueError: If the key contains a path separator.
         """
         logger.debug("save() called with key=%r, obj_type=%s", key, type(obj).__name__)
 
-        # Check if any file with this key already exists
-        existing = self._find_file(key)
-        if existing is not None:
-            logger.warning("Key %r already exists at %s", key, existing)
+        # The index rejects known keys without a syscall; otherwise the
+        # exclusive publish in _write() is the (race-free) check
+        if self.index is not None and key in self.index:
+            logger.warning("Key %r already exists", key)
             raise FileExistsError(key)
 
-        # Get the appropriate handler and build the full key with extension
-        handler = self.factory.get_handler_for_object(obj)
-        full_key = f"{key}{handler.extension}"
-        logger.debug("Selected %s handler, full_key=%s", handler.type_name, full_key)
+        # Get the appropriate handler and write through it
+        handler = self.factory.get_handler_for_object(obj, compression)
+        self._write(key, handler, obj)
 
-        # Save using handler with file-like object
-        with self._open(full_key, "wb") as f:
-            handler.to_file(obj, f)
+    def save_many(
+        self,
+        items: Mapping[str, Any],
+        compression: Compression | None = None,
+        executor: str = "thread",
+    ) -> BatchResult:
+        """Save many objects concurrently, collecting per-key errors.
 
-        logger.info("Saved key=%r using %s handler", key, handler.type_name)
+        Keys in the index are rejected up front in a single pass; serialization
+        and disk writes then run on a thread pool of at most
+        ``max_workers`` threads. JSON encoding holds the GIL, so
+        executor="process" serializes JSON objects in worker processes
+        instead, writing the returned bytes on the thread pool.
+
+        Args:
+            items: Mapping of key (without extension) to object.
+            compression: Overrides the factory's compression policy, as in save().
+            executor: "serial" (one thread), "thread" or "process".
+
+        Returns:
+            A BatchResult with None for every saved key and the exception
+            for every key that failed.
 
-    def get(self, key: str) -> Any:
+        Raises:
+            ValueError: If executor is unknown.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: '{executor}'")
+        logger.debug("save_many() called with %d items", len(items))
+        result = BatchResult()
+        pending: dict[str, tuple[IFileHandler, Any]] = {}
+        for key, obj in items.items():
+            if self.index is not None and key in self.index:
+                logger.warning("Key %r already exists", key)
+                result.errors[key] = FileExistsError(key)
+                continue
+            pending[key] = (self.factory.get_handler_for_object(obj, compression), obj)
+
+        if executor == "process":
+            futures = self._serializers.save(
+                pending, self._write, self._write_bytes, self.max_workers
+            )
+        else:
+            futures = run_batch(
+                {key: (self._write, key, handler, obj) for key, (handler, obj) in pending.items()},
+                1 if executor == "serial" else self.max_workers,
+            )
+        collect(futures, result)
+        logger.info("save_many() saved %d, failed %d", len(result.values), len(result.errors))
+        return result
+
+    def get(self, key: str, columns: list[str] | None = None) -> Any:
         """Get object by key.
 
         The file extension is detected automatically from existing files.
+        DataFrames are memory-mapped, so with columns only the requested
+        columns are read from disk.
 
         Args:
             key: The key to retrieve (without extension).
+            columns: For DataFrame keys, only load these columns.
 
         Returns:
             The deserialized object.
 
         Raises:
             FileNotFoundError: If the key does not exist.
+            ValueError: If columns is given for a key that isn't a DataFrame.
             DeserializationError: If the file cannot be deserialized.
         """
-        logger.debug("get() called with key=%r", key)
+        logger.debug("get() called with key=%r, columns=%s", key, columns)
 
-        full_key = self._find_file(key)
-        if full_key is None:
-            logger.warning("Key %r not found in %s", key, self.base_path)
-            raise FileNotFoundError(key)
+        full_key = self._resolve(key)
 
-        # Get handler based on file extension
-        file_path = self.base_path / full_key
-        handler = self.factory.get_handler_for_file(file_path)
-        logger.debug("Found %s, using %s handler", full_key, handler.type_name)
+        return self._read(key, full_key, columns)
 
-        # Load using handler with file-like object
-        with self._open(full_key, "rb") as f:
-            result = handler.from_file(f)
+    def get_many(self, keys: Iterable[str]) -> BatchResult:
+        """Get many objects concurrently, collecting per-key errors.
 
-        logger.info("Loaded key=%r using %s handler", key, handler.type_name)
+        Keys are resolved in a single pass over the index; opening and
+        decoding then run on a thread pool of at most ``max_workers``
+        threads.
+
+        Args:
+            keys: The keys to retrieve (without extension).
+
+        Returns:
+            A BatchResult with the loaded object for every key that was
+            read and the exception for every key that failed.
+        """
+        result = BatchResult()
+        pending: dict[str, str] = {}
+        for key in dict.fromkeys(keys):
+            full_key = self._find_file(key)
+            if full_key is None:
+                logger.warning("Key %r not found in %s", key, self.base_path)
+                result.errors[key] = FileNotFoundError(key)
+            else:
+                pending[key] = full_key
+        logger.debug("get_many() resolved %d keys", len(pending))
+
+        futures = run_batch(
+            {key: (self._read, key, full_key) for key, full_key in pending.items()},
+            self.max_workers,
+        )
+        collect(futures, result)
+        logger.info("get_many() loaded %d, failed %d", len(result.values), len(result.errors))
         return result
 
     def count(self, prefix: str = "") -> int:
         """Count files matching prefix.
 
+        With the key index this is a binary search over sorted keys and
+        never touches the disk.
+
         Args:
             prefix: Optional prefix to filter files.
 
         Returns:
             The number of matching files.
         """
-        pattern = f"{prefix}*" if prefix else "*"
-        # Count files with known extensions
-        total = 0
-        for ext in [".json", ".npy"]:
-            total += len(list(self.base_path.glob(f"{pattern}{ext}")))
+        if self.index is not None:
+            total = self.index.count(prefix)
+        else:
+            total = sum(1 for _ in self._scan_keys(prefix))
         logger.debug("count(prefix=%r) = %d", prefix, total)
         return total
 
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys matching prefix.
+
+        Keys are yielded in sorted order when the key index is enabled,
+        and in directory order otherwise.
+
+        Args:
+            prefix: Optional prefix to filter keys.
+
+        Returns:
+            An iterator over matching keys (without extension).
+        """
+        logger.debug("keys(prefix=%r) called", prefix)
+        if self.index is not None:
+            return self.index.keys(prefix)
+        return self._scan_keys(prefix)
+
     def exists(self, key: str) -> bool:
         """Check if key exists.
 
@@ -128,22 +288,181 @@ class LocalFileSystem(IFileSystem):
         logger.debug("exists(key=%r) = %s", key, found)
         return found
 
+    def delete(self, key: str) -> None:
+        """Delete the file stored under key.
+
+        Args:
+            key: The key to delete (without extension).
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        logger.debug("delete() called with key=%r", key)
+        full_key = self._resolve(key)
+        path = self.layout.path_for(full_key)
+        with self._missing_as_not_found(key):
+            path.unlink()
+        if self.index is not None:
+            self.index.discard(key)
+        # Makes the removal durable like a save ("always": fsync the directory)
+        self.durability.after_publish(path)
+        logger.info("Deleted key=%r", key)
+
+    def sync(self) -> None:
+        """Group-commit writes pending under the "batch" durability mode."""
+        self.durability.sync()
+
+    def close(self) -> None:
+        """Stop the serializer processes started by save_many(executor="process")."""
+        self._serializers.close()
+
     def _open(self, full_key: str, mode: str) -> IO[bytes]:
         """Open a local file for the given key.
 
+        Files opened with "wb" are written atomically: they appear at
+        their final path only when closed without error. "xb" does the
+        same but fails with the builtin FileExistsError on close if the
+        key already exists under any extension.
+
         Args:
             full_key: The full key including extension (e.g., "data.npy").
-            mode: The file mode ("rb" for read, "wb" for write).
+            mode: The file mode ("rb" for read, "wb"/"xb" for write).
 
         Returns:
             An open file object.
         """
-        file_path = self.base_path / full_key
+        file_path = self.layout.path_for(full_key)
         logger.debug("Opening %s with mode=%r", file_path, mode)
+        return self._open_path(file_path, mode, full_key)
+
+    def _open_path(self, file_path: Path, mode: str, full_key: str) -> IO[bytes]:
+        """Open a path, routing "wb" and "xb" through an atomic writer."""
+        if mode == "wb":
+            return AtomicWriter(file_path, self.durability, tmp_dir=self._tmp_dir)
+        if mode == "xb":
+            key, _ = split_key(full_key, self.factory.extensions)
+            return AtomicWriter(
+                file_path,
+                self.durability,
+                exclusive=True,
+                claim=claim_path(file_path, key),
+                stored=lambda: self._probe(key) is not None,
+                tmp_dir=self._tmp_dir,
+            )
         return open(file_path, mode)
 
+    def refresh(self) -> None:
+        """Rebuild the key index from a directory scan.
+
+        Only needed when other processes or tools write into the base
+        directory while this instance is alive.
+        """
+        if self.index is not None:
+            self.index.rebuild()
+
+    def _scan_keys(self, prefix: str = "") -> Iterator[str]:
+        """Yield keys matching prefix by scanning the store once."""
+        extensions = self.factory.extensions
+        for entry in self.layout.scan():
+            if entry.name.startswith(prefix):
+                split = split_key(entry.name, extensions)
+                if split is not None:
+                    yield split[0]
+
+    def _write(self, key: str, handler: IFileHandler, obj: Any) -> None:
+        """Serialize obj through handler into the file for key."""
+        self._publish(key, handler, lambda f: handler.to_file(obj, f))
+
+    def _write_bytes(self, key: str, handler: IFileHandler, data: bytes) -> None:
+        """Write data already serialized by handler into the file for key."""
+        self._publish(key, handler, lambda f: f.write(data))
+
+    def _publish(
+        self,
+        key: str,
+        handler: IFileHandler,
+        write: Callable[[IO[bytes]], Any],
+        exclusive: bool = True,
+    ) -> None:
+        """Write the file for key through write() and record it in the index.
+
+        Raises:
+            FileExistsError: If exclusive and the key already exists.
+        """
+        full_key = f"{key}{handler.extension}"
+        logger.debug("Selected %s handler, full_key=%s", handler.type_name, full_key)
+
+        # The file only becomes visible under full_key once the with block completes
+        try:
+            with self._open(full_key, "xb" if exclusive else "wb") as f:
+                write(f)
+                f.flush()
+                st = os.fstat(f.fileno())
+        except builtins.FileExistsError:
+            logger.warning("Key %r already exists", key)
+            # Saved by another instance: make exists() and get() agree
+            self._probe(key)
+            raise FileExistsError(key) from None
+        if self.index is not None:
+            self.index.add(key, handler.extension, st.st_size, st.st_mtime_ns)
+
+        logger.info("Saved key=%r using %s handler", key, handler.type_name)
+
+    def _read(self, key: str, full_key: str, columns: list[str] | None = None) -> Any:
+        """Deserialize the file full_key that stores key."""
+        # Get handler based on file extension
+        handler = self.factory.get_handler_for_file(Path(full_key))
+        logger.debug("Found %s, using %s handler", full_key, handler.type_name)
+
+        if isinstance(handler, DataFrameHandler):
+            # Map the file so unneeded columns are never read
+            with self._missing_as_not_found(key):
+                result = handler.from_path(self.layout.path_for(full_key), columns)
+            logger.info("Loaded key=%r using %s handler", key, handler.type_name)
+            return result
+        if columns is not None:
+            raise ValueError(f"Key '{key}' is not a DataFrame ({handler.type_name})")
+
+        # Load using handler with file-like object
+        with self._missing_as_not_found(key):
+            f = self._open(full_key, "rb")
+        with f:
+            result = handler.from_file(f)
+
+        logger.info("Loaded key=%r using %s handler", key, handler.type_name)
+        return result
+
+    @contextmanager
+    def _missing_as_not_found(self, key: str) -> Iterator[None]:
+        """Translate a vanished file into FileNotFoundError.
+
+        The index can outlive files removed behind our back; such keys are
+        dropped from the index so later lookups miss without touching disk.
+        """
+        try:
+            yield
+        except OSError as e:
+            # Some libraries (e.g. polars) raise FileNotFoundError without an errno
+            if e.errno != errno.ENOENT and not isinstance(e, builtins.FileNotFoundError):
+                raise
+            logger.warning("Indexed key %r is missing on disk, dropping it", key)
+            if self.index is not None:
+                self.index.discard(key)
+            raise FileNotFoundError(key) from e
+
+    def _resolve(self, key: str) -> str:
+        """Find the file for key, raising FileNotFoundError if there is none."""
+        full_key = self._find_file(key)
+        if full_key is None:
+            logger.warning("Key %r not found in %s", key, self.base_path)
+            raise FileNotFoundError(key)
+        return full_key
+
     def _find_file(self, key: str) -> str | None:
-        """Find a file by key (checking all known extensions).
+        """Find a file by key.
+
+        Uses the key index when enabled; on an index miss, or without an
+        index, checks all known extensions on disk.
 
         Args:
             key: The key to find (without extension).
@@ -151,9 +470,26 @@ class LocalFileSystem(IFileSystem):
         Returns:
             The full key with extension if found, None otherwise.
         """
-        for ext in [".json", ".npy"]:
+        if self.index is not None:
+            entry = self.index.lookup(key)
+            if entry is not None:
+                return f"{key}{entry.extension}"
+        return self._probe(key)
+
+    def _probe(self, key: str) -> str | None:
+        """Find the file for key on disk, bypassing the index.
+
+        A file found this way was saved by another instance (or process)
+        since the index was loaded, so it is added to the index.
+        """
+        for ext in self.factory.extensions:
             full_key = f"{key}{ext}"
-            path = self.base_path / full_key
-            if path.exists():
-                return full_key
+            try:
+                st = self.layout.path_for(full_key).stat()
+            except builtins.FileNotFoundError:
+                continue
+            if self.index is not None:
+                logger.debug("Key %r found on disk but not in the index, adding it", key)
+                self.index.add(key, ext, st.st_size, st.st_mtime_ns)
+            return full_key
         return None
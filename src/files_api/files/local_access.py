@@ -0,0 +1,344 @@
+"""Direct-access operations for LocalFileSystem.
+
+Metadata, memory maps, slices, in-place appends, streaming and lazy
+scans that bypass the regular whole-object get() and save() paths.
+"""
+
+import fcntl
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+import numpy as np
+
+from files_api.files.atomic import Durability
+from files_api.files.batch import BatchResult, collect, run_batch
+from files_api.files.exceptions import FileNotFoundError
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.compression import CompressedHandler
+from files_api.files.handlers.dataframe_handler import DataFrameHandler
+from files_api.files.handlers.json_handler import JsonHandler
+from files_api.files.handlers.numpy_handler import NumpyHandler, RowIndex
+from files_api.files.index import KeyIndex
+from files_api.files.info import ObjectInfo
+from files_api.files.layout import FlatLayout, ShardedLayout
+
+if TYPE_CHECKING:
+    import polars as pl
+
+logger = logging.getLogger(__name__)
+
+
+class LocalAccessMixin:
+    """Paths of LocalFileSystem that work on files directly.
+
+    Relies on the host class for key resolution and file access.
+    """
+
+    base_path: Path
+    factory: FileHandlerFactory
+    layout: FlatLayout | ShardedLayout
+    max_workers: int | None
+    durability: Durability
+    index: KeyIndex | None
+
+    if TYPE_CHECKING:
+        # Provided by LocalFileSystem
+
+        def keys(self, prefix: str = "") -> Iterator[str]: ...
+        def _find_file(self, key: str) -> str | None: ...
+        def _resolve(self, key: str) -> str: ...
+        def _open(self, full_key: str, mode: str) -> IO[bytes]: ...
+        def _missing_as_not_found(self, key: str) -> AbstractContextManager[None]: ...
+        def _publish(
+            self,
+            key: str,
+            handler: IFileHandler,
+            write: Callable[[IO[bytes]], Any],
+            exclusive: bool = True,
+        ) -> None: ...
+
+    def info(self, key: str) -> ObjectInfo:
+        """Describe a stored object without loading it.
+
+        Only the file's header is read: the .npy/.npc header for arrays,
+        the Arrow IPC footer for DataFrames, and a bounded prefix of JSON
+        files for the envelope's __type__ and __version__.
+
+        Args:
+            key: The key to describe (without extension).
+
+        Returns:
+            The object's ObjectInfo.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the header cannot be read.
+        """
+        logger.debug("info() called with key=%r", key)
+
+        full_key = self._resolve(key)
+
+        file_path = self.layout.path_for(full_key)
+        handler = self.factory.get_handler_for_file(file_path)
+        with self._missing_as_not_found(key):
+            if isinstance(handler, DataFrameHandler):
+                st = os.stat(file_path)
+                fields = handler.read_info(file_path)
+            else:
+                with self._open(full_key, "rb") as f:
+                    st = os.fstat(f.fileno())
+                    fields = handler.read_info(f)
+
+        return ObjectInfo(
+            key=key,
+            format=handler.type_name,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            **fields,
+        )
+
+    def info_many(self, keys: Iterable[str]) -> BatchResult:
+        """Describe many objects concurrently, collecting per-key errors.
+
+        Args:
+            keys: The keys to describe (without extension).
+
+        Returns:
+            A BatchResult with the ObjectInfo for every key that was read
+            and the exception for every key that failed.
+        """
+        keys = list(dict.fromkeys(keys))
+        logger.debug("info_many() called with %d keys", len(keys))
+        result = BatchResult()
+        futures = run_batch({key: (self.info, key) for key in keys}, self.max_workers)
+        collect(futures, result)
+        logger.info("info_many() described %d, failed %d", len(result.values), len(result.errors))
+        return result
+
+    def get_mmap(self, key: str, mode: str = "r") -> Any:
+        """Get a numpy array by key as a memory-mapped, zero-copy view.
+
+        Nothing is read up front: pages are faulted in by the OS as they
+        are touched and shared across processes reading the same key.
+        Object arrays can't be mapped and are loaded normally.
+
+        Args:
+            key: The key to retrieve (without extension).
+            mode: The np.memmap mode ("r", "r+" or "c").
+
+        Returns:
+            An np.memmap-backed array.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            ValueError: If the key is not a numpy array or mode is unsupported.
+            DeserializationError: If the file cannot be read.
+        """
+        logger.debug("get_mmap() called with key=%r, mode=%r", key, mode)
+
+        full_key = self._resolve(key)
+
+        file_path = self.layout.path_for(full_key)
+        handler = self.factory.get_handler_for_file(file_path)
+        if not isinstance(handler, NumpyHandler):
+            raise ValueError(f"Key '{key}' is not a numpy array ({handler.type_name})")
+
+        with self._missing_as_not_found(key):
+            result = handler.from_path(file_path, mmap_mode=mode)
+
+        logger.info("Mapped key=%r (mode=%r)", key, mode)
+        return result
+
+    def get_slice(self, key: str, index: RowIndex) -> Any:
+        """Read selected rows of a stored numpy array.
+
+        Parses the .npy header and reads only the bytes of the selected
+        rows (axis 0), so e.g. ``get_slice("x", slice(1_000_000, 1_010_000))``
+        costs the same on a huge array as on a small one.
+
+        Args:
+            key: The key of an array saved as .npy (without extension).
+            index: An integer, a slice, or a tuple starting with one of those
+                (the remaining entries index the other axes in memory).
+
+        Returns:
+            The selected data, as get(key)[index] would return it.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            ValueError: If the key is not stored as .npy.
+            IndexError: If the row index is out of range.
+            DeserializationError: If the file cannot be read.
+        """
+        logger.debug("get_slice() called with key=%r, index=%r", key, index)
+
+        full_key = self._resolve(key)
+
+        handler = self.factory.get_handler_for_file(Path(full_key))
+        if not isinstance(handler, NumpyHandler):
+            raise ValueError(f"Key '{key}' is not a .npy array ({handler.type_name})")
+
+        with self._missing_as_not_found(key):
+            f = self._open(full_key, "rb")
+        with f:
+            return handler.read_slice(f, index)
+
+    def append(self, key: str, rows: Any) -> tuple[int, ...]:
+        """Append rows along axis 0 of a stored array without rewriting it.
+
+        The rows are written to the end of the .npy file and the shape in
+        its header is then patched in place, so concurrent readers always
+        see a consistent shape. Appenders are serialized with an exclusive
+        flock on the file. Files whose header has no room to grow (not
+        written by np.save) are rewritten once instead.
+
+        Args:
+            key: The key of an array saved as .npy (without extension).
+            rows: Rows matching the stored trailing shape, or a single row.
+
+        Returns:
+            The new shape of the stored array.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            ValueError: If the key is not a growable .npy array or rows
+                don't match it.
+        """
+        logger.debug("append() called with key=%r", key)
+        full_key = self._resolve(key)
+        handler = self.factory.get_handler_for_file(Path(full_key))
+        if not isinstance(handler, NumpyHandler):
+            raise ValueError(f"Key '{key}' is not a .npy array ({handler.type_name})")
+
+        path = self.layout.path_for(full_key)
+        f = self._open_locked(key, full_key, path)
+        with f:
+            fd = f.fileno()
+            shape = handler.append_rows(f, rows, lambda: self.durability.before_publish(fd))
+            if shape is None:
+                f.seek(0)
+                existing = handler.from_file(f)
+                rows = np.asarray(rows, dtype=existing.dtype).reshape(-1, *existing.shape[1:])
+                combined = np.concatenate([existing, rows])
+                # Replaces the file in place, so not an exclusive publish
+                self._publish(
+                    key, handler, lambda out: handler.to_file(combined, out), exclusive=False
+                )
+                return combined.shape
+            self.durability.after_update(fd, path)
+            st = os.fstat(fd)
+        if self.index is not None:
+            self.index.add(key, handler.extension, st.st_size, st.st_mtime_ns)
+        return shape
+
+    def _open_locked(self, key: str, full_key: str, path: Path) -> IO[bytes]:
+        """Open the file of key for update under an exclusive flock.
+
+        A rewrite by another appender replaces the file; one that happened
+        while we waited for the lock is detected by its new inode, and the
+        new file is opened instead (writes to the old one would be lost).
+        """
+        while True:
+            with self._missing_as_not_found(key):
+                f = self._open(full_key, "r+b")
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                with self._missing_as_not_found(key):
+                    if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                        return f
+            except BaseException:
+                f.close()
+                raise
+            f.close()
+            logger.debug("File of key %r was replaced while waiting for the lock", key)
+
+    def iter_items(self, key: str) -> Iterator[Any]:
+        """Stream the elements of a stored list with bounded memory.
+
+        The file is opened immediately (so a missing key fails here) and
+        closed when the iterator is exhausted or closed.
+
+        Args:
+            key: The key of a list saved as JSON, optionally compressed
+                (without extension).
+
+        Returns:
+            An iterator over the list elements.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            ValueError: If the key is not stored as JSON.
+            DeserializationError: If the stored data is not a list or is invalid.
+        """
+        logger.debug("iter_items() called with key=%r", key)
+
+        full_key = self._resolve(key)
+
+        handler = self.factory.get_handler_for_file(Path(full_key))
+        compressed = isinstance(handler, CompressedHandler)
+        json_handler = handler.inner if compressed else handler
+        if not isinstance(json_handler, JsonHandler):
+            raise ValueError(f"Key '{key}' does not support streaming ({handler.type_name})")
+
+        with self._missing_as_not_found(key):
+            f = self._open(full_key, "rb")
+
+        def stream() -> Iterator[Any]:
+            with f, handler.reader(f) if compressed else nullcontext(f) as source:
+                yield from json_handler.iter_items(source)
+
+        return stream()
+
+    def scan(self, key_or_prefix: str) -> "pl.LazyFrame":
+        """Lazily scan one stored DataFrame, or all of them under a prefix.
+
+        Returns a polars LazyFrame over the Arrow IPC files, so filters
+        and column selections are pushed down into the read and only the
+        needed columns are loaded. An exact key match wins; otherwise
+        every DataFrame key starting with key_or_prefix is scanned, in
+        key order and in parallel, as one dataset (their schemas must
+        match). Non-DataFrame keys under the prefix are skipped, and a
+        pandas frame's stored index is not part of its columns.
+
+        Args:
+            key_or_prefix: A DataFrame key, or a prefix of several.
+
+        Returns:
+            A polars LazyFrame.
+
+        Raises:
+            FileNotFoundError: If no DataFrame key matches.
+            ValueError: If key_or_prefix is an exact key that isn't a DataFrame.
+        """
+        import polars as pl
+
+        logger.debug("scan() called with key_or_prefix=%r", key_or_prefix)
+        full_key = self._find_file(key_or_prefix)
+        if full_key is not None:
+            handler = self.factory.get_handler_for_file(Path(full_key))
+            if not isinstance(handler, DataFrameHandler):
+                raise ValueError(f"Key '{key_or_prefix}' is not a DataFrame ({handler.type_name})")
+            sources = [(self.layout.path_for(full_key), handler)]
+        else:
+            sources = []
+            for key in sorted(self.keys(key_or_prefix)):
+                full_key = self._find_file(key)
+                if full_key is None:
+                    continue
+                handler = self.factory.get_handler_for_file(Path(full_key))
+                if isinstance(handler, DataFrameHandler):
+                    sources.append((self.layout.path_for(full_key), handler))
+            if not sources:
+                logger.warning("No DataFrame keys match %r", key_or_prefix)
+                raise FileNotFoundError(key_or_prefix)
+
+        logger.info("Scanning %d DataFrame file(s) for %r", len(sources), key_or_prefix)
+        if all(handler.flavor == "polars" for _, handler in sources):
+            return pl.scan_ipc([path for path, _ in sources])
+        # pandas files may carry index columns, which each scan drops
+        return pl.concat([handler.scan(path) for path, handler in sources])
@@ -0,0 +1,230 @@
+"""In-memory file system for tests and ephemeral pipeline stages."""
+
+import io
+import logging
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+
+from files_api.files.atomic import CommitBuffer
+from files_api.files.exceptions import FileExistsError, FileNotFoundError, MemoryLimitError
+from files_api.files.factory import Compression, FileHandlerFactory
+from files_api.files.index import SortedKeys
+from files_api.files.interface import IFileSystem
+from files_api.files.sizing import estimate_size
+
+logger = logging.getLogger(__name__)
+
+MEMORY_MODES = ("faithful", "fast")
+
+
+class MemoryFileSystem(IFileSystem):
+    """File system keeping every object in process memory.
+
+    Modes:
+        faithful: Objects go through the same handlers as on disk into
+            in-memory buffers, so formats, type conversions and
+            serialization errors match LocalFileSystem exactly.
+        fast: Objects are stored by reference with no serialization at
+            all. Arrays are stored and returned as read-only views, so a
+            caller that wants to modify one takes a copy first
+            (copy-on-write); other objects are shared and must be treated
+            as immutable. Objects that the handlers could not serialize
+            are accepted.
+
+    Both modes raise FileExistsError and FileNotFoundError like the disk
+    backends. With max_bytes, a save that would take the stored size
+    (serialized bytes in faithful mode, in-memory size in fast mode)
+    over the limit raises MemoryLimitError.
+    """
+
+    def __init__(
+        self,
+        mode: str = "faithful",
+        max_bytes: int | None = None,
+        factory: FileHandlerFactory | None = None,
+    ):
+        """Initialize an empty store.
+
+        Args:
+            mode: "faithful" or "fast".
+            max_bytes: Maximum total size of stored objects (no limit if None).
+            factory: Handler factory to use. Defaults to FileHandlerFactory().
+
+        Raises:
+            ValueError: If mode is unknown or max_bytes is negative.
+        """
+        if mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode: '{mode}'")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.factory = factory or FileHandlerFactory()
+        # key -> (extension, bytes or object, size)
+        self._entries: dict[str, tuple[str, Any, int]] = {}
+        self._sorted_keys = SortedKeys()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        logger.info("Initialized MemoryFileSystem (mode=%s, max_bytes=%s)", mode, max_bytes)
+
+    @property
+    def current_bytes(self) -> int:
+        """Total size of the stored objects."""
+        return self._current_bytes
+
+    def save(self, key: str, obj: Any, compression: Compression | None = None) -> None:
+        """Save object with given key.
+
+        Args:
+            key: The key to save the object under (without extension).
+            obj: The object to save.
+            compression: Overrides the factory's compression policy, as in
+                LocalFileSystem.save() (faithful mode only).
+
+        Raises:
+            FileExistsError: If the key already exists.
+            SerializationError: If the object cannot be serialized (faithful mode).
+            MemoryLimitError: If the object would exceed max_bytes.
+        """
+        logger.debug("save() called with key=%r, obj_type=%s", key, type(obj).__name__)
+        if key in self._entries:
+            logger.warning("Key %r already exists", key)
+            raise FileExistsError(key)
+
+        handler = self.factory.get_handler_for_object(obj, compression)
+        if self.mode == "fast":
+            if isinstance(obj, np.ndarray):
+                obj = obj.view()
+                obj.flags.writeable = False
+            self._put(key, handler.extension, obj, estimate_size(obj))
+        else:
+            with self._open(f"{key}{handler.extension}", "wb") as f:
+                handler.to_file(obj, f)
+        logger.info("Saved key=%r using %s handler (%s)", key, handler.type_name, self.mode)
+
+    def get(self, key: str) -> Any:
+        """Get object by key.
+
+        Args:
+            key: The key to retrieve (without extension).
+
+        Returns:
+            The object: freshly deserialized in faithful mode, the stored
+            object itself in fast mode.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the data cannot be deserialized.
+        """
+        extension, value = self._lookup(key)
+        if self.mode == "fast":
+            return value
+        handler = self.factory.get_handler_for_file(Path(f"{key}{extension}"))
+        with io.BytesIO(value) as f:
+            return handler.from_file(f)
+
+    def delete(self, key: str) -> None:
+        """Delete the object stored under key.
+
+        Args:
+            key: The key to delete (without extension).
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                logger.warning("Key %r not found in memory", key)
+                raise FileNotFoundError(key)
+            self._sorted_keys.discard(key)
+            self._current_bytes -= entry[2]
+        logger.info("Deleted key=%r", key)
+
+    def count(self, prefix: str = "") -> int:
+        """Count keys starting with prefix in O(log n)."""
+        with self._lock:
+            return self._sorted_keys.count(prefix)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys starting with prefix, in sorted order."""
+        with self._lock:
+            return iter(self._sorted_keys.keys(prefix))
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists."""
+        return key in self._entries
+
+    def clear(self) -> None:
+        """Remove every stored object."""
+        with self._lock:
+            self._entries.clear()
+            self._sorted_keys.clear()
+            self._current_bytes = 0
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        """Open an in-memory file for the given full key.
+
+        In fast mode, reading serializes the stored object on demand and
+        writing deserializes the written bytes, so both modes expose the
+        same bytes a file on disk would hold.
+
+        Args:
+            key: The full key including extension (e.g., "data.json").
+            mode: The file mode ("rb" for read, "wb" for write).
+
+        Returns:
+            A file-like object.
+
+        Raises:
+            FileNotFoundError: If mode is "rb" and no object has that full key.
+            ValueError: If the mode or extension is unsupported.
+        """
+        handler = self.factory.get_handler_for_file(Path(key))
+        base_key = key[: -len(handler.extension)]
+        if mode == "wb":
+
+            def commit(data: bytes) -> None:
+                if self.mode == "fast":
+                    obj = handler.from_file(io.BytesIO(data))
+                    self._put(base_key, handler.extension, obj, estimate_size(obj))
+                else:
+                    self._put(base_key, handler.extension, data, len(data))
+
+            return CommitBuffer(commit)
+        if mode != "rb":
+            raise ValueError(f"Unsupported mode: {mode!r}")
+        extension, value = self._lookup(base_key)
+        if extension != handler.extension:
+            raise FileNotFoundError(base_key)
+        if self.mode == "fast":
+            buffer = io.BytesIO()
+            handler.to_file(value, buffer)
+            buffer.seek(0)
+            return buffer
+        return io.BytesIO(value)
+
+    def _lookup(self, key: str) -> tuple[str, Any]:
+        """Return (extension, stored value), raising FileNotFoundError if missing."""
+        entry = self._entries.get(key)
+        if entry is None:
+            logger.warning("Key %r not found in memory", key)
+            raise FileNotFoundError(key)
+        return entry[0], entry[1]
+
+    def _put(self, key: str, extension: str, value: Any, size: int) -> None:
+        """Store a new entry, enforcing uniqueness and max_bytes."""
+        with self._lock:
+            if key in self._entries:
+                logger.warning("Key %r already exists", key)
+                raise FileExistsError(key)
+            if self.max_bytes is not None and self._current_bytes + size > self.max_bytes:
+                logger.warning("Key %r (%d bytes) exceeds max_bytes", key, size)
+                raise MemoryLimitError(key, size, self.max_bytes)
+            self._entries[key] = (extension, value, size)
+            self._sorted_keys.add(key)
+            self._current_bytes += size
@@ -0,0 +1,365 @@
+"""File system on an S3-style object store with parallel transfers."""
+
+import contextlib
+import io
+import logging
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import IO, Any
+
+from files_api.files.batch import BatchResult, collect, run_batch
+from files_api.files.exceptions import FileExistsError, FileNotFoundError, ObjectStoreError
+from files_api.files.factory import Compression, FileHandlerFactory
+from files_api.files.index import split_key
+from files_api.files.interface import IFileSystem
+from files_api.files.object_store_client import ByteBudget, ObjectEntry, ObjectStoreClient
+
+logger = logging.getLogger(__name__)
+
+# Objects are split into parts (uploads) and ranges (downloads) of this size
+DEFAULT_PART_SIZE = 8 << 20
+
+# Default cap on part and range bytes being transferred at once
+DEFAULT_INFLIGHT_BYTES = 128 << 20
+
+
+class ObjectStoreFileSystem(IFileSystem):
+    """File system storing each object as one object in an S3-style bucket.
+
+    Objects are named ``<prefix><key><extension>``. Writes stream the
+    handler's output in part_size parts: an object that fits in one part
+    is a single PUT, anything larger becomes a multipart upload whose
+    parts are sent in parallel while the handler is still serializing.
+    Reads fetch objects larger than one part as parallel ranged GETs
+    written straight into one preallocated buffer.
+
+    Transfers share a pool of max_workers threads and keep-alive
+    connections, and at most max_inflight_bytes of parts and ranges are
+    in flight at once: a writer that gets ahead of the network blocks
+    until earlier parts finish, so memory stays bounded however large
+    the object.
+
+    Saves are conditional (If-None-Match), so two writers racing on the
+    same key and extension can't both succeed.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        bucket: str,
+        prefix: str = "",
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = 8,
+        max_inflight_bytes: int = DEFAULT_INFLIGHT_BYTES,
+        timeout: float = 60.0,
+        factory: FileHandlerFactory | None = None,
+    ):
+        """Initialize the file system.
+
+        Args:
+            endpoint: Base URL of the store, e.g. "http://127.0.0.1:9000".
+            bucket: The bucket holding the objects.
+            prefix: Prepended to every object name, e.g. "datasets/".
+            part_size: Bytes per uploaded part and per ranged read. S3
+                requires parts (but the last) of at least 5 MiB.
+            max_workers: Parallel transfers, and pooled connections.
+            max_inflight_bytes: Cap on part and range bytes in flight.
+            timeout: Socket timeout in seconds.
+            factory: Handler factory to use. Defaults to FileHandlerFactory().
+
+        Raises:
+            ValueError: If the endpoint or a size is invalid.
+        """
+        if part_size <= 0:
+            raise ValueError(f"part_size must be positive, got {part_size}")
+        self.prefix = prefix
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.factory = factory or FileHandlerFactory()
+        self.client = ObjectStoreClient(endpoint, bucket, pool_size=max_workers, timeout=timeout)
+        self.budget = ByteBudget(max_inflight_bytes)
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="files-transfer")
+        self._extensions = self.factory.extensions
+        logger.info(
+            "Initialized ObjectStoreFileSystem at %s/%s/%s (part_size=%d, max_workers=%d)",
+            endpoint,
+            bucket,
+            prefix,
+            part_size,
+            max_workers,
+        )
+
+    def save(self, key: str, obj: Any, compression: Compression | None = None) -> None:
+        """Serialize obj and upload it, in parallel parts if it is large.
+
+        Args:
+            key: The key to save the object under (without extension).
+            obj: The object to save.
+            compression: Overrides the factory's compression policy, as in
+                LocalFileSystem.save().
+
+        Raises:
+            FileExistsError: If the key already exists.
+            SerializationError: If the object cannot be serialized.
+            ObjectStoreError: If the store rejects a request.
+        """
+        logger.debug("save() called with key=%r, obj_type=%s", key, type(obj).__name__)
+        if self._find(key) is not None:
+            logger.warning("Key %r already exists", key)
+            raise FileExistsError(key)
+
+        handler = self.factory.get_handler_for_object(obj, compression)
+        with self._open(f"{key}{handler.extension}", "wb") as f:
+            handler.to_file(obj, f)
+        logger.info("Saved key=%r using %s handler", key, handler.type_name)
+
+    def save_many(
+        self, items: Mapping[str, Any], compression: Compression | None = None
+    ) -> BatchResult:
+        """Save many objects concurrently, collecting per-key errors."""
+        logger.debug("save_many() called with %d items", len(items))
+        calls = {key: (self.save, key, obj, compression) for key, obj in items.items()}
+        result = BatchResult()
+        collect(run_batch(calls, self.max_workers), result)
+        logger.info("save_many() saved %d, failed %d", len(result.values), len(result.errors))
+        return result
+
+    def get(self, key: str) -> Any:
+        """Download and deserialize an object.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the data cannot be deserialized.
+            ObjectStoreError: If the store rejects a request.
+        """
+        entry = self._find(key)
+        if entry is None:
+            logger.warning("Key %r not found", key)
+            raise FileNotFoundError(key)
+        name = entry.name[len(self.prefix) :]
+        handler = self.factory.get_handler_for_file(Path(name))
+        with io.BytesIO(self._download(entry.name, entry.size, key)) as f:
+            result = handler.from_file(f)
+        logger.info("Loaded key=%r using %s handler", key, handler.type_name)
+        return result
+
+    def get_many(self, keys: Iterable[str]) -> BatchResult:
+        """Get many objects concurrently, collecting per-key errors."""
+        calls = {key: (self.get, key) for key in dict.fromkeys(keys)}
+        result = BatchResult()
+        collect(run_batch(calls, self.max_workers), result)
+        logger.info("get_many() loaded %d, failed %d", len(result.values), len(result.errors))
+        return result
+
+    def delete(self, key: str) -> None:
+        """Delete the object stored under key.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        entry = self._find(key)
+        if entry is None:
+            logger.warning("Key %r not found", key)
+            raise FileNotFoundError(key)
+        self.client.delete(entry.name)
+        logger.info("Deleted key=%r", key)
+
+    def count(self, prefix: str = "") -> int:
+        """Count keys starting with prefix (one listing)."""
+        return sum(1 for _ in self._list_keys(prefix))
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys starting with prefix, in sorted order."""
+        return iter(sorted(self._list_keys(prefix)))
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists (one listing of the key's objects)."""
+        return self._find(key) is not None
+
+    def close(self) -> None:
+        """Stop the transfer threads and close pooled connections."""
+        self._pool.shutdown()
+        self.client.close()
+        logger.info("Closed ObjectStoreFileSystem")
+
+    def __enter__(self) -> "ObjectStoreFileSystem":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        """Open an object for the given full key.
+
+        "rb" downloads the object into memory; "wb" returns a writer that
+        uploads as it is written and publishes the object when closed
+        without error.
+
+        Args:
+            key: The full key including extension (e.g., "data.json").
+            mode: The file mode ("rb" for read, "wb" for write).
+
+        Raises:
+            FileNotFoundError: If mode is "rb" and the object doesn't exist.
+            FileExistsError: If the written object already exists (on close).
+            ValueError: If the mode is unsupported.
+        """
+        name = f"{self.prefix}{key}"
+        if mode == "wb":
+            return _PartWriter(self, name, key)
+        if mode != "rb":
+            raise ValueError(f"Unsupported mode: {mode!r}")
+        try:
+            size = self.client.head(name)
+        except ObjectStoreError as e:
+            if e.status == 404:
+                raise FileNotFoundError(key) from None
+            raise
+        return io.BytesIO(self._download(name, size, key))
+
+    def _find(self, key: str) -> ObjectEntry | None:
+        """The object stored for key, under any known extension."""
+        # Every extension starts with "." so this lists the key's objects
+        # plus keys extending it with a dot, which split_key filters out.
+        for entry in self.client.list_objects(f"{self.prefix}{key}."):
+            parts = split_key(entry.name[len(self.prefix) :], self._extensions)
+            if parts is not None and parts[0] == key:
+                return entry
+        return None
+
+    def _list_keys(self, prefix: str) -> Iterator[str]:
+        for entry in self.client.list_objects(f"{self.prefix}{prefix}"):
+            parts = split_key(entry.name[len(self.prefix) :], self._extensions)
+            if parts is not None:
+                yield parts[0]
+
+    def _download(self, name: str, size: int, key: str) -> bytearray:
+        """Read a whole object, as parallel ranged GETs if it spans several parts."""
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        futures = []
+        for start in range(0, size, self.part_size):
+            out = view[start : start + self.part_size]
+            futures.append(self._submit(len(out), self.client.get_range, name, start, out))
+        try:
+            _wait_all(futures)
+        except ObjectStoreError as e:
+            if e.status == 404:
+                raise FileNotFoundError(key) from None
+            raise
+        logger.debug("Downloaded %s (%d bytes in %d ranges)", name, size, len(futures))
+        return buffer
+
+    def _submit(self, size: int, fn: Any, *args: Any) -> Future:
+        """Run a transfer of size bytes on the pool once the budget allows."""
+        taken = self.budget.acquire(size)
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(lambda _: self.budget.release(taken))
+        return future
+
+
+class _PartWriter(io.RawIOBase):
+    """Write-only file uploading its content in parts as it is written.
+
+    Content that never fills a part is sent as a single PUT on close.
+    As with CommitBuffer, a ``with`` block that raises commits nothing.
+    """
+
+    def __init__(self, fs: ObjectStoreFileSystem, name: str, key: str):
+        super().__init__()
+        self._fs = fs
+        self._name = name
+        self._key = key
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[Future] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self.closed:
+            raise ValueError("write to closed file")
+        size = memoryview(data).nbytes
+        self._buffer += data
+        part_size = self._fs.part_size
+        while len(self._buffer) >= part_size:
+            part = bytes(self._buffer[:part_size])
+            del self._buffer[:part_size]
+            self._send_part(part)
+        return size
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def __del__(self) -> None:
+        # IOBase.__del__ would close(), publishing a half-written object
+        with contextlib.suppress(Exception):
+            self.discard()
+
+    def close(self) -> None:
+        """Upload what is left and publish the object."""
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                with self._fs.budget.hold(len(self._buffer)):
+                    self._fs.client.put(self._name, self._buffer, if_none_match=True)
+            else:
+                if self._buffer:
+                    self._send_part(bytes(self._buffer))
+                etags = _wait_all(self._parts)
+                self._fs.client.complete_multipart(
+                    self._name, self._upload_id, etags, if_none_match=True
+                )
+                logger.debug("Uploaded %s in %d parts", self._name, len(etags))
+        except BaseException as e:
+            self._abort()
+            if isinstance(e, ObjectStoreError) and e.status == 412:
+                logger.warning("Key %r already exists", self._key)
+                raise FileExistsError(self._key) from None
+            raise
+        finally:
+            self._buffer = bytearray()
+            super().close()
+
+    def discard(self) -> None:
+        """Drop the content without publishing anything."""
+        if not self.closed:
+            self._abort()
+            super().close()
+
+    def _send_part(self, part: bytes) -> None:
+        if self._upload_id is None:
+            self._upload_id = self._fs.client.create_multipart(self._name)
+        number = len(self._parts) + 1
+        self._parts.append(
+            self._fs._submit(
+                len(part), self._fs.client.upload_part, self._name, self._upload_id, number, part
+            )
+        )
+
+    def _abort(self) -> None:
+        if self._upload_id is None:
+            return
+        wait(self._parts)
+        try:
+            self._fs.client.abort_multipart(self._name, self._upload_id)
+        except Exception as e:
+            logger.warning("Failed to abort upload of %s: %s", self._name, e)
+        self._upload_id = None
+
+
+def _wait_all(futures: list[Future]) -> list[Any]:
+    """Results of futures in order; on the first failure cancel the rest and raise."""
+    try:
+        return [future.result() for future in futures]
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        raise
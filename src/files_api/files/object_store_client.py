@@ -0,0 +1,286 @@
+"""Minimal HTTP client for S3-style object stores.
+
+Speaks the path-style S3 REST API (unsigned requests) over pooled
+keep-alive connections, using only the standard library. Used by
+ObjectStoreFileSystem; ObjectStoreServer is a local stand-in for tests.
+"""
+
+import http.client
+import logging
+import queue
+import threading
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from urllib.parse import quote, urlencode, urlsplit
+
+from files_api.files.exceptions import ObjectStoreError
+
+logger = logging.getLogger(__name__)
+
+# Errors after which a reused keep-alive connection is retried once
+_STALE_CONNECTION = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectEntry:
+    """One object of a listing."""
+
+    name: str
+    size: int
+
+
+class ByteBudget:
+    """Counting semaphore over bytes, bounding the data in flight.
+
+    A request larger than the whole budget is clamped to it, so it waits
+    for everything else to finish instead of blocking forever.
+    """
+
+    def __init__(self, capacity: int):
+        """Create a budget of capacity bytes."""
+        if capacity <= 0:
+            raise ValueError(f"Byte budget must be positive, got {capacity}")
+        self.capacity = capacity
+        self._available = capacity
+        self._cond = threading.Condition()
+
+    @property
+    def in_use(self) -> int:
+        """Bytes currently acquired."""
+        with self._cond:
+            return self.capacity - self._available
+
+    def acquire(self, size: int) -> int:
+        """Block until size bytes are free and take them; returns the amount taken."""
+        size = min(size, self.capacity)
+        with self._cond:
+            self._cond.wait_for(lambda: self._available >= size)
+            self._available -= size
+        return size
+
+    def release(self, size: int) -> None:
+        """Return bytes taken by acquire()."""
+        with self._cond:
+            self._available += size
+            self._cond.notify_all()
+
+    @contextmanager
+    def hold(self, size: int) -> Iterator[None]:
+        """Hold size bytes for the duration of a block."""
+        taken = self.acquire(size)
+        try:
+            yield
+        finally:
+            self.release(taken)
+
+
+class ObjectStoreClient:
+    """Blocking, thread-safe client for one bucket of an S3-style store.
+
+    Connections are kept alive and reused through a pool of at most
+    pool_size connections; callers beyond that wait for a free one.
+    Requests are unsigned, so the endpoint must accept anonymous access
+    (e.g. the ObjectStoreServer stand-in, or a signing proxy).
+    """
+
+    def __init__(self, endpoint: str, bucket: str, pool_size: int = 8, timeout: float = 60.0):
+        """Initialize the client.
+
+        Args:
+            endpoint: Base URL, e.g. "http://127.0.0.1:9000".
+            bucket: The bucket to address.
+            pool_size: Maximum number of open connections.
+            timeout: Socket timeout in seconds.
+
+        Raises:
+            ValueError: If the endpoint isn't an http(s) URL.
+        """
+        url = urlsplit(endpoint)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Unsupported object store endpoint: '{endpoint}'")
+        self.endpoint = endpoint
+        self.bucket = bucket
+        self.timeout = timeout
+        self._connection_class = (
+            http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        )
+        self._host, self._port = url.hostname, url.port
+        self._base = url.path.rstrip("/")
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+        self._open: set[http.client.HTTPConnection] = set()
+
+    def put(self, name: str, data: bytes | memoryview, if_none_match: bool = False) -> None:
+        """Upload an object in a single request.
+
+        Raises:
+            ObjectStoreError: 412 if if_none_match is set and the object exists.
+        """
+        headers = {"If-None-Match": "*"} if if_none_match else {}
+        self._request("PUT", name, body=data, headers=headers, expect=(200,))
+
+    def get_range(self, name: str, start: int, out: memoryview) -> None:
+        """Read len(out) bytes of an object starting at start into out."""
+        end = start + len(out) - 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        self._request("GET", name, headers=headers, expect=(200, 206), into=out)
+
+    def get(self, name: str) -> bytes:
+        """Read a whole object."""
+        return self._request("GET", name, expect=(200,))[1]
+
+    def head(self, name: str) -> int:
+        """Return an object's size."""
+        response, _ = self._request("HEAD", name, expect=(200,))
+        return int(response.getheader("Content-Length"))
+
+    def delete(self, name: str) -> None:
+        """Delete an object (succeeds if it doesn't exist, as in S3)."""
+        self._request("DELETE", name, expect=(200, 204))
+
+    def list_objects(self, prefix: str = "") -> Iterator[ObjectEntry]:
+        """Iterate over objects whose name starts with prefix, in name order."""
+        token = None
+        while True:
+            params = {"list-type": "2", "prefix": prefix}
+            if token:
+                params["continuation-token"] = token
+            _, body = self._request("GET", "", params=params, expect=(200,))
+            root = ET.fromstring(body)
+            for item in root.iterfind("{*}Contents"):
+                yield ObjectEntry(item.findtext("{*}Key"), int(item.findtext("{*}Size")))
+            if root.findtext("{*}IsTruncated") != "true":
+                return
+            token = root.findtext("{*}NextContinuationToken")
+
+    def create_multipart(self, name: str) -> str:
+        """Start a multipart upload and return its upload id."""
+        _, body = self._request("POST", name, params={"uploads": ""}, expect=(200,))
+        return ET.fromstring(body).findtext("{*}UploadId")
+
+    def upload_part(self, name: str, upload_id: str, number: int, data: memoryview) -> str:
+        """Upload one part (numbered from 1) and return its ETag."""
+        params = {"partNumber": str(number), "uploadId": upload_id}
+        response, _ = self._request("PUT", name, params=params, body=data, expect=(200,))
+        return response.getheader("ETag")
+
+    def complete_multipart(
+        self, name: str, upload_id: str, etags: list[str], if_none_match: bool = False
+    ) -> None:
+        """Assemble uploaded parts, in order, into the object.
+
+        Raises:
+            ObjectStoreError: 412 if if_none_match is set and the object exists.
+        """
+        parts = "".join(
+            f"<Part><PartNumber>{i}</PartNumber><ETag>{etag}</ETag></Part>"
+            for i, etag in enumerate(etags, start=1)
+        )
+        body = f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode()
+        headers = {"If-None-Match": "*"} if if_none_match else {}
+        params = {"uploadId": upload_id}
+        _, reply = self._request(
+            "POST", name, params=params, body=body, headers=headers, expect=(200,)
+        )
+        # S3 may report a failed completion in a 200 response
+        if ET.fromstring(reply).tag.endswith("Error"):
+            raise ObjectStoreError(500, reply.decode(errors="replace"))
+
+    def abort_multipart(self, name: str, upload_id: str) -> None:
+        """Abandon a multipart upload and drop its parts."""
+        self._request("DELETE", name, params={"uploadId": upload_id}, expect=(200, 204))
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            connections, self._open = self._open, set()
+        for conn in connections:
+            conn.close()
+
+    def _request(
+        self,
+        method: str,
+        name: str,
+        params: dict[str, str] | None = None,
+        body: bytes | memoryview | None = None,
+        headers: dict[str, str] | None = None,
+        expect: tuple[int, ...] = (200,),
+        into: memoryview | None = None,
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        """Send one request on a pooled connection and read the response.
+
+        The body is read into ``into`` when given (returning b""), else
+        returned. A request on a reused connection the server has since
+        closed is retried once on a fresh one.
+
+        Raises:
+            ObjectStoreError: If the status isn't in expect.
+        """
+        path = f"{self._base}/{quote(self.bucket)}"
+        if name:
+            path += f"/{quote(name, safe='/~')}"
+        if params:
+            path += f"?{urlencode(params)}"
+        headers = dict(headers or {})
+        headers["Content-Length"] = str(0 if body is None else len(body))
+
+        with self._slots:
+            for attempt in range(2):
+                conn, reused = self._checkout()
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    if response.status in expect and into is not None:
+                        _read_into(response, into)
+                        data = b""
+                    else:
+                        data = response.read()
+                except _STALE_CONNECTION:
+                    self._discard(conn)
+                    if not reused or attempt:
+                        raise
+                    logger.debug("Retrying %s %s on a fresh connection", method, path)
+                    continue
+                except BaseException:
+                    self._discard(conn)
+                    raise
+                if response.will_close:
+                    self._discard(conn)
+                else:
+                    self._idle.put(conn)
+                break
+
+        if response.status not in expect:
+            logger.debug("%s %s -> %d", method, path, response.status)
+            raise ObjectStoreError(response.status, data.decode(errors="replace"))
+        return response, data
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        """An idle connection, or a new one; also says whether it was reused."""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            conn = self._connection_class(self._host, self._port, timeout=self.timeout)
+            with self._lock:
+                self._open.add(conn)
+            return conn, False
+
+    def _discard(self, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+        with self._lock:
+            self._open.discard(conn)
+
+
+def _read_into(response: http.client.HTTPResponse, out: memoryview) -> None:
+    """Fill out from a response body, which must be exactly len(out) bytes."""
+    filled = 0
+    while filled < len(out):
+        n = response.readinto(out[filled:])
+        if not n:
+            raise ObjectStoreError(502, f"Body ended after {filled} of {len(out)} bytes")
+        filled += n
+    if response.read(1):
+        raise ObjectStoreError(502, f"Body longer than the expected {len(out)} bytes")
@@ -0,0 +1,245 @@
+"""In-process stand-in for an S3-style object store, for tests and benchmarks.
+
+Implements the subset of the path-style S3 REST API that
+ObjectStoreClient uses, on the standard library's http.server, keeping
+objects in memory. A per-request latency can be injected to model a
+remote store.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Keys per page of a listing, as in S3
+LIST_PAGE_SIZE = 1000
+
+
+class ObjectStoreServer:
+    """Threaded HTTP server holding buckets of objects in memory.
+
+    Use as a context manager; endpoint is the base URL to give
+    ObjectStoreClient or ObjectStoreFileSystem. Buckets spring into
+    existence on first use. Counters record the requests served and the
+    most requests ever handled at once.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        """Create the server (not yet serving).
+
+        Args:
+            latency: Seconds each request is delayed before it is handled.
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free one.
+        """
+        self.latency = latency
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.requests: dict[str, int] = {}
+        self.max_concurrency = 0
+        self._uploads: dict[str, dict[int, bytes]] = {}
+        self._active = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _handler_class(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def endpoint(self) -> str:
+        """Base URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="object-store-server", daemon=True
+        )
+        self._thread.start()
+        logger.info("Object store stand-in serving at %s", self.endpoint)
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "ObjectStoreServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def _enter_request(self, method: str) -> None:
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            self._active += 1
+            self.max_concurrency = max(self.max_concurrency, self._active)
+
+    def _exit_request(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+
+def _handler_class(server: ObjectStoreServer) -> type[BaseHTTPRequestHandler]:
+    """Request handler class bound to a server's state."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def log_message(self, format: str, *args: object) -> None:
+            logger.debug(format, *args)
+
+        def do_GET(self) -> None:
+            self._dispatch(self._get)
+
+        def do_HEAD(self) -> None:
+            self._dispatch(self._head)
+
+        def do_PUT(self) -> None:
+            self._dispatch(self._put)
+
+        def do_POST(self) -> None:
+            self._dispatch(self._post)
+
+        def do_DELETE(self) -> None:
+            self._dispatch(self._delete)
+
+        def _dispatch(self, method: Callable[[str, str, dict[str, str]], None]) -> None:
+            server._enter_request(self.command)
+            try:
+                url = urlsplit(self.path)
+                bucket, _, name = unquote(url.path).lstrip("/").partition("/")
+                params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+                body_size = int(self.headers.get("Content-Length") or 0)
+                self._body = self.rfile.read(body_size) if body_size else b""
+                if server.latency:
+                    time.sleep(server.latency)
+                method(bucket, name, params)
+            finally:
+                server._exit_request()
+
+        def _get(self, bucket: str, name: str, params: dict[str, str]) -> None:
+            if not name:
+                self._list(bucket, params)
+                return
+            data = server.objects.get((bucket, name))
+            if data is None:
+                self._reply(404, _error("NoSuchKey"))
+                return
+            ranged = self.headers.get("Range")
+            if ranged is None:
+                self._reply(200, data)
+                return
+            start, _, end = ranged.removeprefix("bytes=").partition("-")
+            first, last = int(start), min(int(end or len(data) - 1), len(data) - 1)
+            headers = {"Content-Range": f"bytes {first}-{last}/{len(data)}"}
+            self._reply(206, data[first : last + 1], headers)
+
+        def _head(self, bucket: str, name: str, params: dict[str, str]) -> None:
+            data = server.objects.get((bucket, name))
+            self.send_response(200 if data is not None else 404)
+            self.send_header("Content-Length", str(len(data) if data is not None else 0))
+            self.end_headers()
+
+        def _put(self, bucket: str, name: str, params: dict[str, str]) -> None:
+            if "uploadId" in params:
+                parts = server._uploads.get(params["uploadId"])
+                if parts is None:
+                    self._reply(404, _error("NoSuchUpload"))
+                    return
+                parts[int(params["partNumber"])] = self._body
+                self._reply(200, b"", {"ETag": f'"{uuid.uuid4().hex}"'})
+                return
+            self._store(bucket, name, self._body)
+
+        def _post(self, bucket: str, name: str, params: dict[str, str]) -> None:
+            if "uploads" in params:
+                upload_id = uuid.uuid4().hex
+                server._uploads[upload_id] = {}
+                body = (
+                    "<InitiateMultipartUploadResult>"
+                    f"<UploadId>{upload_id}</UploadId>"
+                    "</InitiateMultipartUploadResult>"
+                )
+                self._reply(200, body.encode())
+                return
+            parts = server._uploads.get(params.get("uploadId", ""))
+            if parts is None:
+                self._reply(404, _error("NoSuchUpload"))
+                return
+            numbers = [
+                int(part.findtext("PartNumber"))
+                for part in ET.fromstring(self._body).iterfind("Part")
+            ]
+            if self._store(bucket, name, b"".join(parts[n] for n in numbers)):
+                del server._uploads[params["uploadId"]]
+
+        def _delete(self, bucket: str, name: str, params: dict[str, str]) -> None:
+            if "uploadId" in params:
+                server._uploads.pop(params["uploadId"], None)
+            else:
+                server.objects.pop((bucket, name), None)
+            self._reply(204, b"")
+
+        def _list(self, bucket: str, params: dict[str, str]) -> None:
+            prefix = params.get("prefix", "")
+            after = params.get("continuation-token", "")
+            with server._lock:
+                names = sorted(
+                    name
+                    for b, name in server.objects
+                    if b == bucket and name.startswith(prefix) and name > after
+                )
+            page = names[:LIST_PAGE_SIZE]
+            contents = "".join(
+                f"<Contents><Key>{escape(name)}</Key>"
+                f"<Size>{len(server.objects.get((bucket, name), b''))}</Size></Contents>"
+                for name in page
+            )
+            if len(names) > len(page):
+                more = "<IsTruncated>true</IsTruncated>"
+                more += f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>"
+            else:
+                more = "<IsTruncated>false</IsTruncated>"
+            body = (
+                '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+                f"{contents}{more}</ListBucketResult>"
+            )
+            self._reply(200, body.encode())
+
+        def _store(self, bucket: str, name: str, data: bytes) -> bool:
+            """Create or replace an object, honouring If-None-Match."""
+            with server._lock:
+                if self.headers.get("If-None-Match") == "*" and (bucket, name) in server.objects:
+                    created = False
+                else:
+                    server.objects[(bucket, name)] = data
+                    created = True
+            if created:
+                self._reply(200, b"<CompleteMultipartUploadResult/>")
+            else:
+                self._reply(412, _error("PreconditionFailed"))
+            return created
+
+        def _reply(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def _error(code: str) -> bytes:
+    return f"<Error><Code>{code}</Code></Error>".encode()
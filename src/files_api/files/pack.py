@@ -0,0 +1,418 @@
+"""Pack-file storage backend: many small objects in a few large segment files."""
+
+import contextlib
+import fcntl
+import io
+import logging
+import mmap
+import os
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from files_api.files.atomic import CommitBuffer, Durability
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+from files_api.files.factory import Compression, FileHandlerFactory
+from files_api.files.index import SortedKeys, split_key
+from files_api.files.interface import IFileSystem
+from files_api.files.pack_compaction import PackCompactionMixin
+from files_api.files.pack_segment import (
+    DELETE,
+    PUT,
+    SEGMENT_MAGIC,
+    Record,
+    encode_record,
+    parse_segment_name,
+    scan_segment,
+    segment_name,
+)
+
+logger = logging.getLogger(__name__)
+
+# Segments are sealed once a write would take them past this size
+DEFAULT_SEGMENT_BYTES = 64 << 20
+
+# Lock file preventing two instances from writing the same directory
+LOCK_FILENAME = ".pack.lock"
+
+
+class PackFileSystem(PackCompactionMixin, IFileSystem):
+    """File system that appends objects to large segment files.
+
+    Each save serializes the object through the usual handler into an
+    in-memory buffer and appends it, as one record, to the active
+    segment, so a store of millions of tiny objects uses a handful of
+    files instead of millions of inodes and open/close pairs. An
+    in-memory index maps every key to its record's offset; it is rebuilt
+    from the segments when the store is opened, and a torn record left
+    by a crash at the end of the last segment is truncated away.
+
+    Reads go through read-only memory maps of the segments. Deletes
+    append a tombstone; the space held by deleted records is reclaimed
+    by compact(), which copies the live records of segments holding
+    garbage into new segments and removes the old ones. Compaction can
+    also run periodically on a background thread.
+
+    A directory can be open in one instance at a time (enforced with a
+    lock file); within a process the instance is thread-safe.
+    """
+
+    def __init__(
+        self,
+        base_path: str | Path,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        durability: str = "none",
+        compact_ratio: float = 0.5,
+        compact_interval: float | None = None,
+        factory: FileHandlerFactory | None = None,
+    ):
+        """Open or create a pack store.
+
+        Args:
+            base_path: Directory holding the segment files. Created if
+                it doesn't exist.
+            segment_bytes: Size at which the active segment is sealed and
+                a new one started.
+            durability: When appends are fsynced: "none", "batch" (group
+                commit, see sync()) or "always".
+            compact_ratio: Fraction of garbage bytes in the store at which
+                compact() does work without force=True.
+            compact_interval: If set, run compact() on a background thread
+                every compact_interval seconds until close().
+            factory: Handler factory to use. Defaults to FileHandlerFactory().
+
+        Raises:
+            ValueError: If an argument is out of range or durability is unknown.
+            RuntimeError: If the directory is already open in another instance.
+        """
+        if segment_bytes < 1:
+            raise ValueError(f"segment_bytes must be >= 1, got {segment_bytes}")
+        if not 0 < compact_ratio <= 1:
+            raise ValueError(f"compact_ratio must be in (0, 1], got {compact_ratio}")
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        self.factory = factory or FileHandlerFactory()
+        self.segment_bytes = segment_bytes
+        self.compact_ratio = compact_ratio
+        self.durability = Durability(durability)
+        self._extensions = self.factory.extensions
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._entries: dict[str, Record] = {}
+        self._sorted_keys = SortedKeys()
+        self._sizes: dict[int, int] = {}  # segment id -> bytes
+        self._live: dict[int, int] = {}  # segment id -> bytes of live records
+        self._maps: dict[int, mmap.mmap] = {}
+        self._seq = 0
+        self._last_id = 0
+        self._active_id = 0
+        self._active_fd = -1
+        self._closed = False
+        self._lock_fd = self._lock_directory()
+        try:
+            self._load()
+        except BaseException:
+            os.close(self._lock_fd)
+            raise
+
+        self._stop = threading.Event()
+        self._compactor: threading.Thread | None = None
+        if compact_interval is not None:
+            self._compactor = threading.Thread(
+                target=self._compact_loop,
+                args=(compact_interval,),
+                name="files-pack-compact",
+                daemon=True,
+            )
+            self._compactor.start()
+        logger.info(
+            "Opened PackFileSystem at %s (%d keys in %d segments, durability=%s)",
+            self.base_path,
+            len(self._entries),
+            len(self._sizes),
+            durability,
+        )
+
+    def save(self, key: str, obj: Any, compression: Compression | None = None) -> None:
+        """Serialize obj and append it to the active segment.
+
+        Args:
+            key: The key to save the object under (without extension).
+            obj: The object to save.
+            compression: Overrides the factory's compression policy, as in
+                LocalFileSystem.save().
+
+        Raises:
+            FileExistsError: If the key already exists.
+            SerializationError: If the object cannot be serialized.
+        """
+        logger.debug("save() called with key=%r, obj_type=%s", key, type(obj).__name__)
+        if key in self._entries:
+            logger.warning("Key %r already exists", key)
+            raise FileExistsError(key)
+
+        handler = self.factory.get_handler_for_object(obj, compression)
+        with self._open(f"{key}{handler.extension}", "wb") as f:
+            handler.to_file(obj, f)
+        logger.info("Saved key=%r using %s handler", key, handler.type_name)
+
+    def get(self, key: str) -> Any:
+        """Get object by key, reading its record from the segment's memory map.
+
+        Args:
+            key: The key to retrieve (without extension).
+
+        Returns:
+            The deserialized object.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the record cannot be deserialized.
+        """
+        record, payload = self._read(key)
+        handler = self.factory.get_handler_for_file(Path(record.name))
+        with io.BytesIO(payload) as f:
+            result = handler.from_file(f)
+        logger.info("Loaded key=%r using %s handler", key, handler.type_name)
+        return result
+
+    def delete(self, key: str) -> None:
+        """Delete a key by appending a tombstone.
+
+        The record's space is reclaimed by the next compaction.
+
+        Args:
+            key: The key to delete (without extension).
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        record = self._entries.get(key)
+        if record is None:
+            raise FileNotFoundError(key)
+        self._append(record.name, b"", DELETE)
+        logger.info("Deleted key=%r", key)
+
+    def count(self, prefix: str = "") -> int:
+        """Count keys starting with prefix in O(log n)."""
+        with self._lock:
+            return self._sorted_keys.count(prefix)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys starting with prefix, in sorted order."""
+        with self._lock:
+            return iter(self._sorted_keys.keys(prefix))
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists."""
+        return key in self._entries
+
+    def sync(self) -> None:
+        """Group-commit appends pending under durability="batch"."""
+        self.durability.sync()
+
+    def close(self) -> None:
+        """Stop background compaction, commit pending writes and release the store."""
+        if self._closed:
+            return
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._compact_lock, self._lock:
+            self._closed = True
+            os.close(self._active_fd)
+            for mapping in self._maps.values():
+                # A reader still slicing the map keeps it open until it is done
+                with contextlib.suppress(BufferError):
+                    mapping.close()
+            self._maps.clear()
+        self.durability.sync()
+        os.close(self._lock_fd)
+        logger.info("Closed PackFileSystem at %s", self.base_path)
+
+    def __enter__(self) -> "PackFileSystem":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        """Open a record for the given full key.
+
+        "rb" returns the stored payload as an in-memory file; "wb" returns
+        a buffer that is appended as a new record when closed without error.
+
+        Args:
+            key: The full key including extension (e.g., "data.json").
+            mode: The file mode ("rb" for read, "wb" for write).
+
+        Returns:
+            A file-like object.
+
+        Raises:
+            FileNotFoundError: If mode is "rb" and no record has that name.
+            ValueError: If the mode is unsupported.
+        """
+        if mode == "wb":
+            return CommitBuffer(lambda payload: self._append(key, payload))
+        if mode != "rb":
+            raise ValueError(f"Unsupported mode: {mode!r}")
+        parts = split_key(key, self._extensions)
+        if parts is None:
+            raise FileNotFoundError(key)
+        record, payload = self._read(parts[0])
+        if record.name != key:
+            raise FileNotFoundError(key)
+        return io.BytesIO(payload)
+
+    def _read(self, key: str) -> tuple[Record, bytes]:
+        """Look up a key and copy its payload out of the segment map."""
+        with self._lock:
+            self._check_open()
+            record = self._entries.get(key)
+            if record is None:
+                logger.warning("Key %r not found in %s", key, self.base_path)
+                raise FileNotFoundError(key)
+            mapping = self._maps.get(record.segment)
+            if mapping is None or len(mapping) < record.offset + record.size:
+                mapping = self._map(record.segment)
+        return record, mapping[record.data_offset : record.offset + record.size]
+
+    def _append(self, name: str, payload: bytes, kind: int = PUT) -> None:
+        """Append one record to the active segment and update the index."""
+        key = split_key(name, self._extensions)[0]
+        with self._lock:
+            self._check_open()
+            if kind == PUT and key in self._entries:
+                logger.warning("Key %r already exists", key)
+                raise FileExistsError(key)
+            if kind == DELETE and key not in self._entries:
+                raise FileNotFoundError(key)
+
+            data = encode_record(name, payload, self._seq + 1, kind)
+            offset = self._sizes[self._active_id]
+            if offset > len(SEGMENT_MAGIC) and offset + len(data) > self.segment_bytes:
+                self._roll()
+                offset = self._sizes[self._active_id]
+            try:
+                _write_all(self._active_fd, data)
+            except BaseException:
+                # Don't leave a torn record in front of later appends
+                os.ftruncate(self._active_fd, offset)
+                raise
+            self._seq += 1
+            self._sizes[self._active_id] += len(data)
+            record = Record(name, kind, self._seq, self._active_id, offset, len(data), len(payload))
+            if kind == PUT:
+                self._entries[key] = record
+                self._sorted_keys.add(key)
+                self._live[self._active_id] += record.size
+            else:
+                old = self._entries.pop(key)
+                self._sorted_keys.discard(key)
+                self._live[old.segment] -= old.size
+            self.durability.after_update(self._active_fd, self._segment_path(self._active_id))
+
+    def _load(self) -> None:
+        """Rebuild the index from the segment files."""
+        ids = sorted(
+            segment
+            for segment in map(parse_segment_name, os.listdir(self.base_path))
+            if segment is not None
+        )
+        latest: dict[str, Record] = {}
+        for segment in ids:
+            path = self._segment_path(segment)
+            with open(path, "r+b") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < len(SEGMENT_MAGIC):
+                    # Crashed while creating the segment
+                    logger.warning("Removing incomplete segment %s", path)
+                    path.unlink()
+                    continue
+                with (
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping,
+                    memoryview(mapping) as view,
+                ):
+                    records, valid = scan_segment(view, segment)
+                if valid < size and segment == ids[-1]:
+                    logger.warning("Truncating torn tail of %s at %d bytes", path, valid)
+                    f.truncate(valid)
+                    size = valid
+            self._sizes[segment] = size
+            self._live[segment] = 0
+            for record in records:
+                parts = split_key(record.name, self._extensions)
+                if parts is None:
+                    logger.warning("Skipping record %r with unknown extension", record.name)
+                    continue
+                current = latest.get(parts[0])
+                if current is None or record.seq > current.seq:
+                    latest[parts[0]] = record
+                self._seq = max(self._seq, record.seq)
+
+        for key, record in latest.items():
+            if record.kind == PUT:
+                self._entries[key] = record
+                self._live[record.segment] += record.size
+        self._sorted_keys = SortedKeys(self._entries)
+
+        self._last_id = max(self._sizes, default=0)
+        if self._sizes and self._sizes[self._last_id] < self.segment_bytes:
+            self._active_id = self._last_id
+            self._active_fd = self._open_segment(self._active_id)
+        else:
+            self._roll()
+
+    def _roll(self) -> None:
+        """Seal the active segment and start a new one. Caller holds the lock."""
+        if self._active_fd >= 0:
+            os.close(self._active_fd)
+        self._last_id += 1
+        self._active_id = self._last_id
+        self._sizes[self._active_id] = 0
+        self._live[self._active_id] = 0
+        self._active_fd = self._open_segment(self._active_id)
+        _write_all(self._active_fd, SEGMENT_MAGIC)
+        self._sizes[self._active_id] = len(SEGMENT_MAGIC)
+        self.durability.after_publish(self._segment_path(self._active_id))
+        logger.debug("Started segment %d", self._active_id)
+
+    def _open_segment(self, segment: int) -> int:
+        """Open a segment for appending."""
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        return os.open(self._segment_path(segment), flags, 0o666)
+
+    def _map(self, segment: int) -> mmap.mmap:
+        """Map a segment's current contents read-only. Caller holds the lock."""
+        with open(self._segment_path(segment), "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[segment] = mapping
+        return mapping
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.base_path / segment_name(segment)
+
+    def _lock_directory(self) -> int:
+        """Take an exclusive lock on the store directory."""
+        fd = os.open(self.base_path / LOCK_FILENAME, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise RuntimeError(
+                f"{self.base_path} is already open in another PackFileSystem"
+            ) from None
+        return fd
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("PackFileSystem is closed")
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to fd."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
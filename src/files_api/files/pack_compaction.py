@@ -0,0 +1,167 @@
+"""Compaction for PackFileSystem.
+
+Reclaims the space of deleted records by copying live records out of
+segments that hold garbage and removing those segments.
+"""
+
+import logging
+import mmap
+import os
+import threading
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from files_api.files.atomic import fsync_dir
+from files_api.files.index import split_key
+from files_api.files.pack_segment import SEGMENT_MAGIC, Record
+
+logger = logging.getLogger(__name__)
+
+
+class PackCompactionMixin:
+    """Compaction of PackFileSystem segments.
+
+    Relies on the host class for the segment bookkeeping and locking.
+    """
+
+    base_path: Path
+    segment_bytes: int
+    compact_ratio: float
+    _lock: threading.Lock
+    _compact_lock: threading.Lock
+    _stop: threading.Event
+    _extensions: list[str]
+    _entries: dict[str, Record]
+    _sizes: dict[int, int]
+    _live: dict[int, int]
+    _maps: dict[int, mmap.mmap]
+    _active_id: int
+    _last_id: int
+
+    if TYPE_CHECKING:
+        # Provided by PackFileSystem
+
+        def _check_open(self) -> None: ...
+        def _roll(self) -> None: ...
+        def _map(self, segment: int) -> mmap.mmap: ...
+        def _segment_path(self, segment: int) -> Path: ...
+
+    @property
+    def garbage_ratio(self) -> float:
+        """Fraction of segment bytes held by deleted records and tombstones."""
+        with self._lock:
+            total = sum(self._sizes.values())
+            return sum(map(self._garbage, self._sizes)) / total if total else 0.0
+
+    def compact(self, force: bool = False) -> int:
+        """Rewrite segments holding garbage, keeping only live records.
+
+        Live records are copied verbatim (so their sequence numbers are
+        kept) into new segments, which are fsynced before the old
+        segments are removed, oldest first; a crash at any point leaves a
+        readable store in which deleted keys stay deleted. Saves, gets and deletes proceed while records are copied.
+
+        Every segment with garbage is compacted in one pass, so the
+        tombstones in them can be dropped: the deleted records they mask
+        are either in the same pass or already gone.
+
+        Args:
+            force: Compact any garbage, not only once garbage_ratio
+                reaches compact_ratio.
+
+        Returns:
+            The number of bytes reclaimed.
+        """
+        with self._compact_lock:
+            with self._lock:
+                self._check_open()
+                garbage = sum(map(self._garbage, self._sizes))
+                total = sum(self._sizes.values())
+                if garbage == 0 or (not force and garbage < self.compact_ratio * total):
+                    return 0
+                if self._garbage(self._active_id):
+                    self._roll()
+                merge = {s for s in self._sizes if s != self._active_id and self._garbage(s)}
+                live = sorted(
+                    (r for r in self._entries.values() if r.segment in merge),
+                    key=lambda r: (r.segment, r.offset),
+                )
+                maps = {s: self._map(s) for s in merge}
+                before = sum(self._sizes[s] for s in merge)
+            logger.debug("Compacting %d segments (%d live records)", len(merge), len(live))
+
+            moved, outputs = self._copy_records(live, maps)
+            with self._lock:
+                for old, new in moved:
+                    key = split_key(old.name, self._extensions)[0]
+                    # Keys deleted during the copy leave their copy as garbage
+                    if self._entries.get(key) is old:
+                        self._entries[key] = new
+                        self._live[new.segment] += new.size
+                for segment in merge:
+                    del self._sizes[segment], self._live[segment]
+                    # Readers may still hold the map; it is closed once unreferenced
+                    self._maps.pop(segment, None)
+                reclaimed = before - sum(self._sizes[s] for s in outputs)
+            # Oldest first, each removal durable before the next: a tombstone
+            # is always newer than the record it masks, so a crash can't
+            # leave a deleted record behind without its tombstone
+            for segment in sorted(merge):
+                self._segment_path(segment).unlink()
+                fsync_dir(self.base_path)
+
+        logger.info(
+            "Compacted %d segments into %d, reclaimed %d bytes", len(merge), len(outputs), reclaimed
+        )
+        return reclaimed
+
+    def _copy_records(
+        self, records: list[Record], maps: dict[int, mmap.mmap]
+    ) -> tuple[list[tuple[Record, Record]], list[int]]:
+        """Copy records into new segments, returning (old, new) pairs and the new ids."""
+        batches: list[list[Record]] = []
+        size = 0
+        for record in records:
+            if not batches or (
+                size > len(SEGMENT_MAGIC) and size + record.size > self.segment_bytes
+            ):
+                batches.append([])
+                size = len(SEGMENT_MAGIC)
+            batches[-1].append(record)
+            size += record.size
+
+        moved: list[tuple[Record, Record]] = []
+        outputs: list[int] = []
+        for batch in batches:
+            with self._lock:
+                self._last_id += 1
+                segment = self._last_id
+                self._sizes[segment] = len(SEGMENT_MAGIC)
+                self._live[segment] = 0
+            outputs.append(segment)
+            offset = len(SEGMENT_MAGIC)
+            with open(self._segment_path(segment), "xb") as out:
+                out.write(SEGMENT_MAGIC)
+                for record in batch:
+                    out.write(maps[record.segment][record.offset : record.offset + record.size])
+                    moved.append((record, replace(record, segment=segment, offset=offset)))
+                    offset += record.size
+                # Durable before it replaces anything
+                out.flush()
+                os.fsync(out.fileno())
+            with self._lock:
+                self._sizes[segment] = offset
+        return moved, outputs
+
+    def _garbage(self, segment: int) -> int:
+        """Bytes of a segment not held by live records. Caller holds the lock."""
+        return max(0, self._sizes[segment] - len(SEGMENT_MAGIC) - self._live[segment])
+
+    def _compact_loop(self, interval: float) -> None:
+        """Background thread body: compact every interval seconds."""
+        while not self._stop.wait(interval):
+            try:
+                self.compact()
+            except Exception:
+                logger.exception("Background compaction of %s failed", self.base_path)
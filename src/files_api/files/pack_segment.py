@@ -0,0 +1,126 @@
+"""On-disk record format of PackFileSystem segment files.
+
+A segment starts with an 8-byte magic and holds a sequence of records:
+
+    crc32 (u32) | seq (u64) | payload length (u32) | name length (u16) | kind (u8)
+    name (UTF-8 full key, e.g. "user-1.json") | payload (handler output)
+
+The CRC covers everything after itself, so a torn or corrupt record is
+detected when the segment is scanned. ``seq`` increases with every
+write across all segments; when the same key appears more than once
+(a put followed by a delete, or a record copied by compaction), the
+record with the highest ``seq`` wins regardless of which segment it is in.
+"""
+
+import logging
+import re
+import struct
+import zlib
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"FPACK\x00\x00\x01"
+RECORD_HEADER = struct.Struct("<IQIHB")  # crc32, seq, payload length, name length, kind
+
+# Record kinds
+PUT = 0
+DELETE = 1
+
+_SEGMENT_NAME = re.compile(r"(\d{8})\.pack")
+
+
+@dataclass(frozen=True, slots=True)
+class Record:
+    """Location of one record inside a segment.
+
+    Attributes:
+        name: The full key (key plus extension) the record stores.
+        kind: PUT or DELETE.
+        seq: Global write sequence number.
+        segment: Id of the segment holding the record.
+        offset: Offset of the record header within the segment.
+        size: Total record size (header, name and payload).
+        data_size: Payload size; the payload is the last data_size bytes.
+    """
+
+    name: str
+    kind: int
+    seq: int
+    segment: int
+    offset: int
+    size: int
+    data_size: int
+
+    @property
+    def data_offset(self) -> int:
+        """Offset of the payload within the segment."""
+        return self.offset + self.size - self.data_size
+
+
+def segment_name(segment_id: int) -> str:
+    """File name of a segment."""
+    return f"{segment_id:08d}.pack"
+
+
+def parse_segment_name(name: str) -> int | None:
+    """Segment id encoded in a file name, or None if it isn't a segment."""
+    match = _SEGMENT_NAME.fullmatch(name)
+    return int(match.group(1)) if match else None
+
+
+def encode_record(name: str, payload: bytes, seq: int, kind: int = PUT) -> bytes:
+    """Serialize one record.
+
+    Args:
+        name: The full key (key plus extension).
+        payload: The handler output (empty for DELETE records).
+        seq: The record's sequence number.
+        kind: PUT or DELETE.
+
+    Returns:
+        The record bytes, ready to be appended to a segment.
+    """
+    name_bytes = name.encode("utf-8")
+    header = RECORD_HEADER.pack(0, seq, len(payload), len(name_bytes), kind)
+    crc = zlib.crc32(payload, zlib.crc32(name_bytes, zlib.crc32(header[4:])))
+    return struct.pack("<I", crc) + header[4:] + name_bytes + payload
+
+
+def scan_segment(data: memoryview, segment_id: int) -> tuple[list[Record], int]:
+    """Parse every intact record of a segment.
+
+    Scanning stops at the first truncated or corrupt record, which is
+    what a crash in the middle of an append leaves behind.
+
+    Args:
+        data: The segment's contents.
+        segment_id: The id recorded in the returned records.
+
+    Returns:
+        The records in file order and the length of the intact prefix.
+
+    Raises:
+        ValueError: If the data doesn't start with the segment magic.
+    """
+    if bytes(data[: len(SEGMENT_MAGIC)]) != SEGMENT_MAGIC:
+        raise ValueError(f"Segment {segment_id} has no pack header")
+    records: list[Record] = []
+    pos = len(SEGMENT_MAGIC)
+    end = len(data)
+    while pos + RECORD_HEADER.size <= end:
+        crc, seq, data_size, name_size, kind = RECORD_HEADER.unpack_from(data, pos)
+        size = RECORD_HEADER.size + name_size + data_size
+        if pos + size > end or kind not in (PUT, DELETE):
+            break
+        if zlib.crc32(data[pos + 4 : pos + size]) != crc:
+            break
+        name_start = pos + RECORD_HEADER.size
+        name = bytes(data[name_start : name_start + name_size]).decode("utf-8")
+        records.append(Record(name, kind, seq, segment_id, pos, size, data_size))
+        pos += size
+    if pos != end:
+        logger.warning(
+            "Segment %d has %d trailing bytes that are not an intact record", segment_id, end - pos
+        )
+    return records, pos
@@ -0,0 +1,176 @@
+"""Process pool for CPU-bound serialization in batch saves."""
+
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from files_api.files.exceptions import SerializationError
+from files_api.files.handlers.base import IFileHandler
+from files_api.files.handlers.compression import CompressedHandler
+from files_api.files.handlers.json_handler import JsonHandler
+
+logger = logging.getLogger(__name__)
+
+# How save_many() runs handler serialization
+EXECUTORS = ("serial", "thread", "process")
+
+# Most objects shipped to a worker in one task
+MAX_CHUNK = 256
+
+
+def is_cpu_bound(handler: IFileHandler) -> bool:
+    """Whether a handler's encoding holds the GIL, so processes speed it up.
+
+    JSON encoders run Python-level code under the GIL; array and frame
+    writers are memory copies or release the GIL, and shipping their
+    data to another process costs more than it saves.
+    """
+    if isinstance(handler, CompressedHandler):
+        handler = handler.inner
+    return isinstance(handler, JsonHandler)
+
+
+class SerializerPool:
+    """Lazily started pool of worker processes that serialize objects to bytes.
+
+    Workers are started from a fork server, a clean single-threaded
+    process, so forking never copies locks held by the caller's threads.
+    Objects are sent in chunks to amortize the inter-process round trip.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        """Create the pool; no process is started until first use.
+
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count).
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def serialize(
+        self, jobs: Mapping[str, tuple[IFileHandler, Any]]
+    ) -> Iterator[tuple[str, bytes | Exception]]:
+        """Serialize objects in the worker processes.
+
+        Args:
+            jobs: Mapping of key to the (handler, object) to serialize.
+
+        Yields:
+            (key, bytes) for every serialized object and (key, exception)
+            for every failure, as chunks complete.
+        """
+        items = list(jobs.items())
+        size = max(1, min(MAX_CHUNK, len(items) // (self.max_workers * 4)))
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        executor = self._start()
+        futures = {
+            executor.submit(_serialize_chunk, [job for _, job in chunk]): chunk for chunk in chunks
+        }
+        logger.debug("Serializing %d objects in %d chunks", len(items), len(chunks))
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                outcomes = future.result()
+            except BrokenProcessPool as e:
+                # A worker died; the next call starts a fresh pool
+                self._reset(executor, e)
+                outcomes = _serialize_chunk([job for _, job in chunk])
+            except Exception as e:
+                # The chunk couldn't be shipped (e.g. an unpicklable object)
+                logger.debug("Serializing chunk in-process after %s", e)
+                outcomes = _serialize_chunk([job for _, job in chunk])
+            for (key, (_, obj)), outcome in zip(chunk, outcomes, strict=True):
+                if isinstance(outcome, str):
+                    yield key, SerializationError(obj, outcome)
+                else:
+                    yield key, outcome
+
+    def save(
+        self,
+        pending: Mapping[str, tuple[IFileHandler, Any]],
+        write: Callable[[str, IFileHandler, Any], None],
+        write_bytes: Callable[[str, IFileHandler, bytes], None],
+        max_workers: int | None = None,
+    ) -> dict[str, Future]:
+        """Save objects, serializing the CPU-bound ones in the worker processes.
+
+        Files are written on a thread pool as soon as their bytes come
+        back; other objects are serialized and written there directly.
+
+        Args:
+            pending: Mapping of key to the (handler, object) to save.
+            write: Serializes and writes one object, as write(key, handler, obj).
+            write_bytes: Writes serialized bytes, as write_bytes(key, handler, data).
+            max_workers: Maximum number of writer threads.
+
+        Returns:
+            The finished future for every key, in the order of pending.
+        """
+        jobs = {key: job for key, job in pending.items() if is_cpu_bound(job[0])}
+        futures: dict[str, Future] = {}
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="files-io") as pool:
+            for key, (handler, obj) in pending.items():
+                if key not in jobs:
+                    futures[key] = pool.submit(write, key, handler, obj)
+            for key, outcome in self.serialize(jobs):
+                if isinstance(outcome, Exception):
+                    futures[key] = Future()
+                    futures[key].set_exception(outcome)
+                else:
+                    futures[key] = pool.submit(write_bytes, key, jobs[key][0], outcome)
+        return {key: futures[key] for key in pending}
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _reset(self, executor: ProcessPoolExecutor, error: Exception) -> None:
+        """Drop a broken executor, unless another call already replaced it."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logger.warning("Serializer process pool broke (%s); restarting it on next use", error)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("forkserver")
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=context)
+                logger.info("Started %d serializer processes", self.max_workers)
+            return self._executor
+
+
+def serialize(handler: IFileHandler, obj: Any) -> bytes:
+    """Serialize obj through handler into bytes."""
+    with io.BytesIO() as buffer:
+        handler.to_file(obj, buffer)
+        return buffer.getvalue()
+
+
+def _serialize_chunk(jobs: list[tuple[IFileHandler, Any]]) -> list[bytes | str]:
+    """Worker task: the bytes of each object, or the reason it failed.
+
+    Reasons travel as strings because SerializationError can't be
+    rebuilt by pickle; the caller wraps them again.
+    """
+    outcomes: list[bytes | str] = []
+    for handler, obj in jobs:
+        try:
+            outcomes.append(serialize(handler, obj))
+        except SerializationError as e:
+            outcomes.append(e.reason)
+        except Exception as e:
+            outcomes.append(str(e))
+    return outcomes
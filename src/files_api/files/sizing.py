@@ -0,0 +1,54 @@
+"""In-memory size estimation for stored objects."""
+
+import sys
+from typing import Any
+
+import numpy as np
+
+from files_api.files.handlers.dataframe_handler import is_dataframe
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimate how many bytes an object occupies in memory.
+
+    Numpy arrays report their data buffer size (``nbytes``), polars
+    DataFrames ``estimated_size()`` and pandas DataFrames their deep
+    ``memory_usage``, which sys.getsizeof can't see. Containers
+    are walked iteratively and every distinct object is counted once via
+    ``sys.getsizeof``, which is a good approximation for decoded JSON.
+
+    Args:
+        obj: The object to measure.
+
+    Returns:
+        The estimated size in bytes.
+    """
+    total = 0
+    seen: set[int] = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        if isinstance(item, np.ndarray):
+            total += item.nbytes
+            if item.dtype.hasobject:
+                stack.extend(item.ravel())
+            continue
+        flavor = is_dataframe(item)
+        if flavor == "polars":
+            total += item.estimated_size()
+            continue
+        if flavor == "pandas":
+            total += int(item.memory_usage(deep=True).sum())
+            continue
+
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset):
+            stack.extend(item)
+    return total
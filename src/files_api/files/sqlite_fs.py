@@ -0,0 +1,363 @@
+"""SQLite-backed file system storing handler output as BLOBs."""
+
+import io
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+from files_api.files.atomic import DURABILITY_MODES, CommitBuffer
+from files_api.files.batch import BatchResult
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+from files_api.files.factory import Compression, FileHandlerFactory
+from files_api.files.index import prefix_upper_bound
+from files_api.files.interface import IFileSystem
+
+logger = logging.getLogger(__name__)
+
+# Durability mode -> (PRAGMA synchronous, PRAGMA wal_autocheckpoint pages).
+# In WAL mode NORMAL only syncs at checkpoints, which makes it SQLite's own
+# group commit: a crash loses the commits since the last checkpoint but
+# never corrupts the database (OFF could). "batch" checkpoints more often
+# than SQLite's default of 1000 pages to shorten that window.
+_PRAGMAS: dict[str, tuple[str, int]] = {
+    "none": ("NORMAL", 1000),
+    "batch": ("NORMAL", 100),
+    "always": ("FULL", 1000),
+}
+
+# Bytes of the database each connection may memory-map for reads
+MMAP_SIZE = 256 << 20
+
+# Bound parameters per statement in get_many (SQLite's default limit is 999+)
+_SELECT_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    key TEXT PRIMARY KEY,
+    extension TEXT NOT NULL,
+    data BLOB NOT NULL
+)
+"""
+_INSERT = "INSERT INTO objects (key, extension, data) VALUES (?, ?, ?)"
+_SELECT = "SELECT extension, data FROM objects WHERE key = ?"
+_EXISTS = "SELECT 1 FROM objects WHERE key = ?"
+_DELETE = "DELETE FROM objects WHERE key = ?"
+
+
+class SQLiteFileSystem(IFileSystem):
+    """File system storing objects as rows of a single SQLite database.
+
+    Each object is serialized by the usual handler into memory and stored
+    as a BLOB next to its extension, under the key as primary key. The
+    primary key index makes lookups O(log n) and turns count(prefix) and
+    keys(prefix) into range scans. The database runs in WAL mode, so any
+    number of readers (threads or processes) proceed while one writer
+    commits; each thread gets its own connection, and the sqlite3
+    module's per-connection statement cache means every query is
+    prepared once. Connections of threads that have exited are closed
+    when the next one is opened, and close() closes the rest. save_many() inserts a whole batch in one transaction.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        durability: str = "none",
+        timeout: float = 30.0,
+        factory: FileHandlerFactory | None = None,
+    ):
+        """Open or create the database.
+
+        Args:
+            path: The database file. Its directory is created if needed.
+            durability: When commits are fsynced: "none" (at WAL
+                checkpoints, every 1000 pages), "batch" (at checkpoints
+                every 100 pages and on sync()) or "always" (every commit).
+                A crash never corrupts the database in any mode.
+            timeout: Seconds to wait for another connection's write lock.
+            factory: Handler factory to use. Defaults to FileHandlerFactory().
+
+        Raises:
+            ValueError: If durability is unknown.
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: '{durability}'")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.durability = durability
+        self.timeout = timeout
+        self.factory = factory or FileHandlerFactory()
+        self._local = threading.local()
+        # Every open connection, by the thread it belongs to
+        self._connections: dict[threading.Thread, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+        self._conn().execute(_SCHEMA)
+        logger.info("Opened SQLiteFileSystem at %s (durability=%s)", self.path, durability)
+
+    def save(self, key: str, obj: Any, compression: Compression | None = None) -> None:
+        """Serialize obj and insert it as a new row.
+
+        Args:
+            key: The key to save the object under (without extension).
+            obj: The object to save.
+            compression: Overrides the factory's compression policy, as in
+                LocalFileSystem.save().
+
+        Raises:
+            FileExistsError: If the key already exists.
+            SerializationError: If the object cannot be serialized.
+        """
+        logger.debug("save() called with key=%r, obj_type=%s", key, type(obj).__name__)
+        if self.exists(key):
+            logger.warning("Key %r already exists", key)
+            raise FileExistsError(key)
+
+        handler = self.factory.get_handler_for_object(obj, compression)
+        with self._open(f"{key}{handler.extension}", "wb") as f:
+            handler.to_file(obj, f)
+        logger.info("Saved key=%r using %s handler", key, handler.type_name)
+
+    def save_many(
+        self, items: Mapping[str, Any], compression: Compression | None = None
+    ) -> BatchResult:
+        """Save many objects in a single transaction, collecting per-key errors.
+
+        Objects are serialized first; rows are then inserted in one
+        transaction, so the batch costs one commit instead of one per key.
+        A key that fails (to serialize, or because it exists) doesn't
+        affect the others.
+
+        Args:
+            items: Mapping of key (without extension) to object.
+            compression: Overrides the factory's compression policy, as in save().
+
+        Returns:
+            A BatchResult with None for every saved key and the exception
+            for every key that failed.
+        """
+        logger.debug("save_many() called with %d items", len(items))
+        result = BatchResult()
+        rows: list[tuple[str, str, bytes]] = []
+        for key, obj in items.items():
+            try:
+                handler = self.factory.get_handler_for_object(obj, compression)
+                buffer = io.BytesIO()
+                handler.to_file(obj, buffer)
+                rows.append((key, handler.extension, buffer.getvalue()))
+            except Exception as e:
+                logger.warning("save_many: key %r failed: %s", key, e)
+                result.errors[key] = e
+
+        conn = self._conn()
+        with self._transaction(conn):
+            for row in rows:
+                try:
+                    conn.execute(_INSERT, row)
+                    result.values[row[0]] = None
+                except sqlite3.IntegrityError:
+                    logger.warning("Key %r already exists", row[0])
+                    result.errors[row[0]] = FileExistsError(row[0])
+        logger.info("save_many() saved %d, failed %d", len(result.values), len(result.errors))
+        return result
+
+    def get(self, key: str) -> Any:
+        """Get object by key.
+
+        Args:
+            key: The key to retrieve (without extension).
+
+        Returns:
+            The deserialized object.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the data cannot be deserialized.
+        """
+        row = self._conn().execute(_SELECT, (key,)).fetchone()
+        if row is None:
+            logger.warning("Key %r not found in %s", key, self.path)
+            raise FileNotFoundError(key)
+        return self._decode(key, *row)
+
+    def get_many(self, keys: Iterable[str]) -> BatchResult:
+        """Get many objects with one query per few hundred keys.
+
+        Args:
+            keys: The keys to retrieve (without extension).
+
+        Returns:
+            A BatchResult with the loaded object for every key that was
+            read and the exception for every key that failed.
+        """
+        keys = list(dict.fromkeys(keys))
+        rows: dict[str, tuple[str, bytes]] = {}
+        conn = self._conn()
+        for start in range(0, len(keys), _SELECT_BATCH):
+            chunk = keys[start : start + _SELECT_BATCH]
+            query = (
+                "SELECT key, extension, data FROM objects "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})"
+            )
+            for key, extension, data in conn.execute(query, chunk):
+                rows[key] = (extension, data)
+
+        result = BatchResult()
+        for key in keys:
+            try:
+                if key not in rows:
+                    logger.warning("Key %r not found in %s", key, self.path)
+                    raise FileNotFoundError(key)
+                result.values[key] = self._decode(key, *rows[key])
+            except Exception as e:
+                result.errors[key] = e
+        logger.info("get_many() loaded %d, failed %d", len(result.values), len(result.errors))
+        return result
+
+    def delete(self, key: str) -> None:
+        """Delete the row stored under key.
+
+        Args:
+            key: The key to delete (without extension).
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        if self._conn().execute(_DELETE, (key,)).rowcount == 0:
+            logger.warning("Key %r not found in %s", key, self.path)
+            raise FileNotFoundError(key)
+        logger.info("Deleted key=%r", key)
+
+    def count(self, prefix: str = "") -> int:
+        """Count keys starting with prefix with a range query on the key index."""
+        where, params = _prefix_clause(prefix)
+        return self._conn().execute(f"SELECT count(*) FROM objects{where}", params).fetchone()[0]
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys starting with prefix, in sorted order."""
+        where, params = _prefix_clause(prefix)
+        query = f"SELECT key FROM objects{where} ORDER BY key"
+        return (key for (key,) in self._conn().execute(query, params).fetchall())
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists."""
+        return self._conn().execute(_EXISTS, (key,)).fetchone() is not None
+
+    def sync(self) -> None:
+        """Checkpoint the WAL into the database file, making every commit durable."""
+        self._conn().execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self) -> None:
+        """Close every thread's connection."""
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for conn in connections.values():
+            conn.close()
+        self._local = threading.local()
+        logger.info("Closed SQLiteFileSystem at %s", self.path)
+
+    def __enter__(self) -> "SQLiteFileSystem":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        """Open a row's data for the given full key.
+
+        "rb" returns the stored BLOB as an in-memory file; "wb" returns a
+        buffer that is inserted as a new row when closed without error.
+
+        Args:
+            key: The full key including extension (e.g., "data.json").
+            mode: The file mode ("rb" for read, "wb" for write).
+
+        Returns:
+            A file-like object.
+
+        Raises:
+            FileNotFoundError: If mode is "rb" and no row has that full key.
+            FileExistsError: If the written key already exists (on close).
+            ValueError: If the mode or extension is unsupported.
+        """
+        handler = self.factory.get_handler_for_file(Path(key))
+        base_key = key[: -len(handler.extension)]
+        if mode == "wb":
+            return CommitBuffer(lambda data: self._insert(base_key, handler.extension, data))
+        if mode != "rb":
+            raise ValueError(f"Unsupported mode: {mode!r}")
+        row = self._conn().execute(_SELECT, (base_key,)).fetchone()
+        if row is None or row[0] != handler.extension:
+            raise FileNotFoundError(base_key)
+        return io.BytesIO(row[1])
+
+    def _insert(self, key: str, extension: str, data: bytes) -> None:
+        """Insert one row, translating a primary key collision."""
+        try:
+            self._conn().execute(_INSERT, (key, extension, data))
+        except sqlite3.IntegrityError as e:
+            logger.warning("Key %r already exists", key)
+            raise FileExistsError(key) from e
+
+    def _decode(self, key: str, extension: str, data: bytes) -> Any:
+        """Deserialize a row's data with the handler for its extension."""
+        handler = self.factory.get_handler_for_file(Path(f"{key}{extension}"))
+        with io.BytesIO(data) as f:
+            result = handler.from_file(f)
+        logger.info("Loaded key=%r using %s handler", key, handler.type_name)
+        return result
+
+    def _conn(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; batches open explicit transactions
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            synchronous, checkpoint_pages = _PRAGMAS[self.durability]
+            conn.execute(f"PRAGMA synchronous={synchronous}")
+            conn.execute(f"PRAGMA wal_autocheckpoint={checkpoint_pages}")
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._local.conn = conn
+            with self._lock:
+                self._close_exited()
+                self._connections[threading.current_thread()] = conn
+            logger.debug(
+                "Opened connection to %s for %s", self.path, threading.current_thread().name
+            )
+        return conn
+
+    def _close_exited(self) -> None:
+        """Close the connections of threads that have exited. Caller must hold the lock."""
+        exited = [thread for thread in self._connections if not thread.is_alive()]
+        for thread in exited:
+            self._connections.pop(thread).close()
+        if exited:
+            logger.debug("Closed %d connections of exited threads", len(exited))
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+        """Run a block in one write transaction, rolling back on error."""
+        # Take the write lock up front instead of upgrading mid-transaction
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _prefix_clause(prefix: str) -> tuple[str, tuple[str, ...]]:
+    """WHERE clause selecting the key range of a prefix."""
+    if not prefix:
+        return "", ()
+    upper = prefix_upper_bound(prefix)
+    if upper is None:
+        return " WHERE key >= ?", (prefix,)
+    return " WHERE key >= ? AND key < ?", (prefix, upper)
@@ -0,0 +1,435 @@
+"""Tiered storage: fast, small tiers in front of a slower source of truth."""
+
+import contextlib
+import logging
+import threading
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import IO, Any
+
+from files_api.files.cache import CACHE_POLICIES, LFUPolicy, LRUPolicy
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+from files_api.files.interface import IFileSystem
+from files_api.files.sizing import estimate_size
+
+logger = logging.getLogger(__name__)
+
+WRITE_POLICIES = ("through", "back")
+
+
+@dataclass(frozen=True, slots=True)
+class Tier:
+    """One level of a TieredFileSystem.
+
+    Attributes:
+        fs: The file system backing the tier.
+        max_bytes: Capacity in in-memory object size (see estimate_size).
+        max_keys: Capacity in number of keys.
+        policy: Eviction policy when over capacity, "lru" or "lfu".
+    """
+
+    fs: IFileSystem
+    max_bytes: int | None = None
+    max_keys: int | None = None
+    policy: str = "lru"
+
+
+@dataclass(frozen=True, slots=True)
+class TierStats:
+    """Snapshot of one tier's counters."""
+
+    name: str
+    hits: int
+    misses: int
+    promotions: int
+    evictions: int
+    entries: int
+    current_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups reaching this tier that it served."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _TierState:
+    """Bookkeeping for a capacity-limited tier.
+
+    sizes holds the keys the tier stores and policy the ones that may be
+    evicted. Admissions in flight reserve their size up front, and keys
+    being evicted stay in sizes (still readable) until deleted, but no
+    longer count against capacity.
+    """
+
+    def __init__(self, tier: Tier):
+        self.tier = tier
+        self.policy = LRUPolicy() if tier.policy == "lru" else LFUPolicy()
+        self.sizes: dict[str, int] = {}
+        self.current_bytes = 0
+        self.reserved_bytes = 0
+        self.reserved_keys = 0
+        self.leaving: set[str] = set()
+        self.leaving_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.promotions = 0
+        self.evictions = 0
+
+    def over_capacity(self, extra_bytes: int = 0, extra_keys: int = 0) -> bool:
+        tier = self.tier
+        used_bytes = self.current_bytes + self.reserved_bytes - self.leaving_bytes
+        used_keys = len(self.sizes) + self.reserved_keys - len(self.leaving)
+        return (tier.max_bytes is not None and used_bytes + extra_bytes > tier.max_bytes) or (
+            tier.max_keys is not None and used_keys + extra_keys > tier.max_keys
+        )
+
+    def add(self, key: str, size: int) -> None:
+        self.sizes[key] = size
+        self.current_bytes += size
+        self.policy.add(key)
+
+    def resize(self, key: str, size: int) -> None:
+        self.current_bytes += size - self.sizes[key]
+        self.sizes[key] = size
+
+    def remove(self, key: str) -> None:
+        self.current_bytes -= self.sizes.pop(key)
+        self.policy.remove(key)
+
+    def reserve(self, size: int) -> None:
+        self.reserved_bytes += size
+        self.reserved_keys += 1
+
+    def unreserve(self, size: int) -> None:
+        self.reserved_bytes -= size
+        self.reserved_keys -= 1
+
+    def start_eviction(self, key: str) -> None:
+        self.policy.remove(key)
+        self.leaving.add(key)
+        self.leaving_bytes += self.sizes[key]
+
+    def finish_eviction(self, key: str, evicted: bool) -> None:
+        self.leaving.discard(key)
+        self.leaving_bytes -= self.sizes[key]
+        if evicted:
+            self.current_bytes -= self.sizes.pop(key)
+            self.evictions += 1
+        else:
+            self.policy.add(key)
+
+
+class TieredFileSystem(IFileSystem):
+    """Ordered tiers of file systems, fastest first, the last one authoritative.
+
+    get() looks a key up tier by tier and promotes what it finds into
+    every faster tier, evicting by each tier's policy to stay within its
+    capacity. save() writes to the fastest tier and either straight
+    through to the last tier ("through") or only when the key is evicted
+    or flush() is called ("back"). The last tier is the source of truth
+    and is never evicted from.
+
+    Upper tiers must support delete() for eviction. Keys already present
+    in an upper tier when the instance is created are tracked with an
+    unknown size, which is filled in on their first hit. Dirty keys under
+    write-back live only in memory bookkeeping: call flush() before
+    shutting down.
+    """
+
+    def __init__(self, tiers: Sequence[Tier | IFileSystem], write_policy: str = "through"):
+        """Initialize the tiers.
+
+        Args:
+            tiers: Tiers from fastest to slowest; plain file systems are
+                unbounded tiers. The last tier can't have a capacity.
+            write_policy: "through" or "back".
+
+        Raises:
+            ValueError: If there are no tiers, the last tier has a capacity,
+                or a policy is unknown.
+        """
+        tiers = [tier if isinstance(tier, Tier) else Tier(tier) for tier in tiers]
+        if not tiers:
+            raise ValueError("TieredFileSystem needs at least one tier")
+        if tiers[-1].max_bytes is not None or tiers[-1].max_keys is not None:
+            raise ValueError("The last tier is the source of truth and can't have a capacity")
+        if write_policy not in WRITE_POLICIES:
+            raise ValueError(f"Unknown write policy: '{write_policy}'")
+        for tier in tiers:
+            if tier.policy not in CACHE_POLICIES:
+                raise ValueError(f"Unknown eviction policy: '{tier.policy}'")
+        self.tiers = tiers
+        self.write_policy = write_policy
+        self._states = [_TierState(tier) for tier in tiers]
+        self._dirty: set[str] = set()  # keys saved but not yet written back
+        self._busy: set[str] = set()  # keys with tier I/O in progress
+        self._deletes = 0
+        self._cond = threading.Condition()
+        for state in self._states[:-1]:
+            for key in state.tier.fs.keys(prefix=""):
+                state.add(key, 0)
+        logger.info(
+            "Initialized TieredFileSystem over %s (write_policy=%s)",
+            " -> ".join(type(tier.fs).__name__ for tier in tiers),
+            write_policy,
+        )
+
+    @property
+    def stats(self) -> list[TierStats]:
+        """Per-tier counters, fastest tier first."""
+        with self._cond:
+            return [
+                TierStats(
+                    name=f"{i}:{type(state.tier.fs).__name__}",
+                    hits=state.hits,
+                    misses=state.misses,
+                    promotions=state.promotions,
+                    evictions=state.evictions,
+                    entries=len(state.sizes),
+                    current_bytes=state.current_bytes,
+                )
+                for i, state in enumerate(self._states)
+            ]
+
+    def save(self, key: str, obj: Any) -> None:
+        """Save to the fastest tier and, under write-through, the last tier.
+
+        Under write-back, an object too large for the fastest tier is
+        written through instead.
+
+        Raises:
+            FileExistsError: If the key already exists.
+            SerializationError: If the object cannot be serialized.
+        """
+        logger.debug("save() called with key=%r, obj_type=%s", key, type(obj).__name__)
+        self._claim(key)
+        try:
+            if self.exists(key):
+                logger.warning("Key %r already exists", key)
+                raise FileExistsError(key)
+            last = len(self._states) - 1
+            back = self.write_policy == "back" and last > 0
+            if back and self._admit(0, key, obj):
+                with self._cond:
+                    self._dirty.add(key)
+                logger.info("Saved key=%r to tier 0 (write-back)", key)
+                return
+            self.tiers[last].fs.save(key, obj)
+            if last > 0:
+                self._admit(0, key, obj)
+        finally:
+            self._release(key)
+        logger.info("Saved key=%r (write-through)", key)
+
+    def get(self, key: str) -> Any:
+        """Get object by key from the fastest tier holding it, promoting it.
+
+        Raises:
+            FileNotFoundError: If no tier has the key.
+            DeserializationError: If the object cannot be deserialized.
+        """
+        with self._cond:
+            deletes = self._deletes
+        last = len(self._states) - 1
+        for i, state in enumerate(self._states):
+            if i < last and key not in state.sizes:
+                with self._cond:
+                    state.misses += 1
+                continue
+            try:
+                value = state.tier.fs.get(key)
+            except FileNotFoundError:
+                with self._cond:
+                    state.misses += 1
+                continue
+            size = estimate_size(value) if state.sizes.get(key) == 0 else None
+            with self._cond:
+                state.hits += 1
+                if key in state.sizes and key not in state.leaving:
+                    state.policy.touch(key)
+                    if size is not None:
+                        state.resize(key, size)
+                # Skip promotion if the key is busy or a delete may have
+                # raced with the read (the value could be stale)
+                promote = i > 0 and key not in self._busy and deletes == self._deletes
+                if promote:
+                    self._busy.add(key)
+            if promote:
+                try:
+                    for upper in range(i):
+                        if self._admit(upper, key, value):
+                            with self._cond:
+                                self._states[upper].promotions += 1
+                finally:
+                    self._release(key)
+            logger.debug("get(key=%r) served by tier %d", key, i)
+            return value
+        logger.warning("Key %r not found in any tier", key)
+        raise FileNotFoundError(key)
+
+    def delete(self, key: str) -> None:
+        """Delete a key from every tier.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        self._claim(key)
+        try:
+            if not self.exists(key):
+                raise FileNotFoundError(key)
+            with self._cond:
+                self._dirty.discard(key)
+                holders = [state for state in self._states[:-1] if key in state.sizes]
+                for state in holders:
+                    state.remove(key)
+            for state in holders:
+                state.tier.fs.delete(key)
+            last = self.tiers[-1].fs
+            if last.exists(key):
+                last.delete(key)
+        finally:
+            with self._cond:
+                # Counted once done: gets that read before now don't promote
+                self._deletes += 1
+            self._release(key)
+        logger.info("Deleted key=%r", key)
+
+    def flush(self) -> None:
+        """Write every dirty key back to the last tier."""
+        with self._cond:
+            dirty = list(self._dirty)
+        flushed = 0
+        for key in dirty:
+            self._claim(key)
+            try:
+                if key in self._dirty:
+                    self._write_back(key)
+                    flushed += 1
+            finally:
+                self._release(key)
+        if flushed:
+            logger.info("Flushed %d dirty keys", flushed)
+
+    def count(self, prefix: str = "") -> int:
+        """Count keys in the last tier plus keys not yet written back."""
+        with self._cond:
+            dirty = [key for key in self._dirty if key.startswith(prefix)]
+        # A dirty key may be written back while counting
+        last = self.tiers[-1].fs
+        return last.count(prefix) + sum(1 for key in dirty if not last.exists(key))
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys in the last tier and keys not yet written back."""
+        with self._cond:
+            dirty = {key for key in self._dirty if key.startswith(prefix)}
+        return iter(sorted(dirty.union(self.tiers[-1].fs.keys(prefix))))
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists in the last tier or awaits write-back."""
+        return key in self._dirty or self.tiers[-1].fs.exists(key)
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        """Delegate to the last tier, the source of truth."""
+        return self.tiers[-1].fs._open(key, mode)
+
+    def _claim(self, key: str) -> None:
+        """Wait until no other operation is doing tier I/O for key, then claim it."""
+        with self._cond:
+            self._cond.wait_for(lambda: key not in self._busy)
+            self._busy.add(key)
+
+    def _release(self, key: str) -> None:
+        with self._cond:
+            self._busy.discard(key)
+            self._cond.notify_all()
+
+    def _admit(self, index: int, key: str, value: Any) -> bool:
+        """Store value in tier index, evicting as needed. Caller has claimed key.
+
+        Capacity is reserved and victims chosen under the lock; the
+        evictions and the save itself happen outside it.
+
+        Returns:
+            True if the tier holds the key afterwards.
+        """
+        state = self._states[index]
+        size = estimate_size(value)
+        with self._cond:
+            if key in state.sizes:
+                return True
+            limit = state.tier.max_bytes
+            victims = None if limit is not None and size > limit else self._victims(state, size)
+            if victims is None:
+                logger.debug("Not admitting key %r to tier %d (%d bytes)", key, index, size)
+                return False
+            for victim in victims:
+                state.start_eviction(victim)
+                self._busy.add(victim)
+            state.reserve(size)
+
+        try:
+            for n, victim in enumerate(victims):
+                try:
+                    self._evict(index, victim)
+                except BaseException:
+                    with self._cond:
+                        for other in victims[n + 1 :]:
+                            state.finish_eviction(other, False)
+                            self._busy.discard(other)
+                        self._cond.notify_all()
+                    raise
+            try:
+                state.tier.fs.save(key, value)
+            except FileExistsError:
+                # Left over from an earlier run
+                logger.debug("Key %r already in tier %d", key, index)
+        except BaseException:
+            with self._cond:
+                state.unreserve(size)
+            raise
+        with self._cond:
+            state.unreserve(size)
+            state.add(key, size)
+        return True
+
+    def _victims(self, state: _TierState, size: int) -> list[str] | None:
+        """Keys to evict to make room for size bytes, or None if impossible.
+
+        Busy keys are skipped. Caller holds the lock.
+        """
+        if state.tier.max_keys == 0:
+            return None
+        victims: list[str] = []
+        freed_bytes = 0
+        candidates = (key for key in state.policy if key not in self._busy)
+        while state.over_capacity(size - freed_bytes, 1 - len(victims)):
+            victim = next(candidates, None)
+            if victim is None:
+                return None
+            victims.append(victim)
+            freed_bytes += state.sizes[victim]
+        return victims
+
+    def _evict(self, index: int, key: str) -> None:
+        """Drop a claimed key from tier index, writing it back first if dirty."""
+        state = self._states[index]
+        evicted = False
+        try:
+            if index == 0 and key in self._dirty:
+                self._write_back(key)
+            with contextlib.suppress(FileNotFoundError):
+                state.tier.fs.delete(key)
+            evicted = True
+        finally:
+            with self._cond:
+                state.finish_eviction(key, evicted)
+            self._release(key)
+        logger.debug("Evicted key %r from tier %d", key, index)
+
+    def _write_back(self, key: str) -> None:
+        """Save a dirty key from the fastest tier to the last. Caller has claimed key."""
+        self.tiers[-1].fs.save(key, self.tiers[0].fs.get(key))
+        with self._cond:
+            self._dirty.discard(key)
+        logger.debug("Wrote back key %r", key)
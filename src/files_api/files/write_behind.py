@@ -0,0 +1,233 @@
+"""Write-behind queue in front of any IFileSystem."""
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterator
+from typing import IO, Any
+
+from files_api.files.batch import BatchResult
+from files_api.files.exceptions import FileExistsError
+from files_api.files.interface import IFileSystem
+from files_api.files.sizing import estimate_size
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindFileSystem(IFileSystem):
+    """Queues saves and writes them to another file system in the background.
+
+    save() checks for a collision, enqueues the object and returns; worker
+    threads serialize and write queued objects in order. Pending keys
+    behave as saved: get() returns the queued object, exists(), count()
+    and keys() include them, and saving one again raises FileExistsError.
+
+    The queue is bounded by max_pending objects and, optionally,
+    max_pending_bytes of in-memory size: save() blocks while it is full,
+    so producers can't outrun the disk. Failed background writes are
+    collected and returned by flush() and close().
+
+    Objects are serialized after save() returns, so callers must not
+    mutate them afterwards (pass a copy of a buffer that is reused).
+    Collisions are only detected among writers going through this
+    instance and what the inner file system already holds.
+    """
+
+    def __init__(
+        self,
+        inner: IFileSystem,
+        max_pending: int = 1024,
+        max_pending_bytes: int | None = None,
+        workers: int = 1,
+    ):
+        """Start the background workers.
+
+        Args:
+            inner: The file system to write to.
+            max_pending: Maximum number of queued objects.
+            max_pending_bytes: Maximum total in-memory size of queued
+                objects (see estimate_size). A larger object is queued
+                once the queue is empty.
+            workers: Number of writer threads.
+
+        Raises:
+            ValueError: If a bound or the worker count is not positive.
+        """
+        if max_pending <= 0 or workers <= 0:
+            raise ValueError("max_pending and workers must be positive")
+        if max_pending_bytes is not None and max_pending_bytes <= 0:
+            raise ValueError(f"max_pending_bytes must be positive, got {max_pending_bytes}")
+        self.inner = inner
+        self.max_pending = max_pending
+        self.max_pending_bytes = max_pending_bytes
+        self._pending: dict[str, tuple[Any, int]] = {}  # key -> (obj, size)
+        self._queue: deque[str] = deque()
+        self._pending_bytes = 0
+        self._errors: dict[str, Exception] = {}
+        self._written = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"files-write-behind-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        logger.info(
+            "Initialized WriteBehindFileSystem over %s (max_pending=%d, workers=%d)",
+            type(inner).__name__,
+            max_pending,
+            workers,
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of objects queued or being written."""
+        with self._cond:
+            return len(self._pending)
+
+    def save(self, key: str, obj: Any) -> None:
+        """Queue obj to be written under key, blocking while the queue is full.
+
+        Raises:
+            FileExistsError: If the key is pending or exists in the inner
+                file system.
+            ValueError: If the file system is closed.
+        """
+        logger.debug("save() called with key=%r, obj_type=%s", key, type(obj).__name__)
+        size = estimate_size(obj) if self.max_pending_bytes is not None else 0
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or self._has_room(size))
+            self._check_open()
+            # Under the lock, so racing saves of one key can't both pass
+            if key in self._pending or self.inner.exists(key):
+                logger.warning("Key %r already exists", key)
+                raise FileExistsError(key)
+            self._pending[key] = (obj, size)
+            self._pending_bytes += size
+            self._queue.append(key)
+            self._cond.notify_all()
+        logger.debug("Queued key=%r (%d pending)", key, len(self._pending))
+
+    def get(self, key: str) -> Any:
+        """Get object by key, returning the queued object if it is pending.
+
+        A pending key returns the very object passed to save(), not a
+        copy: mutating it changes what will be written.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+            DeserializationError: If the file cannot be deserialized.
+        """
+        with self._cond:
+            entry = self._pending.get(key)
+        if entry is not None:
+            return entry[0]
+        return self.inner.get(key)
+
+    def delete(self, key: str) -> None:
+        """Delete a key, waiting for its pending write to finish first.
+
+        Raises:
+            FileNotFoundError: If the key does not exist.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: key not in self._pending)
+        self.inner.delete(key)
+
+    def count(self, prefix: str = "") -> int:
+        """Count keys in the inner file system plus pending ones."""
+        with self._cond:
+            pending = [key for key in self._pending if key.startswith(prefix)]
+        # A key being written may already be visible in the inner store
+        return self.inner.count(prefix) + sum(1 for k in pending if not self.inner.exists(k))
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Iterate over keys in the inner file system and pending ones, sorted."""
+        with self._cond:
+            pending = {key for key in self._pending if key.startswith(prefix)}
+        return iter(sorted(pending.union(self.inner.keys(prefix))))
+
+    def exists(self, key: str) -> bool:
+        """Check if key is pending or exists in the inner file system."""
+        with self._cond:
+            if key in self._pending:
+                return True
+        return self.inner.exists(key)
+
+    def flush(self) -> BatchResult:
+        """Block until every queued object is written.
+
+        Returns:
+            A BatchResult with the exception of every background write
+            that failed since the last flush() (values are not tracked).
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: not self._pending)
+            errors, self._errors = self._errors, {}
+            written, self._written = self._written, 0
+        logger.info("flush(): %d written, %d failed", written, len(errors))
+        return BatchResult(errors=errors)
+
+    def close(self) -> BatchResult:
+        """Write everything queued, then stop the workers.
+
+        Returns:
+            The failed writes, as from flush().
+        """
+        with self._cond:
+            if self._closed:
+                return BatchResult()
+        result = self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join()
+        logger.info("Closed WriteBehindFileSystem")
+        return result
+
+    def __enter__(self) -> "WriteBehindFileSystem":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        """Delegate to the inner file system."""
+        return self.inner._open(key, mode)
+
+    def _has_room(self, size: int) -> bool:
+        """Whether an object of size bytes may be queued. Caller holds the lock."""
+        if len(self._pending) >= self.max_pending:
+            return False
+        limit = self.max_pending_bytes
+        return limit is None or not self._pending or self._pending_bytes + size <= limit
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("WriteBehindFileSystem is closed")
+
+    def _run(self) -> None:
+        """Worker thread body: write queued objects until closed."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                key = self._queue.popleft()
+                obj, size = self._pending[key]
+            try:
+                self.inner.save(key, obj)
+                error = None
+            except Exception as e:
+                logger.warning("Background write of key %r failed: %s", key, e)
+                error = e
+            with self._cond:
+                del self._pending[key]
+                self._pending_bytes -= size
+                if error is None:
+                    self._written += 1
+                else:
+                    self._errors[key] = error
+                self._cond.notify_all()
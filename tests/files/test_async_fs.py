@@ -0,0 +1,154 @@
+"""Tests for AsyncFileSystem."""
+
+import asyncio
+import tempfile
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import pytest
+
+from files_api.files import AsyncFileSystem, LocalFileSystem
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+
+
+class SlowFileSystem(LocalFileSystem):
+    """LocalFileSystem whose reads block for a fixed time."""
+
+    delay = 0.05
+
+    def __init__(self, base_path: str):
+        super().__init__(base_path)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            return super().get(key)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestAsyncFileSystemBasics:
+    """Test single-key operations."""
+
+    def test_roundtrip(self):
+        async def scenario(tmpdir: str) -> None:
+            async with AsyncFileSystem(LocalFileSystem(tmpdir)) as afs:
+                await afs.save("config", {"a": 1})
+                await afs.save("array", np.arange(3))
+                assert await afs.get("config") == {"a": 1}
+                np.testing.assert_array_equal(await afs.get("array"), np.arange(3))
+                assert await afs.exists("config") is True
+                assert await afs.count() == 2
+                assert sorted(await afs.keys("a")) == ["array"]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            asyncio.run(scenario(tmpdir))
+
+    def test_errors_propagate(self):
+        async def scenario(tmpdir: str) -> None:
+            afs = AsyncFileSystem(LocalFileSystem(tmpdir))
+            await afs.save("config", {"a": 1})
+            with pytest.raises(FileExistsError):
+                await afs.save("config", {"a": 2})
+            with pytest.raises(FileNotFoundError):
+                await afs.get("missing")
+            await afs.close()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            asyncio.run(scenario(tmpdir))
+
+    def test_invalid_concurrency_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(ValueError):
+            AsyncFileSystem(LocalFileSystem(tmpdir), max_concurrency=0)
+
+
+class TestAsyncFileSystemBatch:
+    """Test batch operations, concurrency limits and cancellation."""
+
+    def test_save_many_and_get_many(self):
+        async def scenario(tmpdir: str) -> None:
+            async with AsyncFileSystem(LocalFileSystem(tmpdir)) as afs:
+                await afs.save("taken", 0)
+                saved = await afs.save_many({"taken": 1, "a": 2, "b": 3})
+                assert list(saved.values) == ["a", "b"]
+                assert isinstance(saved.errors["taken"], FileExistsError)
+
+                loaded = await afs.get_many(["a", "b", "missing"])
+                assert loaded.values == {"a": 2, "b": 3}
+                assert isinstance(loaded.errors["missing"], FileNotFoundError)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            asyncio.run(scenario(tmpdir))
+
+    def test_concurrency_is_bounded(self):
+        async def scenario(fs: SlowFileSystem) -> None:
+            async with AsyncFileSystem(fs, max_concurrency=3) as afs:
+                result = await afs.get_many([f"k{i}" for i in range(12)])
+                assert result.ok
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = SlowFileSystem(tmpdir)
+            fs.save_many({f"k{i}": i for i in range(12)})
+            asyncio.run(scenario(fs))
+            assert 1 < fs.peak <= 3
+
+    def test_event_loop_stays_responsive(self):
+        async def scenario(fs: SlowFileSystem) -> float:
+            afs = AsyncFileSystem(fs, max_concurrency=2)
+            worst_gap = 0.0
+            done = asyncio.Event()
+
+            async def ticker() -> None:
+                nonlocal worst_gap
+                last = time.perf_counter()
+                while not done.is_set():
+                    await asyncio.sleep(0.005)
+                    now = time.perf_counter()
+                    worst_gap = max(worst_gap, now - last)
+                    last = now
+
+            tick = asyncio.create_task(ticker())
+            await afs.get_many([f"k{i}" for i in range(8)])
+            done.set()
+            await tick
+            await afs.close()
+            return worst_gap
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = SlowFileSystem(tmpdir)
+            fs.save_many({f"k{i}": i for i in range(8)})
+            # Each blocking read takes 50 ms; the loop must keep ticking meanwhile
+            assert asyncio.run(scenario(fs)) < fs.delay
+
+    def test_cancel_batch_skips_pending_keys(self):
+        async def scenario(fs: SlowFileSystem) -> None:
+            async with AsyncFileSystem(fs, max_concurrency=1) as afs:
+                task = asyncio.create_task(afs.get_many([f"k{i}" for i in range(20)]))
+                await asyncio.sleep(fs.delay * 1.5)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = SlowFileSystem(tmpdir)
+            fs.save_many({f"k{i}": i for i in range(20)})
+            calls = 0
+            original = SlowFileSystem.get
+
+            def counting_get(self: SlowFileSystem, key: str) -> Any:
+                nonlocal calls
+                calls += 1
+                return original(self, key)
+
+            fs.get = counting_get.__get__(fs)
+            asyncio.run(scenario(fs))
+            assert calls < 20
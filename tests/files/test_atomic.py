@@ -0,0 +1,366 @@
+"""Tests for atomic writes and durability policies."""
+
+import errno
+import fcntl
+import multiprocessing
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from files_api.files import LocalFileSystem, migrate_layout
+from files_api.files.atomic import AtomicWriter, Durability
+from files_api.files.exceptions import FileExistsError, SerializationError
+from files_api.files.layout import TMP_DIRNAME
+
+STRESS_WRITERS = 32
+STRESS_KEYS = 100
+
+
+def visible_files(directory: str) -> list[str]:
+    return sorted(p.name for p in Path(directory).iterdir())
+
+
+class TestAtomicWriter:
+    """Test temp-file-and-rename publishing."""
+
+    def test_file_appears_only_on_close(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            writer = AtomicWriter(path, Durability())
+            writer.write(b"hello")
+            writer.flush()
+            assert not path.exists()
+            writer.close()
+            assert path.read_bytes() == b"hello"
+            assert visible_files(tmpdir) == ["data.json"]
+
+    def test_exception_discards_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            with pytest.raises(RuntimeError), AtomicWriter(path, Durability()) as f:
+                f.write(b"partial")
+                raise RuntimeError("boom")
+            assert visible_files(tmpdir) == []
+
+    def test_unclosed_writer_is_discarded(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            writer = AtomicWriter(path, Durability())
+            writer.write(b"partial")
+            del writer
+            assert visible_files(tmpdir) == []
+
+    def test_keeps_default_permissions(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            with AtomicWriter(path, Durability()) as f:
+                f.write(b"x")
+            reference = Path(tmpdir) / "ref"
+            reference.write_bytes(b"x")
+            assert path.stat().st_mode == reference.stat().st_mode
+
+
+class TestExclusivePublish:
+    """Test link-based exclusive publishing."""
+
+    def test_existing_file_is_kept(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            path.write_bytes(b"first")
+            with pytest.raises(OSError) as info, AtomicWriter(path, Durability(), True) as f:
+                f.write(b"second")
+            assert info.value.errno == errno.EEXIST
+            assert path.read_bytes() == b"first"
+            assert visible_files(tmpdir) == ["data.json"]
+
+    def test_claim_is_shared_across_names(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claim = Path(tmpdir) / ".data.claim"
+            json_path = Path(tmpdir) / "data.json"
+            with AtomicWriter(json_path, Durability(), True, claim, json_path.exists) as f:
+                f.write(b"x")
+            with (
+                pytest.raises(OSError) as info,
+                AtomicWriter(
+                    Path(tmpdir) / "data.npy", Durability(), True, claim, json_path.exists
+                ) as f,
+            ):
+                f.write(b"y")
+            assert info.value.errno == errno.EEXIST
+            assert visible_files(tmpdir) == ["data.json"]
+
+    def test_abandoned_claim_is_taken_over(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            claim = Path(tmpdir) / ".data.claim"
+            claim.touch()  # left unlocked, as by a writer that crashed
+            with AtomicWriter(path, Durability(), True, claim) as f:
+                f.write(b"x")
+            assert path.read_bytes() == b"x"
+            assert visible_files(tmpdir) == ["data.json"]
+
+    def test_held_claim_is_kept(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            claim = Path(tmpdir) / ".data.claim"
+            claim.touch()
+            with open(claim, "rb") as holder:
+                fcntl.flock(holder.fileno(), fcntl.LOCK_EX)
+                writer = AtomicWriter(Path(tmpdir) / "data.json", Durability(), True, claim)
+                writer.write(b"x")
+                with pytest.raises(OSError) as info:
+                    writer.close()
+            assert info.value.errno == errno.EEXIST
+            assert visible_files(tmpdir) == [".data.claim"]
+
+    def test_claim_released_while_waiting_is_not_taken(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            claim = Path(tmpdir) / ".data.claim"
+            claim.touch()
+            real_flock = fcntl.flock
+            calls = []
+
+            def flock(fd, operation):
+                # The holder releases (unlinks) the claim before the first lock
+                if not calls:
+                    claim.unlink()
+                calls.append(fd)
+                real_flock(fd, operation)
+
+            monkeypatch.setattr(fcntl, "flock", flock)
+            with AtomicWriter(path, Durability(), True, claim) as f:
+                f.write(b"x")
+            assert len(calls) == 2  # the unlinked claim, then a fresh one
+            assert visible_files(tmpdir) == ["data.json"]
+
+    def test_without_hard_links(self, monkeypatch):
+        def no_link(*args):
+            raise OSError(errno.EPERM, "Operation not permitted")
+
+        real_replace = os.replace
+        seen = []
+
+        def replace(src, dst):
+            # The final path must not be exposed before the data arrives
+            seen.append(Path(dst).exists())
+            real_replace(src, dst)
+
+        monkeypatch.setattr(os, "link", no_link)
+        monkeypatch.setattr(os, "replace", replace)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.json"
+            with AtomicWriter(path, Durability(), exclusive=True) as f:
+                f.write(b"x")
+            with pytest.raises(OSError), AtomicWriter(path, Durability(), exclusive=True) as f:
+                f.write(b"y")
+            assert seen == [False]
+            assert path.read_bytes() == b"x"
+            assert visible_files(tmpdir) == ["data.json"]
+
+
+class TestDurability:
+    """Test fsync policies."""
+
+    @pytest.fixture
+    def fsync_calls(self, monkeypatch):
+        calls: list[int] = []
+        real_fsync = os.fsync
+
+        def counting_fsync(fd: int) -> None:
+            calls.append(fd)
+            real_fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", counting_fsync)
+        return calls
+
+    def _write(self, directory: str, name: str, durability: Durability) -> None:
+        with AtomicWriter(Path(directory) / name, durability) as f:
+            f.write(b"x")
+
+    def test_unknown_mode_raises_error(self):
+        with pytest.raises(ValueError, match="Unknown durability mode"):
+            Durability("sometimes")
+
+    def test_none_never_fsyncs(self, fsync_calls):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._write(tmpdir, "a", Durability("none"))
+            assert fsync_calls == []
+
+    def test_always_fsyncs_file_and_directory(self, fsync_calls):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._write(tmpdir, "a", Durability("always"))
+            assert len(fsync_calls) == 2
+
+    def test_batch_group_commits_at_batch_size(self, fsync_calls):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            durability = Durability("batch", batch_size=3, batch_interval=3600)
+            self._write(tmpdir, "a", durability)
+            self._write(tmpdir, "b", durability)
+            assert fsync_calls == []
+            self._write(tmpdir, "c", durability)
+            # Three files plus their shared directory
+            assert len(fsync_calls) == 4
+
+    def test_batch_sync_flushes_pending(self, fsync_calls):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            durability = Durability("batch", batch_size=100, batch_interval=3600)
+            self._write(tmpdir, "a", durability)
+            durability.sync()
+            assert len(fsync_calls) == 2
+            durability.sync()
+            assert len(fsync_calls) == 2
+
+    def test_batch_fsyncs_updated_file_once(self, fsync_calls):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            durability = Durability("batch", batch_size=5, batch_interval=3600)
+            path = Path(tmpdir) / "segment"
+            with open(path, "ab") as f:
+                for _ in range(4):
+                    f.write(b"x")
+                    durability.after_update(f.fileno(), path)
+                assert fsync_calls == []
+                durability.after_update(f.fileno(), path)
+            # Five updates of one file: the file and its directory, once each
+            assert len(fsync_calls) == 2
+
+    def test_batch_commits_after_interval(self, fsync_calls):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            durability = Durability("batch", batch_size=100, batch_interval=0)
+            self._write(tmpdir, "a", durability)
+            assert len(fsync_calls) == 2
+
+
+class TestLocalFileSystemAtomicSave:
+    """Test atomic saves through LocalFileSystem."""
+
+    def test_failed_save_leaves_no_file_and_key_stays_free(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            with pytest.raises(SerializationError):
+                fs.save("bad", object())
+            assert not any(p.name.startswith("bad") for p in Path(tmpdir).iterdir())
+            assert list((Path(tmpdir) / TMP_DIRNAME).iterdir()) == []
+            fs.save("bad", {"now": "fine"})
+            assert fs.get("bad") == {"now": "fine"}
+
+    @pytest.mark.parametrize("mode", ["none", "batch", "always"])
+    def test_roundtrip_in_every_mode(self, mode):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, durability=mode, layout="sharded")
+            fs.save("config", {"a": 1})
+            fs.sync()
+            assert fs.get("config") == {"a": 1}
+
+    @pytest.mark.parametrize("layout", ["flat", "sharded"])
+    def test_failed_save_keeps_index_fresh(self, layout):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, layout=layout)
+            fs.save("good", {"a": 1})
+            # Backdate everything, so any directory change shows up
+            for path in [fs.index.path, *fs.layout.directories()]:
+                os.utime(path, ns=(0, 0))
+            with pytest.raises(SerializationError):
+                fs.save("bad", object())
+            assert not fs.index._is_stale()
+
+    def test_delete_frees_the_key_for_any_extension(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=False)
+            fs.save("key", {"a": 1})
+            with pytest.raises(FileExistsError):
+                fs.save("key", np.zeros(2))
+            fs.delete("key")
+            fs.save("key", np.zeros(2))
+            assert visible_files(tmpdir) == [TMP_DIRNAME, "key.npy"]
+
+    def test_migrated_key_is_still_taken(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LocalFileSystem(tmpdir).save("key", {"a": 1})
+            migrate_layout(tmpdir, "sharded")
+            fs = LocalFileSystem(tmpdir, layout="sharded", use_index=False)
+            with pytest.raises(FileExistsError):
+                fs.save("key", np.zeros(2))
+            assert not list(Path(tmpdir).rglob("*.claim"))
+
+    def test_unknown_durability_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(ValueError):
+            LocalFileSystem(tmpdir, durability="eventually")
+
+
+def _stress_writer(base_path: str, writer: int, start: threading.Event) -> list[str]:
+    """Save every stress key, as JSON or an array depending on the writer."""
+    fs = LocalFileSystem(base_path)
+    start.wait()
+    won = []
+    for i in range(STRESS_KEYS):
+        obj = {"writer": writer} if writer % 2 else np.full(4, writer)
+        try:
+            fs.save(f"key{i}", obj)
+            won.append(f"key{i}")
+        except FileExistsError:
+            pass
+    return won
+
+
+class TestConcurrentSave:
+    """Test that racing savers of one key never both succeed."""
+
+    @pytest.mark.parametrize("use_index", [True, False])
+    def test_threads(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            barrier = threading.Barrier(8)
+            results = []
+
+            def save(i):
+                barrier.wait()
+                try:
+                    fs.save("key", {"i": i} if i % 2 else np.full(2, i))
+                    results.append(i)
+                except FileExistsError:
+                    pass
+
+            threads = [threading.Thread(target=save, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len(results) == 1
+            # One file, the temp directory and the index journal; no claims
+            assert len(visible_files(tmpdir)) == 2 + use_index
+
+    def test_processes(self):
+        context = multiprocessing.get_context("fork")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LocalFileSystem(tmpdir)
+            start = context.Manager().Event()
+            with context.Pool(STRESS_WRITERS) as pool:
+                pending = [
+                    pool.apply_async(_stress_writer, (tmpdir, writer, start))
+                    for writer in range(STRESS_WRITERS)
+                ]
+                start.set()
+                wins = [result.get(timeout=120) for result in pending]
+
+            winners = {}
+            for writer, keys in enumerate(wins):
+                for key in keys:
+                    assert key not in winners, f"{key} saved by {winners[key]} and {writer}"
+                    winners[key] = writer
+            assert len(winners) == STRESS_KEYS
+
+            names = [p.name for p in Path(tmpdir).iterdir() if not p.name.startswith(".")]
+            assert len(names) == STRESS_KEYS  # one file per key
+            assert not list(Path(tmpdir).glob(".*.claim"))
+            assert not list(Path(tmpdir).glob(".*.tmp"))
+            fs = LocalFileSystem(tmpdir, use_index=False)
+            for key, writer in winners.items():
+                value = fs.get(key)
+                if writer % 2:
+                    assert value == {"writer": writer}
+                else:
+                    np.testing.assert_array_equal(value, np.full(4, writer))
@@ -0,0 +1,128 @@
+"""Tests for batched save_many / get_many."""
+
+import tempfile
+from collections.abc import Iterator
+from typing import IO, Any
+
+import numpy as np
+import pytest
+
+from files_api.files import BatchResult, IFileSystem, LocalFileSystem
+from files_api.files.exceptions import FileExistsError, FileNotFoundError, SerializationError
+
+
+class DictFileSystem(IFileSystem):
+    """Minimal IFileSystem relying on the default batch implementations."""
+
+    def __init__(self):
+        self.data: dict[str, Any] = {}
+
+    def save(self, key: str, obj: Any) -> None:
+        if key in self.data:
+            raise FileExistsError(key)
+        self.data[key] = obj
+
+    def get(self, key: str) -> Any:
+        if key not in self.data:
+            raise FileNotFoundError(key)
+        return self.data[key]
+
+    def count(self, prefix: str = "") -> int:
+        return sum(1 for _ in self.keys(prefix))
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        return (k for k in self.data if k.startswith(prefix))
+
+    def delete(self, key: str) -> None:
+        if key not in self.data:
+            raise FileNotFoundError(key)
+        del self.data[key]
+
+    def exists(self, key: str) -> bool:
+        return key in self.data
+
+    def _open(self, key: str, mode: str) -> IO[bytes]:
+        raise NotImplementedError
+
+
+class TestBatchResult:
+    """Test BatchResult helpers."""
+
+    def test_ok_when_no_errors(self):
+        assert BatchResult(values={"a": 1}).ok is True
+
+    def test_raise_first_reraises_error(self):
+        result = BatchResult(errors={"a": FileNotFoundError("a")})
+        assert result.ok is False
+        with pytest.raises(FileNotFoundError):
+            result.raise_first()
+
+    def test_raise_first_noop_without_errors(self):
+        BatchResult().raise_first()
+
+
+class TestDefaultBatchImplementation:
+    """Test the sequential IFileSystem defaults."""
+
+    def test_save_many_collects_collisions(self):
+        fs = DictFileSystem()
+        fs.save("a", 1)
+        result = fs.save_many({"a": 2, "b": 3})
+        assert result.values == {"b": None}
+        assert isinstance(result.errors["a"], FileExistsError)
+
+    def test_get_many_collects_missing_keys(self):
+        fs = DictFileSystem()
+        fs.save("a", 1)
+        result = fs.get_many(["a", "missing", "a"])
+        assert result.values == {"a": 1}
+        assert isinstance(result.errors["missing"], FileNotFoundError)
+
+
+class TestLocalFileSystemBatch:
+    """Test the concurrent LocalFileSystem implementation."""
+
+    def test_save_many_and_get_many_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, max_workers=4)
+            items = {f"item_{i}": {"i": i} for i in range(50)}
+            items["array"] = np.arange(5)
+            assert fs.save_many(items).ok
+            assert fs.count() == 51
+
+            result = fs.get_many(items)
+            assert result.ok
+            assert list(result.values) == list(items)
+            assert result.values["item_7"] == {"i": 7}
+            np.testing.assert_array_equal(result.values["array"], np.arange(5))
+
+    def test_save_many_bad_key_does_not_abort_batch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("taken", {"a": 1})
+            result = fs.save_many({"taken": 1, "bad": object(), "good": [1, 2]})
+            assert list(result.values) == ["good"]
+            assert isinstance(result.errors["taken"], FileExistsError)
+            assert isinstance(result.errors["bad"], SerializationError)
+            assert fs.get("good") == [1, 2]
+
+    def test_get_many_reports_missing_keys(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("present", {"a": 1})
+            result = fs.get_many(["present", "absent"])
+            assert result.values == {"present": {"a": 1}}
+            assert isinstance(result.errors["absent"], FileNotFoundError)
+
+    def test_empty_batches(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            assert fs.save_many({}).ok
+            assert fs.get_many([]).values == {}
+
+
+class TestAbstractMethods:
+    """Test that every IFileSystem method a backend must provide is abstract."""
+
+    def test_keys_and_delete_are_required(self):
+        assert {"keys", "delete"} <= IFileSystem.__abstractmethods__
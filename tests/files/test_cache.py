@@ -0,0 +1,201 @@
+"""Tests for CachedFileSystem."""
+
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from files_api.files import BatchResult, CachedFileSystem, IFileSystem, LocalFileSystem
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+
+
+class TestCachedFileSystemInit:
+    """Test construction."""
+
+    def test_unknown_policy_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(ValueError):
+            CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=100, policy="fifo")
+
+    def test_negative_budget_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(ValueError):
+            CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=-1)
+
+    def test_is_ifilesystem(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert isinstance(CachedFileSystem(LocalFileSystem(tmpdir), 100), IFileSystem)
+
+
+class TestCachedFileSystemGet:
+    """Test read-through caching."""
+
+    def test_second_get_is_a_hit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=1 << 20)
+            fs.save("config", {"a": 1})
+            assert fs.get("config") == {"a": 1}
+            assert fs.get("config") == {"a": 1}
+            stats = fs.stats
+            assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+            assert stats.current_bytes > 0
+
+    def test_cached_arrays_are_read_only(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=1 << 20)
+            fs.save("array", np.arange(10))
+            result = fs.get("array")
+            with pytest.raises(ValueError):
+                result[0] = 99
+            assert fs.get("array") is result
+
+    def test_cached_pandas_frames_are_copies(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=1 << 20)
+            fs.save("frame", pd.DataFrame({"x": [1, 2, 3]}))
+            miss = fs.get("frame")
+            miss.loc[0, "x"] = 99
+            hit = fs.get("frame")
+            assert fs.stats.hits == 1
+            hit.loc[1, "x"] = 99
+            assert fs.get("frame")["x"].tolist() == [1, 2, 3]
+
+    def test_array_size_uses_nbytes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=1 << 20)
+            fs.save("array", np.zeros(1000, dtype=np.float64))
+            fs.get("array")
+            assert fs.stats.current_bytes == 8000
+
+    def test_objects_larger_than_budget_are_not_cached(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=100)
+            fs.save("array", np.zeros(1000))
+            fs.get("array")
+            assert fs.stats.entries == 0
+
+    def test_missing_key_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=100)
+            with pytest.raises(FileNotFoundError):
+                fs.get("missing")
+
+    def test_get_many_reads_only_misses(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=1 << 20)
+            fs.save_many({"a": 1, "b": 2})
+            fs.get("a")
+            result = fs.get_many(["a", "b", "missing"])
+            assert result.values == {"a": 1, "b": 2}
+            assert isinstance(result.errors["missing"], FileNotFoundError)
+            assert fs.stats.hits == 1
+            assert fs.stats.entries == 2
+
+
+class TestCachedFileSystemEviction:
+    """Test size-driven eviction policies."""
+
+    def _fs(self, tmpdir: str, policy: str) -> CachedFileSystem:
+        inner = LocalFileSystem(tmpdir)
+        for name in "abc":
+            inner.save(name, np.zeros(100, dtype=np.uint8))
+        # Room for exactly two 100-byte arrays
+        return CachedFileSystem(inner, max_bytes=250, policy=policy)
+
+    def test_lru_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = self._fs(tmpdir, "lru")
+            fs.get("a")
+            fs.get("b")
+            fs.get("a")
+            fs.get("c")  # evicts b
+            assert fs.stats.evictions == 1
+            fs.get("a")
+            assert fs.stats.hits == 2
+            fs.get("b")
+            assert fs.stats.misses == 4
+
+    def test_lfu_evicts_least_frequently_used(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = self._fs(tmpdir, "lfu")
+            fs.get("a")
+            fs.get("b")
+            fs.get("b")
+            fs.get("a")
+            fs.get("a")
+            fs.get("c")  # evicts b (2 uses) rather than a (3 uses)
+            fs.get("a")
+            assert fs.stats.hits == 4
+            fs.get("b")
+            assert fs.stats.misses == 4
+            assert fs.stats.evictions == 2
+
+
+class TestCachedFileSystemInvalidation:
+    """Test invalidation and delegation."""
+
+    def test_save_invalidates_key(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inner = LocalFileSystem(tmpdir)
+            fs = CachedFileSystem(inner, max_bytes=1 << 20)
+            fs.save("a", 1)
+            fs.get("a")
+            with pytest.raises(FileExistsError):
+                fs.save("a", 2)
+            assert fs.stats.entries == 0
+
+    def test_clear_and_delegation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=1 << 20)
+            fs.save("item_1", 1)
+            fs.get("item_1")
+            fs.clear()
+            assert fs.stats.entries == 0
+            assert fs.stats.current_bytes == 0
+            assert fs.exists("item_1") is True
+            assert fs.exists("missing") is False
+            assert fs.count("item_") == 1
+            assert list(fs.keys()) == ["item_1"]
+
+
+class TestCachedFileSystemDelete:
+    """Test delete."""
+
+    def test_delete_invalidates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = CachedFileSystem(LocalFileSystem(tmpdir), max_bytes=1 << 20)
+            fs.save("k", {"a": 1})
+            fs.get("k")
+            fs.delete("k")
+            assert not fs.exists("k")
+            with pytest.raises(FileNotFoundError):
+                fs.get("k")
+
+    @pytest.mark.parametrize("batch", [False, True])
+    def test_delete_during_read_is_not_undone(self, batch):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inner = LocalFileSystem(tmpdir)
+            inner.save("k", {"a": 1})
+            fs = CachedFileSystem(inner, max_bytes=1 << 20)
+            read, deleted = threading.Event(), threading.Event()
+            real_get = inner.get
+
+            def slow_get(key):
+                value = real_get(key)
+                read.set()
+                deleted.wait(5)
+                return value
+
+            inner.get = slow_get
+            inner.get_many = lambda keys: BatchResult(values={k: slow_get(k) for k in keys})
+            reader = threading.Thread(
+                target=fs.get_many if batch else fs.get, args=(["k"] if batch else "k",)
+            )
+            reader.start()
+            read.wait(5)
+            fs.delete("k")
+            deleted.set()
+            reader.join()
+            assert fs.stats.entries == 0
+            with pytest.raises(FileNotFoundError):
+                fs.get("k")
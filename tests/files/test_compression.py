@@ -0,0 +1,159 @@
+"""Tests for transparent compression."""
+
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from files_api.files import FileExistsError, LocalFileSystem
+from files_api.files.exceptions import DeserializationError
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.handlers.compression import COMPRESSIONS, CompressedHandler
+from files_api.files.handlers.json_handler import JsonHandler
+from files_api.files.handlers.numpy_handler import NumpyHandler
+
+CONFIG = {"name": "run", "params": {"lr": 0.01, "layers": [64, 64, 64]}, "tags": ["a"] * 100}
+
+
+@pytest.mark.parametrize("compression", list(COMPRESSIONS))
+class TestCompressedHandler:
+    """Test CompressedHandler with every compression."""
+
+    def test_extension_and_type_name(self, compression):
+        handler = CompressedHandler(JsonHandler(), compression)
+        assert handler.extension == ".json" + COMPRESSIONS[compression]
+        assert handler.type_name == f"json+{compression}"
+
+    def test_json_roundtrip_is_smaller(self, compression):
+        handler = CompressedHandler(JsonHandler(), compression)
+        buffer = BytesIO()
+        handler.to_file(CONFIG, buffer)
+        plain = BytesIO()
+        JsonHandler().to_file(CONFIG, plain)
+        assert buffer.tell() < plain.tell()
+        buffer.seek(0)
+        assert handler.from_file(buffer) == CONFIG
+
+    def test_numpy_roundtrip(self, compression):
+        handler = CompressedHandler(NumpyHandler(), compression, level=1)
+        arr = np.zeros((100, 50), dtype=np.float32)
+        arr[::7, ::3] = 1.5
+        buffer = BytesIO()
+        handler.to_file(arr, buffer)
+        buffer.seek(0)
+        np.testing.assert_array_equal(handler.from_file(buffer), arr)
+
+    def test_corrupt_data_raises_error(self, compression):
+        handler = CompressedHandler(JsonHandler(), compression)
+        with pytest.raises(DeserializationError):
+            handler.from_file(BytesIO(b"definitely not compressed"))
+
+    def test_truncated_data_raises_error(self, compression):
+        handler = CompressedHandler(JsonHandler(), compression)
+        buffer = BytesIO()
+        handler.to_file(CONFIG, buffer)
+        with pytest.raises(DeserializationError):
+            handler.from_file(BytesIO(buffer.getvalue()[:-10]))
+
+
+class TestCompressedHandlerErrors:
+    """Test invalid compression settings."""
+
+    def test_unknown_compression_raises(self):
+        with pytest.raises(ValueError, match="Unknown compression"):
+            CompressedHandler(JsonHandler(), "zstd")
+
+
+class TestFactoryCompression:
+    """Test compression policy and detection in FileHandlerFactory."""
+
+    @pytest.mark.parametrize(
+        ("name", "type_name"),
+        [("a.json.gz", "json+gzip"), ("a.npy.xz", "numpy+lzma"), ("A.JSON.BZ2", "json+bz2")],
+    )
+    def test_compound_extension_detected(self, name, type_name):
+        handler = FileHandlerFactory().get_handler_for_file(Path(name))
+        assert handler.type_name == type_name
+
+    def test_plain_extension_still_detected(self):
+        handler = FileHandlerFactory().get_handler_for_file(Path("a.json"))
+        assert isinstance(handler, JsonHandler)
+
+    def test_unknown_compound_extension_raises(self):
+        with pytest.raises(ValueError, match="Unknown file extension"):
+            FileHandlerFactory().get_handler_for_file(Path("a.txt.gz"))
+
+    def test_policy_applies_per_handler(self):
+        factory = FileHandlerFactory(compression={"json": ("lzma", 1)})
+        json_handler = factory.get_handler_for_object(CONFIG)
+        assert json_handler.extension == ".json.xz"
+        assert json_handler.level == 1
+        assert isinstance(factory.get_handler_for_object(np.zeros(3)), NumpyHandler)
+
+    def test_call_overrides_policy(self):
+        factory = FileHandlerFactory(compression={"json": "gzip"})
+        assert factory.get_handler_for_object(CONFIG, "bz2").extension == ".json.bz2"
+        assert isinstance(factory.get_handler_for_object(CONFIG, "none"), JsonHandler)
+
+    def test_unknown_handler_type_raises(self):
+        with pytest.raises(ValueError, match="Unknown handler type"):
+            FileHandlerFactory(compression={"csv": "gzip"})
+
+    def test_compressed_handlers_are_reused(self):
+        factory = FileHandlerFactory()
+        assert factory.get_handler_for_object(CONFIG, "gzip") is factory.get_handler_for_object(
+            CONFIG, "gzip"
+        )
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+class TestLocalFileSystemCompression:
+    """Test compressed saves through LocalFileSystem."""
+
+    def test_save_with_compression(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            fs.save("config", CONFIG, compression="gzip")
+            assert (Path(tmpdir) / "config.json.gz").exists()
+            assert fs.get("config") == CONFIG
+            assert fs.exists("config")
+            assert list(fs.keys()) == ["config"]
+
+    def test_factory_policy_and_reopen(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            factory = FileHandlerFactory(compression={"numpy": "lzma"})
+            fs = LocalFileSystem(tmpdir, use_index=use_index, factory=factory)
+            arr = np.arange(1000, dtype=np.float64)
+            fs.save("arr", arr)
+            assert (Path(tmpdir) / "arr.npy.xz").exists()
+            np.testing.assert_array_equal(LocalFileSystem(tmpdir).get("arr"), arr)
+
+    def test_collision_across_compressions(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            fs.save("config", CONFIG, compression="bz2")
+            with pytest.raises(FileExistsError):
+                fs.save("config", CONFIG)
+
+    def test_save_many_with_compression(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            result = fs.save_many({"a": CONFIG, "b": np.ones(4)}, compression="gzip")
+            assert result.ok
+            assert fs.get_many(["a", "b"]).values["a"] == CONFIG
+            assert (Path(tmpdir) / "b.npy.gz").exists()
+
+    def test_iter_items_on_compressed_list(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            fs.save("rows", list(range(1000)), compression="lzma")
+            assert list(fs.iter_items("rows")) == list(range(1000))
+
+    def test_get_mmap_rejects_compressed_array(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            fs.save("arr", np.ones(4), compression="gzip")
+            with pytest.raises(ValueError, match="not a numpy array"):
+                fs.get_mmap("arr")
@@ -0,0 +1,224 @@
+"""Tests for DataFrameHandler."""
+
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from files_api.files import FileNotFoundError, LocalFileSystem
+from files_api.files.exceptions import DeserializationError, SerializationError
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.handlers.dataframe_handler import DataFrameHandler, is_dataframe
+
+POLARS_DF = pl.DataFrame(
+    {
+        "id": [1, 2, 3],
+        "name": ["a", None, "c"],
+        "score": [0.5, 1.5, None],
+        "ok": [True, False, True],
+    }
+)
+
+
+class TestIsDataFrame:
+    """Test frame detection."""
+
+    def test_detects_flavors(self):
+        assert is_dataframe(POLARS_DF) == "polars"
+        assert is_dataframe(pd.DataFrame({"a": [1]})) == "pandas"
+
+    def test_other_objects(self):
+        assert is_dataframe({"a": [1]}) is None
+        assert is_dataframe(np.zeros(3)) is None
+
+
+class TestDataFrameHandlerPolars:
+    """Test polars frames."""
+
+    def test_roundtrip(self):
+        handler = DataFrameHandler()
+        buffer = BytesIO()
+        handler.to_file(POLARS_DF, buffer)
+        buffer.seek(0)
+        assert_frame_equal(handler.from_file(buffer), POLARS_DF)
+
+    def test_column_projection(self):
+        handler = DataFrameHandler()
+        buffer = BytesIO()
+        handler.to_file(POLARS_DF, buffer)
+        buffer.seek(0)
+        assert handler.from_file(buffer, columns=["score", "id"]).columns == ["score", "id"]
+
+    def test_compressed_ipc(self):
+        handler = DataFrameHandler(compression="zstd")
+        buffer = BytesIO()
+        handler.to_file(POLARS_DF, buffer)
+        buffer.seek(0)
+        assert_frame_equal(handler.from_file(buffer), POLARS_DF)
+
+    def test_non_frame_raises(self):
+        with pytest.raises(SerializationError):
+            DataFrameHandler().to_file({"a": 1}, BytesIO())
+
+    def test_invalid_data_raises(self):
+        with pytest.raises(DeserializationError):
+            DataFrameHandler().from_file(BytesIO(b"not arrow"))
+
+    def test_unknown_flavor_raises(self):
+        with pytest.raises(ValueError, match="Unknown DataFrame flavor"):
+            DataFrameHandler("spark")
+
+
+class TestDataFrameHandlerPandas:
+    """Test pandas frames."""
+
+    def roundtrip(self, pdf: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        handler = DataFrameHandler("pandas")
+        buffer = BytesIO()
+        handler.to_file(pdf, buffer)
+        buffer.seek(0)
+        return handler.from_file(buffer, **kwargs)
+
+    def test_roundtrip_simple_columns(self):
+        pdf = pd.DataFrame({"a": [1, 2], "b": [0.5, np.nan], "c": ["x", "y"]})
+        result = self.roundtrip(pdf)
+        assert isinstance(result, pd.DataFrame)
+        pd.testing.assert_frame_equal(result, pdf, check_dtype=False)
+
+    def test_named_index_is_restored(self):
+        pdf = pd.DataFrame({"v": [1.0, 2.0]}, index=pd.Index(["r1", "r2"], name="row"))
+        result = self.roundtrip(pdf)
+        assert list(result.index) == ["r1", "r2"]
+        assert result.index.name == "row"
+
+    def test_multi_index_is_restored(self):
+        index = pd.MultiIndex.from_tuples([("a", 1), ("b", 2)], names=["k", None])
+        result = self.roundtrip(pd.DataFrame({"v": [1, 2]}, index=index))
+        assert list(result.index) == [("a", 1), ("b", 2)]
+        assert list(result.index.names) == ["k", None]
+
+    def test_column_projection_keeps_index(self):
+        pdf = pd.DataFrame({"a": [1, 2], "b": [3, 4]}, index=pd.Index([10, 20], name="t"))
+        result = self.roundtrip(pdf, columns=["b"])
+        assert list(result.columns) == ["b"]
+        assert list(result.index) == [10, 20]
+
+
+class TestFactoryDataFrames:
+    """Test DataFrame routing in FileHandlerFactory."""
+
+    def test_frames_select_dataframe_handler(self):
+        factory = FileHandlerFactory(compression={"json": "gzip"})
+        assert factory.get_handler_for_object(POLARS_DF).extension == ".arrow"
+        assert factory.get_handler_for_object(pd.DataFrame()).extension == ".pdarrow"
+
+    def test_extensions_detected(self):
+        factory = FileHandlerFactory()
+        assert factory.get_handler_for_file(Path("a.arrow")).type_name == "polars"
+        assert factory.get_handler_for_file(Path("a.pdarrow")).type_name == "pandas"
+
+
+class TestLocalFileSystemDataFrames:
+    """Test saving and loading frames through LocalFileSystem."""
+
+    def test_polars_roundtrip_with_columns(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("table", POLARS_DF)
+            assert (Path(tmpdir) / "table.arrow").exists()
+            assert_frame_equal(fs.get("table"), POLARS_DF)
+            assert_frame_equal(fs.get("table", columns=["name"]), POLARS_DF.select("name"))
+
+    def test_pandas_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("table", pd.DataFrame({"a": [1, 2, 3]}))
+            assert list(LocalFileSystem(tmpdir).get("table")["a"]) == [1, 2, 3]
+
+    def test_keys_are_unambiguous(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("x.pandas", POLARS_DF)
+            fs.save("x", pd.DataFrame({"a": [1]}))
+            fs.refresh()
+            assert sorted(fs.keys()) == ["x", "x.pandas"]
+            assert_frame_equal(LocalFileSystem(tmpdir).get("x.pandas"), POLARS_DF)
+
+    def test_no_extension_ends_with_another(self):
+        extensions = FileHandlerFactory(array_handler="shuffle").extensions
+        assert not [(a, b) for a in extensions for b in extensions if a != b and b.endswith(a)]
+
+    def test_get_many_returns_frames(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("t", POLARS_DF)
+            assert_frame_equal(fs.get_many(["t"]).values["t"], POLARS_DF)
+
+    def test_columns_on_non_frame_raises(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("config", {"a": 1})
+            with pytest.raises(ValueError, match="not a DataFrame"):
+                fs.get("config", columns=["a"])
+
+    def test_missing_file_raises_not_found(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("t", POLARS_DF)
+            (Path(tmpdir) / "t.arrow").unlink()
+            with pytest.raises(FileNotFoundError):
+                fs.get("t")
+
+
+class TestLocalFileSystemScan:
+    """Test lazy scans over stored DataFrames."""
+
+    def test_scan_single_key_with_pushdown(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("table", POLARS_DF)
+            lf = fs.scan("table")
+            assert isinstance(lf, pl.LazyFrame)
+            result = lf.filter(pl.col("id") > 1).select("id").collect()
+            assert result["id"].to_list() == [2, 3]
+
+    @pytest.mark.parametrize("layout", ["flat", "sharded"])
+    def test_scan_prefix_as_one_dataset(self, layout):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, layout=layout)
+            fs.save("trades-02", pl.DataFrame({"day": [3, 4]}))
+            fs.save("trades-01", pl.DataFrame({"day": [1, 2]}))
+            fs.save("trades-notes", {"skip": True})
+            fs.save("other", pl.DataFrame({"day": [9]}))
+            result = fs.scan("trades-").collect()
+            assert result["day"].to_list() == [1, 2, 3, 4]
+
+    def test_scan_mixes_pandas_and_polars(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("trades-01", pl.DataFrame({"day": [1, 2]}))
+            fs.save("trades-02", pd.DataFrame({"day": [3, 4]}, index=pd.Index([7, 8], name="t")))
+            fs.save("trades-03", pd.DataFrame({"day": [5]}))
+            result = fs.scan("trades-").filter(pl.col("day") > 1).collect()
+            assert result.columns == ["day"]
+            assert result["day"].to_list() == [2, 3, 4, 5]
+            assert fs.scan("trades-02").collect().columns == ["day"]
+
+    def test_scan_exact_non_frame_raises(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("config", {"a": 1})
+            with pytest.raises(ValueError, match="not a DataFrame"):
+                fs.scan("config")
+
+    def test_scan_without_matches_raises(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("config", {"a": 1})
+            with pytest.raises(FileNotFoundError):
+                fs.scan("con")
@@ -0,0 +1,177 @@
+"""Tests for KeyIndex."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from files_api.files.index import (
+    INDEX_FILENAME,
+    IndexEntry,
+    KeyIndex,
+    SortedKeys,
+    prefix_upper_bound,
+    split_key,
+)
+
+EXTENSIONS = [".json", ".npy"]
+
+
+class TestKeyIndexLoad:
+    """Test loading and rebuilding the index."""
+
+    def test_load_missing_index_scans_directory(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            (base / "a.json").write_bytes(b"{}")
+            (base / "b.npy").write_bytes(b"xx")
+            index = KeyIndex(base, EXTENSIONS)
+            index.load()
+            assert len(index) == 2
+            assert index.lookup("a").extension == ".json"
+            assert index.lookup("b") == IndexEntry(".npy", 2, (base / "b.npy").stat().st_mtime_ns)
+            assert (base / INDEX_FILENAME).exists()
+
+    def test_scan_ignores_unknown_and_hidden_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            (base / "notes.txt").write_bytes(b"x")
+            (base / ".hidden.json").write_bytes(b"x")
+            (base / "sub").mkdir()
+            index = KeyIndex(base, EXTENSIONS)
+            index.load()
+            assert len(index) == 0
+
+    def test_load_reads_journal_without_rescanning(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            index = KeyIndex(base, EXTENSIONS)
+            index.load()
+            index.add("journal_only", ".json", 10, 123)
+
+            reloaded = KeyIndex(base, EXTENSIONS)
+            reloaded.load()
+            # The file doesn't exist, so the entry can only come from the journal
+            assert reloaded.lookup("journal_only") == IndexEntry(".json", 10, 123)
+
+    def test_load_rebuilds_when_directory_is_newer(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            index = KeyIndex(base, EXTENSIONS)
+            index.load()
+            (base / "late.json").write_bytes(b"{}")
+            os.utime(base / INDEX_FILENAME, ns=(0, 0))
+
+            reloaded = KeyIndex(base, EXTENSIONS)
+            reloaded.load()
+            assert "late" in reloaded
+
+    def test_load_rebuilds_corrupt_journal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            (base / "a.json").write_bytes(b"{}")
+            index = KeyIndex(base, EXTENSIONS)
+            index.load()
+            with open(base / INDEX_FILENAME, "a") as f:
+                f.write('{"key": "torn')
+
+            reloaded = KeyIndex(base, EXTENSIONS)
+            reloaded.load()
+            assert "a" in reloaded
+
+
+class TestKeyIndexUpdates:
+    """Test add and discard."""
+
+    def test_discard_is_persisted(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            index = KeyIndex(base, EXTENSIONS)
+            index.load()
+            index.add("gone", ".json", 1, 1)
+            index.discard("gone")
+            assert index.lookup("gone") is None
+
+            reloaded = KeyIndex(base, EXTENSIONS)
+            reloaded.load()
+            assert "gone" not in reloaded
+
+    def test_discard_unknown_key_is_noop(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = KeyIndex(Path(tmpdir), EXTENSIONS)
+            index.load()
+            index.discard("missing")
+            assert len(index) == 0
+
+
+class TestKeyIndexPrefixQueries:
+    """Test count and keys over the sorted key list."""
+
+    def _index(self, base: Path, keys: list[str]) -> KeyIndex:
+        index = KeyIndex(base, EXTENSIONS)
+        index.load()
+        for key in keys:
+            index.add(key, ".json", 1, 1)
+        return index
+
+    def test_count_and_keys_with_prefix(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir), ["user_b", "config", "user_a", "users"])
+            assert index.count() == 4
+            assert index.count("user_") == 2
+            assert list(index.keys("user")) == ["user_a", "user_b", "users"]
+            assert list(index.keys("zzz")) == []
+
+    def test_re_adding_key_does_not_duplicate(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir), ["a", "a"])
+            assert index.count() == 1
+            assert list(index.keys()) == ["a"]
+
+    def test_discard_removes_from_sorted_keys(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir), ["a", "b", "c"])
+            index.discard("b")
+            assert list(index.keys()) == ["a", "c"]
+
+    def test_keys_iteration_is_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = self._index(Path(tmpdir), ["k1", "k2"])
+            it = index.keys("k")
+            index.add("k0", ".json", 1, 1)
+            assert list(it) == ["k1", "k2"]
+
+
+class TestSortedKeys:
+    """Test the sorted key set."""
+
+    def test_add_and_discard(self):
+        keys = SortedKeys(["b", "a"])
+        keys.add("c")
+        keys.add("a")
+        keys.discard("b")
+        keys.discard("missing")
+        assert keys.keys() == ["a", "c"]
+        assert len(keys) == 2
+
+    def test_prefix_queries(self):
+        keys = SortedKeys(["a/1", "a/2", "ab", "b/1", "a" + chr(0x10FFFF)])
+        assert keys.count("a/") == 2
+        assert keys.keys("a") == ["a/1", "a/2", "ab", "a" + chr(0x10FFFF)]
+        assert keys.count() == 5
+        assert keys.keys("c") == []
+
+
+class TestHelpers:
+    """Test module-level helpers."""
+
+    def test_prefix_upper_bound(self):
+        assert prefix_upper_bound("") is None
+        assert prefix_upper_bound("abc") == "abd"
+        assert prefix_upper_bound("a" + chr(0x10FFFF)) == "b"
+        assert prefix_upper_bound(chr(0x10FFFF)) is None
+
+    def test_split_key_prefers_longest_extension(self):
+        assert split_key("data.npy", [".npy", ".json"]) == ("data", ".npy")
+        assert split_key("t.json.gz", [".gz", ".json.gz"]) == ("t", ".json.gz")
+        assert split_key("notes.txt", [".npy"]) is None
+        assert split_key(".npy", [".npy"]) is None
@@ -0,0 +1,141 @@
+"""Tests for header-only object metadata (info / info_many)."""
+
+import io
+import os
+import tempfile
+
+import numpy as np
+import polars as pl
+import pytest
+
+from files_api.files.exceptions import DeserializationError, FileNotFoundError
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.handlers.json_handler import JsonHandler
+from files_api.files.handlers.numpy_handler import NumpyHandler
+from files_api.files.info import ObjectInfo
+from files_api.files.local import LocalFileSystem
+
+
+class TestHandlerReadInfo:
+    """Tests for IFileHandler.read_info implementations."""
+
+    def test_numpy_reads_header_only(self):
+        buf = io.BytesIO()
+        NumpyHandler().to_file(np.zeros((3, 4), dtype=np.float32, order="F"), buf)
+        header_only = io.BytesIO(buf.getvalue()[:128])
+        info = NumpyHandler().read_info(header_only)
+        assert info == {"shape": (3, 4), "dtype": np.dtype(np.float32), "fortran_order": True}
+
+    def test_numpy_invalid_header(self):
+        with pytest.raises(DeserializationError):
+            NumpyHandler().read_info(io.BytesIO(b"not numpy"))
+
+    def test_json_envelope_fields(self):
+        buf = io.BytesIO()
+        JsonHandler().to_file({"a": 1}, buf)
+        buf.seek(0)
+        assert JsonHandler().read_info(buf) == {"type_name": "dict", "version": 1}
+
+    def test_json_reads_bounded_prefix(self):
+        buf = io.BytesIO()
+        JsonHandler().to_file(list(range(100_000)), buf)
+        buf.seek(0)
+        assert JsonHandler().read_info(buf, limit=1024)["type_name"] == "list"
+        assert buf.tell() <= 1024
+
+    def test_json_header_beyond_limit(self):
+        data = b'{"pad":"' + b"x" * 2000 + b'","__type__":"dict","data":{}}'
+        assert JsonHandler().read_info(io.BytesIO(data), limit=1024) == {}
+
+    def test_json_malformed(self):
+        with pytest.raises(DeserializationError):
+            JsonHandler().read_info(io.BytesIO(b'{"__type__": "dict"}'))
+
+
+class TestLocalFileSystemInfo:
+    """Tests for LocalFileSystem.info."""
+
+    def test_numpy(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("arr", np.arange(12, dtype=np.int64).reshape(3, 4))
+            info = fs.info("arr")
+            st = os.stat(os.path.join(tmpdir, "arr.npy"))
+            assert info == ObjectInfo(
+                key="arr",
+                format="numpy",
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                shape=(3, 4),
+                dtype=np.dtype(np.int64),
+                fortran_order=False,
+            )
+            assert info.mtime == pytest.approx(st.st_mtime)
+
+    def test_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("cfg", {"a": [1, 2, 3]})
+            info = fs.info("cfg")
+            assert info.format == "json"
+            assert info.type_name == "dict"
+            assert info.version == 1
+            assert info.shape is None
+
+    def test_compressed_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("items", list(range(1000)), compression="gzip")
+            info = fs.info("items")
+            assert info.format == "json+gzip"
+            assert info.type_name == "list"
+            assert info.size == os.path.getsize(os.path.join(tmpdir, "items.json.gz"))
+
+    def test_shuffled_array(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, factory=FileHandlerFactory(array_handler="shuffle"))
+            fs.save("arr", np.ones((5, 2), dtype=np.uint16))
+            info = fs.info("arr")
+            assert info.format == "numpy-shuffle"
+            assert info.shape == (5, 2)
+            assert info.dtype == np.dtype(np.uint16)
+
+    def test_dataframe(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("df", pl.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+            info = fs.info("df")
+            assert info.format == "polars"
+            assert info.columns == {"a": "Int64", "b": "String"}
+
+    def test_missing_key(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            with pytest.raises(FileNotFoundError):
+                fs.info("missing")
+
+
+class TestLocalFileSystemInfoMany:
+    """Tests for LocalFileSystem.info_many."""
+
+    def test_collects_results_and_errors(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, max_workers=4)
+            for i in range(10):
+                fs.save(f"arr{i}", np.zeros(i + 1))
+            keys = [f"arr{i}" for i in range(10)] + ["missing", "arr0"]
+            result = fs.info_many(keys)
+            assert list(result.values) == [f"arr{i}" for i in range(10)]
+            assert result.values["arr3"].shape == (4,)
+            assert isinstance(result.errors["missing"], FileNotFoundError)
+
+    def test_corrupt_file_reported(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("good", np.zeros(2))
+            with open(os.path.join(tmpdir, "bad.npy"), "wb") as f:
+                f.write(b"garbage")
+            fs.refresh()
+            result = fs.info_many(["good", "bad"])
+            assert "good" in result.values
+            assert isinstance(result.errors["bad"], DeserializationError)
@@ -0,0 +1,170 @@
+"""Tests for JSON codecs."""
+
+import contextlib
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from files_api.files.exceptions import DeserializationError, SerializationError
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.handlers.json_codecs import (
+    JSON_CODECS,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    get_json_codec,
+)
+from files_api.files.handlers.json_handler import JsonHandler
+
+PAYLOAD = {"name": "café", "values": [1, 2.5, None, True], "nested": {"a": ["x", {"b": 1}]}}
+
+
+def _codecs():
+    codecs = [StdlibJsonCodec()]
+    with contextlib.suppress(ImportError):
+        codecs.append(OrjsonCodec())
+    return codecs
+
+
+class TestGetJsonCodec:
+    """Test codec lookup."""
+
+    def test_json_returns_stdlib(self):
+        assert isinstance(get_json_codec("json"), StdlibJsonCodec)
+
+    def test_default_is_stdlib(self):
+        assert isinstance(get_json_codec(), StdlibJsonCodec)
+        assert isinstance(JsonHandler().codec, StdlibJsonCodec)
+        assert set(JSON_CODECS) == {"json", "orjson"}
+
+    def test_unknown_raises(self):
+        with pytest.raises(ValueError, match="Unknown JSON codec"):
+            get_json_codec("yaml")
+
+
+@pytest.mark.parametrize("codec", _codecs(), ids=lambda c: c.name)
+class TestJsonCodecs:
+    """Test behaviour shared by all codecs."""
+
+    def test_encode_returns_bytes(self, codec):
+        assert isinstance(codec.encode(PAYLOAD), bytes)
+
+    def test_roundtrip(self, codec):
+        assert codec.decode(codec.encode(PAYLOAD)) == PAYLOAD
+
+    def test_unicode_is_not_escaped(self, codec):
+        assert "café".encode() in codec.encode(PAYLOAD)
+
+    def test_numpy_scalars_and_arrays(self, codec):
+        obj = {"s": np.float64(1.5), "i": np.int32(7), "a": np.arange(3), "m": np.eye(2)}
+        assert codec.decode(codec.encode(obj)) == {
+            "s": 1.5,
+            "i": 7,
+            "a": [0, 1, 2],
+            "m": [[1.0, 0.0], [0.0, 1.0]],
+        }
+
+    def test_non_serializable_raises_type_error(self, codec):
+        with pytest.raises(TypeError):
+            codec.encode({"x": object()})
+
+    def test_invalid_input_raises_value_error(self, codec):
+        with pytest.raises(ValueError):
+            codec.decode(b"{not json")
+
+    def test_invalid_utf8_raises_value_error(self, codec):
+        with pytest.raises(ValueError):
+            codec.decode(b'"\xff"')
+
+    def test_reads_other_codecs_output(self, codec):
+        for other in _codecs():
+            assert codec.decode(other.encode(PAYLOAD)) == PAYLOAD
+
+
+class TestOrjsonCompatibility:
+    """Test that orjson reads stdlib files and never corrupts values."""
+
+    @pytest.fixture
+    def codec(self):
+        pytest.importorskip("orjson")
+        return OrjsonCodec()
+
+    def test_reads_nan_and_infinity_tokens(self, codec):
+        data = StdlibJsonCodec().encode({"n": float("nan"), "i": float("inf")})
+        decoded = codec.decode(data)
+        assert np.isnan(decoded["n"])
+        assert decoded["i"] == float("inf")
+
+    def test_big_ints_roundtrip(self, codec):
+        obj = {"big": 2**70, "neg": -(2**65), "small": 3}
+        assert codec.decode(StdlibJsonCodec().encode(obj)) == obj
+        assert codec.decode(codec.encode(obj)) == obj
+
+    @pytest.mark.parametrize("value", [float("nan"), float("-inf"), np.array([1.0, np.nan])])
+    def test_rejects_non_finite(self, codec, value):
+        with pytest.raises(ValueError):
+            codec.encode({"x": value, "y": None})
+
+    def test_null_is_kept(self, codec):
+        assert codec.decode(codec.encode({"x": None})) == {"x": None}
+
+    @pytest.mark.parametrize("value", [[1.5, None], "null", {2.5: "null"}, np.ones(3)])
+    def test_finite_values_with_nulls_encode(self, codec, value):
+        decoded = codec.decode(codec.encode({"x": value, "y": None}))
+        assert decoded["y"] is None
+
+    def test_non_finite_key_and_nested_array(self, codec):
+        with pytest.raises(ValueError):
+            codec.encode({float("nan"): None})
+        with pytest.raises(ValueError):
+            codec.encode([None, [np.array([np.inf])]])
+
+
+class TestStdlibStreaming:
+    """Test that the stdlib codec writes in chunks."""
+
+    def test_write_matches_encode(self):
+        codec = StdlibJsonCodec()
+        obj = {"rows": [{"i": i, "s": "é" * 50} for i in range(50_000)], "a": np.arange(3)}
+        buffer = BytesIO()
+        assert codec.write(obj, buffer) == len(buffer.getvalue())
+        assert buffer.getvalue() == codec.encode(obj)
+
+    def test_write_streams_chunks(self):
+        writes = []
+
+        class Recorder(BytesIO):
+            def write(self, data):
+                writes.append(len(data))
+                return super().write(data)
+
+        obj = [{"i": i, "name": f"user-{i}"} for i in range(200_000)]
+        StdlibJsonCodec().write(obj, Recorder())
+        assert len(writes) > 1
+        assert max(writes) < sum(writes)
+
+
+class TestJsonHandlerCodec:
+    """Test JsonHandler with explicit codecs."""
+
+    @pytest.mark.parametrize("codec", _codecs(), ids=lambda c: c.name)
+    def test_handler_roundtrip(self, codec):
+        handler = JsonHandler(codec)
+        buffer = BytesIO()
+        handler.to_file(PAYLOAD, buffer)
+        buffer.seek(0)
+        assert handler.from_file(buffer) == PAYLOAD
+
+    def test_handler_accepts_codec_name(self):
+        assert isinstance(JsonHandler("json").codec, StdlibJsonCodec)
+
+    def test_handler_wraps_codec_errors(self):
+        handler = JsonHandler("json")
+        with pytest.raises(SerializationError):
+            handler.to_file({"x": object()}, BytesIO())
+        with pytest.raises(DeserializationError):
+            handler.from_file(BytesIO(b"\xff\xfe"))
+
+    def test_factory_passes_codec(self):
+        factory = FileHandlerFactory(json_codec="json")
+        assert isinstance(factory.get_handler_for_object({}).codec, StdlibJsonCodec)
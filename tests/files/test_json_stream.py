@@ -0,0 +1,105 @@
+"""Tests for incremental JSON envelope parsing."""
+
+import json
+import tempfile
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from files_api.files import LocalFileSystem
+from files_api.files.exceptions import DeserializationError, FileNotFoundError
+from files_api.files.handlers.json_handler import JsonHandler
+from files_api.files.handlers.json_stream import EnvelopeParser
+
+
+def envelope(data: object) -> BytesIO:
+    buffer = BytesIO()
+    JsonHandler().to_file(data, buffer)
+    buffer.seek(0)
+    return buffer
+
+
+class TestEnvelopeParser:
+    """Test the pull parser."""
+
+    def test_header_returns_fields_before_data(self):
+        parser = EnvelopeParser(envelope([1, 2]))
+        assert parser.header() == {"__type__": "list", "__version__": 1}
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+    def test_items_across_chunk_boundaries(self, chunk_size):
+        data = [12345, -0.5e10, "héllo 🎉", {"nested": [1, {"x": None}]}, [], True, 7]
+        parser = EnvelopeParser(envelope(data), chunk_size=chunk_size)
+        assert list(parser.items()) == data
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5])
+    def test_numbers_split_at_fraction_or_exponent(self, chunk_size):
+        raw = b'{"data":[1.5,2e10,-3.25E-2,4]}'
+        parser = EnvelopeParser(BytesIO(raw), chunk_size=chunk_size)
+        assert list(parser.items()) == [1.5, 2e10, -3.25e-2, 4]
+
+    def test_empty_list(self):
+        assert list(EnvelopeParser(envelope([])).items()) == []
+
+    def test_whitespace_and_field_order_are_tolerated(self):
+        raw = b' { "data" : [ 1 , 2 ] , "__type__" : "list" } '
+        assert list(EnvelopeParser(BytesIO(raw), chunk_size=2).items()) == [1, 2]
+
+    def test_non_list_data_raises_error(self):
+        with pytest.raises(DeserializationError, match="not an array"):
+            list(EnvelopeParser(envelope({"a": 1})).items())
+
+    def test_missing_data_raises_error(self):
+        raw = json.dumps({"__type__": "list"}).encode()
+        with pytest.raises(DeserializationError, match="missing 'data'"):
+            EnvelopeParser(BytesIO(raw)).header()
+
+    def test_truncated_file_raises_error(self):
+        raw = envelope(list(range(100))).getvalue()[:-10]
+        parser = EnvelopeParser(BytesIO(raw), chunk_size=16)
+        with pytest.raises(DeserializationError):
+            list(parser.items())
+
+    def test_invalid_utf8_raises_error(self):
+        raw = b'{"data": ["\xff\xfe"]}'
+        with pytest.raises(DeserializationError):
+            list(EnvelopeParser(BytesIO(raw)).items())
+
+
+class TestJsonHandlerIterItems:
+    """Test JsonHandler.iter_items."""
+
+    def test_streams_elements(self):
+        data = [{"id": i} for i in range(1000)]
+        assert list(JsonHandler().iter_items(envelope(data), chunk_size=100)) == data
+
+    def test_reads_lazily(self):
+        data = [{"id": i, "pad": "x" * 100} for i in range(1000)]
+        buffer = envelope(data)
+        items = JsonHandler().iter_items(buffer, chunk_size=256)
+        assert next(items) == data[0]
+        assert buffer.tell() < 1024
+
+
+class TestLocalFileSystemIterItems:
+    """Test LocalFileSystem.iter_items."""
+
+    def test_streams_saved_list(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("records", [{"id": i} for i in range(10)])
+            assert [item["id"] for item in fs.iter_items("records")] == list(range(10))
+
+    def test_missing_key_raises_immediately(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            with pytest.raises(FileNotFoundError):
+                fs.iter_items("missing")
+
+    def test_array_key_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("array", np.arange(3))
+            with pytest.raises(ValueError, match="does not support streaming"):
+                fs.iter_items("array")
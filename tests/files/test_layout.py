@@ -0,0 +1,153 @@
+"""Tests for directory layouts and layout migration."""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from files_api.files import LocalFileSystem, migrate_layout
+from files_api.files.index import INDEX_FILENAME
+from files_api.files.layout import LAYOUT_FILENAME, TMP_DIRNAME, ShardedLayout, write_layout
+
+EXTENSIONS = [".json", ".npy"]
+
+
+class TestShardedLayout:
+    """Test path computation and scanning."""
+
+    def test_path_uses_two_hex_levels(self):
+        layout = ShardedLayout(Path("/store"), EXTENSIONS)
+        path = layout.path_for("config.json")
+        assert path.name == "config.json"
+        first, second = path.parent.parent.name, path.parent.name
+        assert len(first) == len(second) == 2
+        int(first + second, 16)
+        assert path.parent.parent.parent == Path("/store")
+
+    def test_all_extensions_of_a_key_share_a_directory(self):
+        layout = ShardedLayout(Path("/store"), EXTENSIONS)
+        assert layout.path_for("k.json").parent == layout.path_for("k.npy").parent
+
+    def test_scan_finds_files_in_shards_only(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            layout = ShardedLayout(base, EXTENSIONS)
+            path = layout.path_for("k.json")
+            path.parent.mkdir(parents=True)
+            path.write_bytes(b"{}")
+            (base / "top.json").write_bytes(b"{}")
+            assert [entry.name for entry in layout.scan()] == ["k.json"]
+
+
+class TestLocalFileSystemSharded:
+    """Test LocalFileSystem on top of the sharded layout."""
+
+    @pytest.mark.parametrize("use_index", [True, False])
+    def test_operations_are_transparent(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index, layout="sharded")
+            fs.save("config", {"a": 1})
+            fs.save("array", np.arange(3))
+            assert not (Path(tmpdir) / "config.json").exists()
+            assert fs.layout.path_for("config.json").exists()
+            assert fs.get("config") == {"a": 1}
+            np.testing.assert_array_equal(fs.get_mmap("array"), np.arange(3))
+            assert fs.exists("array") is True
+            assert fs.count() == 2
+            assert sorted(fs.keys()) == ["array", "config"]
+
+    def test_layout_is_recorded_and_reused(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LocalFileSystem(tmpdir, layout="sharded").save("config", {"a": 1})
+            fs = LocalFileSystem(tmpdir, use_index=False)
+            assert fs.layout.name == "sharded"
+            assert fs.get("config") == {"a": 1}
+
+    def test_index_rebuild_scans_shards(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, layout="sharded")
+            LocalFileSystem(tmpdir, use_index=False).save("other", [1])
+            fs.refresh()
+            assert fs.exists("other") is True
+
+    def test_index_sees_file_added_to_existing_shard(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, layout="sharded")
+            leaf = fs.layout.path_for("late.json").parent
+            leaf.mkdir(parents=True)
+            fs.save("first", [1])
+            # Only the leaf shard is newer than the journal, as after a file
+            # was added behind its back or a save crashed before recording it
+            now = time.time_ns()
+            for directory in fs.layout.directories():
+                os.utime(directory, ns=(now - 10**10, now - 10**10))
+            os.utime(Path(tmpdir) / INDEX_FILENAME, ns=(now, now))
+            (leaf / "late.json").write_bytes(b'{"version": 1, "type": "list", "data": [2]}')
+            os.utime(leaf, ns=(now + 10**10, now + 10**10))
+
+            reopened = LocalFileSystem(tmpdir)
+            assert reopened.exists("late") is True
+            assert reopened.count() == 2
+
+    def test_conflicting_layout_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LocalFileSystem(tmpdir, layout="sharded")
+            with pytest.raises(ValueError, match="sharded"):
+                LocalFileSystem(tmpdir, layout="flat")
+
+    def test_sharding_a_flat_store_requires_migration(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LocalFileSystem(tmpdir).save("config", {"a": 1})
+            with pytest.raises(ValueError, match="migrate_layout"):
+                LocalFileSystem(tmpdir, layout="sharded")
+
+    @pytest.mark.parametrize("layout", ["flat", "sharded"])
+    def test_key_with_separator_is_rejected(self, layout):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, layout=layout)
+            with pytest.raises(ValueError, match="path separator"):
+                fs.save("user/000/1", {"a": 1})
+            assert "user/000/1" in fs.save_many({"user/000/1": {"a": 1}}).errors
+            assert fs.count() == 0
+            assert [p.name for p in Path(tmpdir).iterdir() if p.is_dir()] == [TMP_DIRNAME]
+
+    def test_unknown_layout_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError, match="Unknown layout"):
+                LocalFileSystem(tmpdir, layout="nested")
+            assert not (Path(tmpdir) / LAYOUT_FILENAME).exists()
+
+
+class TestMigrateLayout:
+    """Test in-place layout migration."""
+
+    def test_flat_to_sharded_and_back(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            flat = LocalFileSystem(tmpdir)
+            flat.save_many({f"k{i}": {"i": i} for i in range(20)})
+            flat.save("array", np.arange(4))
+
+            assert migrate_layout(tmpdir, "sharded") == 21
+            sharded = LocalFileSystem(tmpdir)
+            assert sharded.layout.name == "sharded"
+            assert sharded.count() == 21
+            assert sharded.get("k7") == {"i": 7}
+            assert not (Path(tmpdir) / "k7.json").exists()
+
+            assert migrate_layout(tmpdir, "flat") == 21
+            flat = LocalFileSystem(tmpdir)
+            assert flat.count() == 21
+            assert (Path(tmpdir) / "k7.json").exists()
+            assert [p.name for p in Path(tmpdir).iterdir() if p.is_dir()] == [TMP_DIRNAME]
+
+    def test_interrupted_migration_is_detected_and_resumable(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LocalFileSystem(tmpdir).save("config", {"a": 1})
+            write_layout(Path(tmpdir), "sharded", migrating=True)
+            with pytest.raises(ValueError, match="Incomplete migration"):
+                LocalFileSystem(tmpdir)
+            migrate_layout(tmpdir, "sharded")
+            assert LocalFileSystem(tmpdir).get("config") == {"a": 1}
@@ -1,6 +1,11 @@
 """Tests for LocalFileSystem."""
 
+import fcntl
+import multiprocessing
+import os
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 import numpy as np
@@ -10,6 +15,18 @@ from files_api.files.exceptions import FileExistsError, FileNotFoundError
 from files_api.files.local import LocalFileSystem
 
 
+def _unpadded_npy(arr: np.ndarray) -> bytes:
+    """A 1-d float64 .npy file whose header lacks np.save's growth padding."""
+    header = f"{{'descr': '<f8', 'fortran_order': False, 'shape': ({len(arr)},), }}\n".encode()
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header + arr.tobytes()
+
+
+def _append_when_locked(base_path: str, locked) -> None:
+    """Append to "data" once another process holds its lock (run in a child)."""
+    locked.wait()
+    LocalFileSystem(base_path).append("data", np.ones(1))
+
+
 class TestLocalFileSystemInit:
     """Test initialization."""
 
@@ -185,3 +202,289 @@ class TestLocalFileSystemExists:
             fs.save("myfile", {"data": 1})
             assert fs.exists("myfile") is True
             assert fs.exists("myfile.json") is False  # Full path shouldn't match
+
+
+class TestLocalFileSystemIndex:
+    """Test the persistent key index."""
+
+    def test_index_survives_reopen(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            LocalFileSystem(tmpdir).save("config", {"key": "value"})
+            fs = LocalFileSystem(tmpdir)
+            assert fs.exists("config") is True
+            assert fs.get("config") == {"key": "value"}
+
+    def test_index_records_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("array", np.arange(10))
+            entry = fs.index.lookup("array")
+            assert entry.extension == ".npy"
+            assert entry.size == (Path(tmpdir) / "array.npy").stat().st_size
+
+    def test_get_file_removed_externally_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("config", {"key": "value"})
+            (Path(tmpdir) / "config.json").unlink()
+            with pytest.raises(FileNotFoundError):
+                fs.get("config")
+            assert fs.exists("config") is False
+
+    def test_refresh_picks_up_external_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            LocalFileSystem(tmpdir, use_index=False).save("other", [1, 2])
+            assert fs.count() == 0
+            fs.refresh()
+            assert fs.count() == 1
+            assert list(fs.keys()) == ["other"]
+
+    def test_sees_keys_saved_by_other_instance(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            a = LocalFileSystem(tmpdir)
+            b = LocalFileSystem(tmpdir)
+            b.save("k", {"v": 1})
+            assert a.exists("k") is True
+            assert a.get("k") == {"v": 1}
+            assert a.count() == 1
+            b.save("j", {"v": 2})
+            with pytest.raises(FileExistsError):
+                a.save("j", [1])
+            assert a.exists("j") is True
+            assert list(a.keys()) == ["j", "k"]
+
+    def test_without_index_probes_disk(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=False)
+            assert fs.index is None
+            fs.save("data", {"a": 1})
+            assert fs.exists("data") is True
+            assert fs.get("data") == {"a": 1}
+            with pytest.raises(FileExistsError):
+                fs.save("data", [1])
+
+
+class TestLocalFileSystemKeys:
+    """Test keys method and prefix counting."""
+
+    @pytest.mark.parametrize("use_index", [True, False])
+    def test_keys_with_prefix(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            fs.save("data_b", {"b": 2})
+            fs.save("data_a", np.array([1]))
+            fs.save("other", {"c": 3})
+            assert sorted(fs.keys("data_")) == ["data_a", "data_b"]
+            assert sorted(fs.keys()) == ["data_a", "data_b", "other"]
+
+    @pytest.mark.parametrize("use_index", [True, False])
+    def test_count_ignores_unknown_files(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            fs.save("data_a", {"a": 1})
+            (Path(tmpdir) / "data_b.txt").write_bytes(b"x")
+            assert fs.count("data_") == 1
+
+    def test_count_prefix_with_glob_characters(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("run[1]", {"a": 1})
+            fs.save("run1", {"a": 1})
+            assert fs.count("run[") == 1
+
+
+class TestLocalFileSystemGetMmap:
+    """Test memory-mapped array reads."""
+
+    def test_get_mmap_returns_memmap(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            original = np.arange(100, dtype=np.float32).reshape(10, 10)
+            fs.save("matrix", original)
+            result = fs.get_mmap("matrix")
+            assert isinstance(result, np.memmap)
+            assert result.flags.writeable is False
+            np.testing.assert_array_equal(result, original)
+
+    def test_get_mmap_copy_on_write_leaves_file_untouched(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("vec", np.zeros(4))
+            result = fs.get_mmap("vec", mode="c")
+            result[0] = 1.0
+            np.testing.assert_array_equal(fs.get("vec"), np.zeros(4))
+
+    def test_get_mmap_object_array_falls_back_to_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("objs", np.array([{"a": 1}, None], dtype=object))
+            result = fs.get_mmap("objs")
+            assert not isinstance(result, np.memmap)
+            assert result[0] == {"a": 1}
+
+    def test_get_mmap_json_key_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("config", {"a": 1})
+            with pytest.raises(ValueError, match="not a numpy array"):
+                fs.get_mmap("config")
+
+    def test_get_mmap_invalid_mode_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("vec", np.zeros(4))
+            with pytest.raises(ValueError, match="Unsupported mmap_mode"):
+                fs.get_mmap("vec", mode="w+")
+
+    def test_get_mmap_nonexistent_key_raises_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            with pytest.raises(FileNotFoundError):
+                fs.get_mmap("missing")
+
+
+class TestLocalFileSystemGetSlice:
+    """Test get_slice method."""
+
+    @pytest.mark.parametrize("layout", ["flat", "sharded"])
+    def test_get_slice(self, layout):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, layout=layout)
+            arr = np.arange(200).reshape(50, 4)
+            fs.save("data", arr)
+            np.testing.assert_array_equal(fs.get_slice("data", slice(10, 20)), arr[10:20])
+            np.testing.assert_array_equal(fs.get_slice("data", (7, 1)), arr[7, 1])
+
+    def test_get_slice_missing_key_raises(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            with pytest.raises(FileNotFoundError):
+                fs.get_slice("missing", 0)
+
+    def test_get_slice_non_array_raises(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("config", {"a": 1})
+            with pytest.raises(ValueError, match=r"not a \.npy array"):
+                fs.get_slice("config", 0)
+
+
+class TestLocalFileSystemAppend:
+    """Test append method."""
+
+    @pytest.mark.parametrize("durability", ["none", "batch", "always"])
+    def test_append_grows_array(self, durability):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, durability=durability)
+            fs.save("data", np.arange(6).reshape(3, 2))
+            assert fs.append("data", np.array([[6, 7]])) == (4, 2)
+            assert fs.append("data", np.array([8, 9])) == (5, 2)
+            np.testing.assert_array_equal(fs.get("data"), np.arange(10).reshape(5, 2))
+            np.testing.assert_array_equal(fs.get_slice("data", 4), [8, 9])
+
+    def test_concurrent_appends_and_reads(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("log", np.zeros((0, 2), dtype=np.int64))
+
+            def writer(worker):
+                for _ in range(20):
+                    fs.append("log", np.full((1, 2), worker))
+
+            torn = []
+
+            def reader():
+                for _ in range(50):
+                    arr = fs.get("log")
+                    # Every visible row must be complete
+                    if not (arr[:, 0] == arr[:, 1]).all():
+                        torn.append(arr)
+
+            threads = [threading.Thread(target=writer, args=(w,)) for w in range(1, 5)]
+            threads.append(threading.Thread(target=reader))
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert not torn
+            result = fs.get("log")
+            assert result.shape == (80, 2)
+            assert sorted(np.bincount(result[:, 0])[1:]) == [20, 20, 20, 20]
+
+    def test_index_tracks_new_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("data", np.zeros(4))
+            fs.append("data", np.zeros(100))
+            size = (Path(tmpdir) / "data.npy").stat().st_size
+            assert fs.index.lookup("data").size == size
+            assert LocalFileSystem(tmpdir).count() == 1
+
+    def test_header_without_room_is_rewritten(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "data.npy").write_bytes(_unpadded_npy(np.zeros(9)))
+            fs = LocalFileSystem(tmpdir)
+            assert fs.append("data", np.ones(1)) == (10,)
+            np.testing.assert_array_equal(fs.get("data"), [0] * 9 + [1])
+
+    def test_append_waiting_on_rewritten_file(self):
+        context = multiprocessing.get_context("fork")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "data.npy"
+            path.write_bytes(_unpadded_npy(np.zeros(9)))
+            # Forked before the lock is taken, so the child doesn't inherit it
+            locked = context.Event()
+            child = context.Process(target=_append_when_locked, args=(tmpdir, locked))
+            child.start()
+            with open(path, "r+b") as old:
+                fcntl.flock(old.fileno(), fcntl.LOCK_EX)
+                locked.set()
+                time.sleep(0.5)  # the child opens the old file and waits for the lock
+                # What another appender's rewrite does while holding the lock
+                replacement = path.with_name("replacement")
+                replacement.write_bytes(_unpadded_npy(np.full(10, 2.0)))
+                os.replace(replacement, path)
+            child.join(30)
+            assert child.exitcode == 0
+            np.testing.assert_array_equal(LocalFileSystem(tmpdir).get("data"), [2] * 10 + [1])
+
+    def test_append_missing_key_raises(self):
+        with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(FileNotFoundError):
+            LocalFileSystem(tmpdir).append("missing", np.zeros(1))
+
+    def test_append_non_array_raises(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            fs.save("config", [1, 2])
+            with pytest.raises(ValueError, match="not a"):
+                fs.append("config", np.zeros(1))
+
+
+class TestLocalFileSystemDelete:
+    """Test delete."""
+
+    @pytest.mark.parametrize("use_index", [True, False])
+    def test_delete_then_save_again(self, use_index):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, use_index=use_index)
+            fs.save("key", {"a": 1})
+            fs.delete("key")
+            assert not fs.exists("key")
+            assert not (Path(tmpdir) / "key.json").exists()
+            fs.save("key", np.zeros(2))
+            np.testing.assert_array_equal(fs.get("key"), np.zeros(2))
+
+    def test_delete_missing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir)
+            with pytest.raises(FileNotFoundError):
+                fs.delete("missing")
+
+    def test_delete_survives_reopen(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, layout="sharded", durability="always")
+            fs.save("a", [1])
+            fs.save("b", [2])
+            fs.delete("a")
+            assert list(LocalFileSystem(tmpdir).keys()) == ["b"]
@@ -0,0 +1,130 @@
+"""Tests for MemoryFileSystem."""
+
+import numpy as np
+import pytest
+
+from files_api.files.exceptions import (
+    FileExistsError,
+    FileNotFoundError,
+    MemoryLimitError,
+    SerializationError,
+)
+from files_api.files.memory import MemoryFileSystem
+
+
+@pytest.fixture(params=["faithful", "fast"])
+def fs(request):
+    return MemoryFileSystem(mode=request.param)
+
+
+class TestMemoryFileSystemCommon:
+    """Behavior shared by both modes."""
+
+    def test_save_and_get(self, fs):
+        fs.save("cfg", {"a": [1, 2]})
+        fs.save("arr", np.arange(4))
+        assert fs.get("cfg") == {"a": [1, 2]}
+        np.testing.assert_array_equal(fs.get("arr"), np.arange(4))
+
+    def test_collision(self, fs):
+        fs.save("k", {})
+        with pytest.raises(FileExistsError):
+            fs.save("k", np.zeros(1))
+
+    def test_missing(self, fs):
+        assert not fs.exists("missing")
+        with pytest.raises(FileNotFoundError):
+            fs.get("missing")
+
+    def test_keys_and_count(self, fs):
+        for key in ["b/2", "a/1", "b/1", "c"]:
+            fs.save(key, {})
+        assert list(fs.keys("b/")) == ["b/1", "b/2"]
+        assert fs.count() == 4
+        assert fs.count("a") == 1
+
+    def test_open_exposes_serialized_bytes(self, fs):
+        fs.save("arr", np.arange(3))
+        with fs._open("arr.npy", "rb") as f:
+            assert f.read(6) == b"\x93NUMPY"
+        with pytest.raises(FileNotFoundError):
+            fs._open("arr.json", "rb")
+
+    def test_open_write(self, fs):
+        with fs._open("cfg.json", "wb") as f:
+            f.write(b'{"__type__": "dict", "__version__": 1, "data": {"a": 1}}')
+        assert fs.get("cfg") == {"a": 1}
+
+    def test_max_bytes(self, fs):
+        fs.max_bytes = 10_000
+        fs.save("small", np.zeros(10))
+        with pytest.raises(MemoryLimitError):
+            fs.save("big", np.zeros(10_000))
+        assert not fs.exists("big")
+        assert 0 < fs.current_bytes <= 10_000
+
+    def test_delete(self, fs):
+        fs.save("k", np.zeros(100))
+        fs.delete("k")
+        assert not fs.exists("k")
+        assert fs.current_bytes == 0
+        with pytest.raises(FileNotFoundError):
+            fs.delete("k")
+
+    def test_clear(self, fs):
+        fs.save("k", [1])
+        fs.clear()
+        assert fs.count() == 0
+        assert fs.current_bytes == 0
+
+
+class TestMemoryFileSystemFaithful:
+    """Tests for faithful mode."""
+
+    def test_matches_disk_behavior(self):
+        fs = MemoryFileSystem()
+        fs.save("t", (1, 2))
+        assert fs.get("t") == [1, 2]  # JSON turns tuples into lists
+        with pytest.raises(SerializationError):
+            fs.save("bad", {"x": object()})
+        assert not fs.exists("bad")
+
+    def test_returns_independent_copies(self):
+        fs = MemoryFileSystem()
+        fs.save("arr", np.zeros(3))
+        fs.get("arr")[0] = 1
+        assert fs.get("arr")[0] == 0
+
+    def test_compression(self):
+        fs = MemoryFileSystem()
+        fs.save("plain", [0] * 1000)
+        fs.save("packed", [0] * 1000, compression="gzip")
+        assert fs.get("packed") == [0] * 1000
+        assert fs.current_bytes < 2 * 1000 * len("0,")
+
+
+class TestMemoryFileSystemFast:
+    """Tests for fast mode."""
+
+    def test_stores_by_reference(self):
+        fs = MemoryFileSystem(mode="fast")
+        obj = {"a": object()}
+        fs.save("obj", obj)
+        assert fs.get("obj") is obj
+
+    def test_arrays_are_read_only_views(self):
+        fs = MemoryFileSystem(mode="fast")
+        arr = np.zeros(3)
+        fs.save("arr", arr)
+        stored = fs.get("arr")
+        assert np.shares_memory(stored, arr)
+        assert arr.flags.writeable
+        with pytest.raises(ValueError):
+            stored[0] = 1
+        writable = stored.copy()
+        writable[0] = 1
+        assert fs.get("arr")[0] == 0
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            MemoryFileSystem(mode="slow")
@@ -0,0 +1,33 @@
+"""Tests for .npy header parsing."""
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from files_api.files.handlers.npy_header import read_npy_header
+
+
+class TestReadNpyHeader:
+    """Test read_npy_header."""
+
+    def test_reads_shape_dtype_and_offset(self):
+        buffer = BytesIO()
+        np.save(buffer, np.zeros((3, 4), dtype=np.float32))
+        buffer.seek(0)
+        header = read_npy_header(buffer)
+        assert header.shape == (3, 4)
+        assert header.dtype == np.float32
+        assert header.fortran_order is False
+        assert header.data_offset == buffer.tell()
+        assert len(buffer.getvalue()) - header.data_offset == 3 * 4 * 4
+
+    def test_reads_fortran_order(self):
+        buffer = BytesIO()
+        np.save(buffer, np.asfortranarray(np.zeros((2, 3))))
+        buffer.seek(0)
+        assert read_npy_header(buffer).fortran_order is True
+
+    def test_invalid_magic_raises_value_error(self):
+        with pytest.raises(ValueError):
+            read_npy_header(BytesIO(b"not valid npy data"))
@@ -8,6 +8,7 @@ import numpy as np
 import pytest
 
 from files_api.files.exceptions import DeserializationError
+from files_api.files.handlers.npy_header import read_npy_header
 from files_api.files.handlers.numpy_handler import NumpyHandler
 
 
@@ -133,3 +134,210 @@ class TestNumpyHandlerObjectArrays:
         result = handler.from_file(buffer)
         assert result[0] == {"key": "value"}
         assert result[1] == {"other": 123}
+
+
+class TestNumpyHandlerFromPath:
+    """Test memory-mapped reads from a path."""
+
+    def test_from_path_invalid_file_raises_error(self):
+        handler = NumpyHandler()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "bad.npy"
+            path.write_bytes(b"not valid npy data")
+            with pytest.raises(DeserializationError):
+                handler.from_path(path)
+
+    def test_from_path_read_write_mode_persists_changes(self):
+        handler = NumpyHandler()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.npy"
+            with open(path, "wb") as f:
+                handler.to_file(np.zeros(3), f)
+            mapped = handler.from_path(path, mmap_mode="r+")
+            mapped[1] = 5.0
+            mapped.flush()
+            del mapped
+            with open(path, "rb") as f:
+                np.testing.assert_array_equal(handler.from_file(f), [0.0, 5.0, 0.0])
+
+
+class CountingBytesIO(BytesIO):
+    """BytesIO that counts bytes read through readinto."""
+
+    bytes_read = 0
+
+    def readinto(self, buffer):
+        n = super().readinto(buffer)
+        self.bytes_read += n
+        return n
+
+
+def saved(arr: np.ndarray) -> BytesIO:
+    buffer = CountingBytesIO()
+    np.save(buffer, arr)
+    buffer.seek(0)
+    return buffer
+
+
+class TestNumpyHandlerReadSlice:
+    """Test read_slice method."""
+
+    @pytest.mark.parametrize(
+        "index",
+        [
+            slice(2, 7),
+            slice(None),
+            slice(-3, None),
+            slice(1, 9, 3),
+            slice(8, 1, -2),
+            slice(None, None, -1),
+            slice(5, 5),
+            4,
+            -1,
+            np.int64(7),
+            np.int32(-3),
+            (slice(1, 4), 2),
+            (np.intp(3), 1),
+            (3, slice(None, 2)),
+        ],
+    )
+    @pytest.mark.parametrize("order", ["C", "F"])
+    def test_matches_in_memory_indexing(self, index, order):
+        arr = np.asarray(np.arange(60, dtype=np.float32).reshape(10, 3, 2), order=order)
+        result = NumpyHandler().read_slice(saved(arr), index)
+        np.testing.assert_array_equal(result, arr[index])
+
+    def test_sparse_step_on_1d(self):
+        arr = np.arange(1000, dtype=np.int64)
+        np.testing.assert_array_equal(
+            NumpyHandler().read_slice(saved(arr), slice(0, 1000, 100)), arr[::100]
+        )
+
+    def test_reads_only_selected_rows(self):
+        arr = np.zeros((10_000, 8), dtype=np.float64)
+        buffer = saved(arr)
+        NumpyHandler().read_slice(buffer, slice(5000, 5010))
+        assert buffer.bytes_read == 10 * 8 * 8
+
+    def test_result_is_writable(self):
+        result = NumpyHandler().read_slice(saved(np.arange(10)), slice(0, 5))
+        result[0] = 99
+
+    def test_object_array_falls_back_to_full_load(self):
+        arr = np.array([{"a": 1}, [2], "three"], dtype=object)
+        assert NumpyHandler().read_slice(saved(arr), 1) == [2]
+
+    def test_real_file_uses_positional_reads(self):
+        arr = np.arange(100).reshape(25, 4)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "a.npy"
+            np.save(path, arr)
+            with open(path, "rb") as f:
+                np.testing.assert_array_equal(NumpyHandler().read_slice(f, slice(3, 6)), arr[3:6])
+
+    def test_out_of_range_row_raises(self):
+        with pytest.raises(IndexError):
+            NumpyHandler().read_slice(saved(np.arange(5)), 5)
+
+    def test_zero_dim_raises(self):
+        with pytest.raises(IndexError):
+            NumpyHandler().read_slice(saved(np.array(1.0)), 0)
+
+    def test_bad_index_type_raises(self):
+        with pytest.raises(TypeError):
+            NumpyHandler().read_slice(saved(np.arange(5)), [1, 2])
+
+    @pytest.mark.parametrize("rows", [True, np.False_, 1.0])
+    def test_bool_and_float_rows_raise(self, rows):
+        with pytest.raises(TypeError):
+            NumpyHandler().read_slice(saved(np.arange(5)), rows)
+
+    def test_negative_numpy_row_out_of_range_raises(self):
+        with pytest.raises(IndexError):
+            NumpyHandler().read_slice(saved(np.arange(5)), np.int64(-6))
+
+    def test_invalid_file_raises(self):
+        with pytest.raises(DeserializationError):
+            NumpyHandler().read_slice(BytesIO(b"not numpy"), 0)
+
+    def test_truncated_data_raises(self):
+        data = saved(np.arange(100)).getvalue()[:-8]
+        with pytest.raises(DeserializationError):
+            NumpyHandler().read_slice(BytesIO(data), slice(90, 100))
+
+
+def tight_npy(arr: np.ndarray) -> bytes:
+    """Serialize a 1-D float64 array with no padding in the .npy header."""
+    header = b"{'descr': '<f8', 'fortran_order': False, 'shape': (%d,), }\n" % len(arr)
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header + arr.tobytes()
+
+
+class TestNumpyHandlerAppendRows:
+    """Test append_rows method."""
+
+    def stored(self, arr: np.ndarray) -> BytesIO:
+        buffer = BytesIO()
+        NumpyHandler().to_file(arr, buffer)
+        return buffer
+
+    def test_append_updates_shape_and_data(self):
+        buffer = self.stored(np.arange(6).reshape(3, 2))
+        shape = NumpyHandler().append_rows(buffer, np.array([[6, 7], [8, 9]]))
+        assert shape == (5, 2)
+        buffer.seek(0)
+        np.testing.assert_array_equal(NumpyHandler().from_file(buffer), np.arange(10).reshape(5, 2))
+
+    def test_append_single_row(self):
+        buffer = self.stored(np.zeros((2, 3)))
+        assert NumpyHandler().append_rows(buffer, np.ones(3)) == (3, 3)
+
+    def test_header_size_never_changes(self):
+        buffer = self.stored(np.zeros(1, dtype=np.uint8))
+        buffer.seek(0)
+        offset = read_npy_header(buffer).data_offset
+        NumpyHandler().append_rows(buffer, np.zeros(10**6, dtype=np.uint8))
+        buffer.seek(0)
+        assert read_npy_header(buffer).data_offset == offset
+
+    def test_sync_runs_before_header_update(self):
+        buffer = self.stored(np.zeros(2))
+        seen = []
+
+        def sync():
+            buffer.seek(0)
+            seen.append(read_npy_header(buffer).shape)
+
+        NumpyHandler().append_rows(buffer, np.ones(3), sync=sync)
+        assert seen == [(2,)]
+
+    def test_trailing_garbage_is_truncated(self):
+        buffer = self.stored(np.zeros(2))
+        buffer.seek(0, 2)
+        buffer.write(b"partial")
+        NumpyHandler().append_rows(buffer, np.ones(1))
+        buffer.seek(0)
+        np.testing.assert_array_equal(NumpyHandler().from_file(buffer), [0, 0, 1])
+        assert (
+            len(buffer.getvalue()) == read_npy_header(BytesIO(buffer.getvalue())).data_offset + 24
+        )
+
+    def test_no_header_room_returns_none(self):
+        tight = tight_npy(np.zeros(9))
+        buffer = BytesIO(tight)
+        assert NumpyHandler().append_rows(buffer, np.ones(1)) is None
+        assert buffer.getvalue() == tight
+
+    @pytest.mark.parametrize(
+        ("arr", "rows"),
+        [
+            (np.zeros((2, 3)), np.zeros((1, 4))),
+            (np.zeros(3, dtype=np.int32), np.zeros(1, dtype=np.float64)),
+            (np.asfortranarray(np.zeros((2, 3))), np.zeros((1, 3))),
+            (np.array(1.0), np.zeros(1)),
+            (np.array([{}], dtype=object), np.array([{}], dtype=object)),
+        ],
+        ids=["shape", "dtype", "fortran", "0-d", "object"],
+    )
+    def test_invalid_appends_raise(self, arr, rows):
+        with pytest.raises(ValueError):
+            NumpyHandler().append_rows(self.stored(arr), rows)
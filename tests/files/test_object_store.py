@@ -0,0 +1,163 @@
+"""Tests for ObjectStoreFileSystem against the in-process stand-in server."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from files_api.files import IFileSystem, ObjectStoreError, ObjectStoreFileSystem
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+from files_api.files.object_store_client import ByteBudget, ObjectStoreClient
+from files_api.files.object_store_server import LIST_PAGE_SIZE, ObjectStoreServer
+
+
+@pytest.fixture
+def server():
+    with ObjectStoreServer() as server:
+        yield server
+
+
+@pytest.fixture
+def fs(server):
+    with ObjectStoreFileSystem(server.endpoint, "bucket", prefix="data/", part_size=1024) as fs:
+        yield fs
+
+
+class TestObjectStoreFileSystem:
+    """Test IFileSystem semantics."""
+
+    def test_is_ifilesystem(self, fs):
+        assert isinstance(fs, IFileSystem)
+
+    def test_save_get_small(self, fs, server):
+        fs.save("config", {"a": 1})
+        assert fs.get("config") == {"a": 1}
+        assert ("bucket", "data/config.json") in server.objects
+        assert "POST" not in server.requests  # single PUT, no multipart
+
+    def test_large_array_uses_parts_and_ranges(self, fs, server):
+        array = np.arange(10_000, dtype=np.float64)
+        fs.save("big", array)
+        assert server.requests["POST"] == 2  # initiate + complete
+        assert server.requests["PUT"] > 10
+        np.testing.assert_array_equal(fs.get("big"), array)
+        assert not server._uploads
+
+    def test_collision(self, fs):
+        fs.save("k", [1])
+        with pytest.raises(FileExistsError):
+            fs.save("k", np.zeros(3))
+
+    def test_conditional_write_rejects_race(self, fs):
+        fs.save("k", [1])
+        with pytest.raises(FileExistsError), fs._open("k.json", "wb") as f:
+            f.write(b"[2]")
+        assert fs.get("k") == [1]
+
+    def test_failed_write_publishes_nothing(self, fs, server):
+        with pytest.raises(RuntimeError), fs._open("k.npy", "wb") as f:
+            f.write(b"x" * 5000)
+            raise RuntimeError("handler failed")
+        assert not fs.exists("k")
+        assert not server._uploads
+
+    def test_missing(self, fs):
+        with pytest.raises(FileNotFoundError):
+            fs.get("missing")
+        with pytest.raises(FileNotFoundError):
+            fs.delete("missing")
+        with pytest.raises(FileNotFoundError):
+            fs._open("missing.json", "rb")
+
+    def test_keys_count_exists_delete(self, fs):
+        for key in ["a", "a.b", "a/x", "b"]:
+            fs.save(key, [key])
+        assert list(fs.keys()) == ["a", "a.b", "a/x", "b"]
+        assert fs.count("a") == 3
+        assert fs.exists("a") and not fs.exists("c")
+        fs.delete("a")
+        assert not fs.exists("a")
+        assert fs.exists("a.b")
+
+    def test_listing_pages(self, server):
+        client = ObjectStoreClient(server.endpoint, "bucket")
+        for i in range(LIST_PAGE_SIZE + 5):
+            server.objects[("bucket", f"k{i:05d}.json")] = b"[]"
+        assert len(list(client.list_objects("k"))) == LIST_PAGE_SIZE + 5
+        client.close()
+
+    def test_batches(self, fs):
+        result = fs.save_many({f"k{i}": np.full(300, i) for i in range(8)})
+        assert result.ok
+        loaded = fs.get_many([f"k{i}" for i in range(8)] + ["missing"])
+        np.testing.assert_array_equal(loaded.values["k7"], np.full(300, 7))
+        assert isinstance(loaded.errors["missing"], FileNotFoundError)
+
+
+class TestObjectStoreTransfers:
+    """Test parallelism, pooling and the in-flight budget."""
+
+    def test_parallel_parts(self):
+        with (
+            ObjectStoreServer(latency=0.02) as server,
+            ObjectStoreFileSystem(server.endpoint, "b", part_size=4096, max_workers=4) as fs,
+        ):
+            array = np.random.default_rng(0).random(8192)
+            fs.save("x", array)
+            np.testing.assert_array_equal(fs.get("x"), array)
+            assert server.max_concurrency > 1
+
+    def test_budget_bounds_inflight(self):
+        with (
+            ObjectStoreServer(latency=0.01) as server,
+            ObjectStoreFileSystem(
+                server.endpoint, "b", part_size=1000, max_workers=8, max_inflight_bytes=2000
+            ) as fs,
+        ):
+            fs.save("x", np.zeros(2000))
+            assert server.max_concurrency <= 2 + 1  # two parts plus the caller's request
+
+    def test_connections_are_reused(self, server):
+        client = ObjectStoreClient(server.endpoint, "b", pool_size=2)
+        for i in range(10):
+            client.put(f"k{i}", b"x")
+        assert len(client._open) == 1
+        client.close()
+
+    def test_error_status(self, server):
+        client = ObjectStoreClient(server.endpoint, "b")
+        with pytest.raises(ObjectStoreError) as info:
+            client.head("missing")
+        assert info.value.status == 404
+        client.close()
+
+    def test_invalid_endpoint(self):
+        with pytest.raises(ValueError):
+            ObjectStoreClient("ftp://host", "b")
+
+
+class TestByteBudget:
+    """Test the in-flight byte budget."""
+
+    def test_blocks_until_released(self):
+        budget = ByteBudget(10)
+        budget.acquire(8)
+        acquired = threading.Event()
+
+        def take():
+            budget.acquire(5)
+            acquired.set()
+
+        thread = threading.Thread(target=take)
+        thread.start()
+        assert not acquired.wait(0.05)
+        budget.release(8)
+        assert acquired.wait(1)
+        thread.join()
+        assert budget.in_use == 5
+
+    def test_oversized_request_is_clamped(self):
+        budget = ByteBudget(10)
+        with budget.hold(100):
+            assert budget.in_use == 10
+        assert budget.in_use == 0
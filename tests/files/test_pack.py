@@ -0,0 +1,282 @@
+"""Tests for PackFileSystem."""
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from files_api.files import pack_compaction
+from files_api.files.exceptions import FileExistsError, FileNotFoundError, SerializationError
+from files_api.files.pack import PackFileSystem
+from files_api.files.pack_segment import (
+    DELETE,
+    PUT,
+    SEGMENT_MAGIC,
+    encode_record,
+    parse_segment_name,
+    scan_segment,
+    segment_name,
+)
+
+
+def segments(path: str) -> list[str]:
+    return sorted(name for name in os.listdir(path) if parse_segment_name(name) is not None)
+
+
+class TestPackSegment:
+    """Tests for the segment record format."""
+
+    def test_roundtrip(self):
+        data = (
+            SEGMENT_MAGIC
+            + encode_record("a.json", b"{}", 1)
+            + encode_record("a.json", b"", 2, DELETE)
+        )
+        records, valid = scan_segment(memoryview(data), 7)
+        assert valid == len(data)
+        assert [(r.name, r.kind, r.seq, r.segment) for r in records] == [
+            ("a.json", PUT, 1, 7),
+            ("a.json", DELETE, 2, 7),
+        ]
+        first = records[0]
+        assert data[first.data_offset : first.offset + first.size] == b"{}"
+
+    def test_stops_at_corrupt_record(self):
+        good = SEGMENT_MAGIC + encode_record("a.json", b"{}", 1)
+        bad = bytearray(encode_record("b.json", b"[1]", 2))
+        bad[-1] ^= 0xFF
+        records, valid = scan_segment(memoryview(good + bad), 1)
+        assert [r.name for r in records] == ["a.json"]
+        assert valid == len(good)
+
+    def test_stops_at_truncated_record(self):
+        good = SEGMENT_MAGIC + encode_record("a.json", b"{}", 1)
+        torn = encode_record("b.json", b"[1, 2, 3]", 2)[:-3]
+        records, valid = scan_segment(memoryview(good + torn), 1)
+        assert len(records) == 1
+        assert valid == len(good)
+
+    def test_requires_magic(self):
+        with pytest.raises(ValueError, match="no pack header"):
+            scan_segment(memoryview(b"garbage!"), 1)
+
+    def test_segment_names(self):
+        assert parse_segment_name(segment_name(42)) == 42
+        assert parse_segment_name(".pack.lock") is None
+
+
+class TestPackFileSystem:
+    """Tests for saving, reading and listing."""
+
+    def test_save_and_get(self):
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            fs.save("cfg", {"a": 1})
+            fs.save("arr", np.arange(5))
+            assert fs.get("cfg") == {"a": 1}
+            np.testing.assert_array_equal(fs.get("arr"), np.arange(5))
+            assert segments(tmpdir) == [segment_name(1)]
+
+    def test_duplicate_key(self):
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            fs.save("k", [1])
+            with pytest.raises(FileExistsError):
+                fs.save("k", np.zeros(1))
+
+    def test_missing_key(self):
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            PackFileSystem(tmpdir) as fs,
+            pytest.raises(FileNotFoundError),
+        ):
+            fs.get("missing")
+
+    def test_failed_serialization_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            with pytest.raises(SerializationError):
+                fs.save("bad", {"x": object()})
+            assert not fs.exists("bad")
+            fs.save("bad", {"x": 1})
+            assert fs.get("bad") == {"x": 1}
+
+    def test_keys_and_count(self):
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            for key in ["b/2", "a/1", "b/1", "c"]:
+                fs.save(key, {})
+            assert list(fs.keys("b/")) == ["b/1", "b/2"]
+            assert fs.count() == 4
+            assert fs.count("a/") == 1
+
+    def test_compressed(self):
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            fs.save("big", list(range(1000)), compression="gzip")
+            assert fs.get("big") == list(range(1000))
+            with fs._open("big.json.gz", "rb") as f:
+                assert f.read(2) == b"\x1f\x8b"
+
+    def test_rolls_segments(self):
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            PackFileSystem(tmpdir, segment_bytes=200) as fs,
+        ):
+            for i in range(20):
+                fs.save(f"k{i}", {"value": i})
+            assert len(segments(tmpdir)) > 1
+            assert all(fs.get(f"k{i}") == {"value": i} for i in range(20))
+
+    def test_reopen(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with PackFileSystem(tmpdir, segment_bytes=200) as fs:
+                for i in range(20):
+                    fs.save(f"k{i}", {"value": i})
+                fs.delete("k3")
+            with PackFileSystem(tmpdir, segment_bytes=200) as fs:
+                assert fs.count() == 19
+                assert not fs.exists("k3")
+                assert fs.get("k19") == {"value": 19}
+                fs.save("k3", [3])
+                assert fs.get("k3") == [3]
+
+    def test_second_instance_rejected(self):
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            PackFileSystem(tmpdir),
+            pytest.raises(RuntimeError, match="already open"),
+        ):
+            PackFileSystem(tmpdir)
+
+    def test_closed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = PackFileSystem(tmpdir)
+            fs.close()
+            with pytest.raises(ValueError, match="closed"):
+                fs.save("k", {})
+
+    def test_concurrent_saves(self):
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            PackFileSystem(tmpdir, segment_bytes=4096) as fs,
+        ):
+
+            def worker(t: int) -> None:
+                for i in range(50):
+                    fs.save(f"t{t}/{i}", {"t": t, "i": i})
+
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert fs.count() == 200
+            assert fs.get("t3/49") == {"t": 3, "i": 49}
+
+
+class TestPackFileSystemRecovery:
+    """Tests for reopening after a crash."""
+
+    def test_torn_tail_truncated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with PackFileSystem(tmpdir) as fs:
+                fs.save("a", {"a": 1})
+            path = Path(tmpdir) / segment_name(1)
+            size = path.stat().st_size
+            with open(path, "ab") as f:
+                f.write(encode_record("b.json", b'{"b": 2}', 2)[:-4])
+            with PackFileSystem(tmpdir) as fs:
+                assert path.stat().st_size == size
+                assert list(fs.keys()) == ["a"]
+                fs.save("b", {"b": 2})
+            with PackFileSystem(tmpdir) as fs:
+                assert fs.get("b") == {"b": 2}
+
+
+class TestPackFileSystemCompaction:
+    """Tests for delete and compact."""
+
+    def test_delete(self):
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            fs.save("k", {})
+            fs.delete("k")
+            assert not fs.exists("k")
+            with pytest.raises(FileNotFoundError):
+                fs.delete("k")
+
+    def test_compact_reclaims_space(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with PackFileSystem(tmpdir, segment_bytes=500) as fs:
+                for i in range(50):
+                    fs.save(f"k{i}", {"value": i})
+                for i in range(0, 50, 2):
+                    fs.delete(f"k{i}")
+                before = sum(os.path.getsize(os.path.join(tmpdir, n)) for n in segments(tmpdir))
+                assert fs.garbage_ratio > 0.5
+                reclaimed = fs.compact()
+                after = sum(os.path.getsize(os.path.join(tmpdir, n)) for n in segments(tmpdir))
+                # Compaction seals the active segment and starts an empty one
+                assert reclaimed == before - after + len(SEGMENT_MAGIC)
+                assert after < before / 2
+                assert fs.garbage_ratio == 0
+                assert fs.count() == 25
+                assert all(fs.get(f"k{i}") == {"value": i} for i in range(1, 50, 2))
+            # Tombstones were dropped and deleted keys stay deleted
+            with PackFileSystem(tmpdir) as fs:
+                assert sorted(fs.keys()) == sorted(f"k{i}" for i in range(1, 50, 2))
+
+    def test_compact_unlinks_oldest_first_with_directory_syncs(self, monkeypatch):
+        events: list[str] = []
+        real_unlink = Path.unlink
+
+        def recording_unlink(path: Path, *args, **kwargs):
+            events.append(path.name)
+            real_unlink(path, *args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            fs.save("a", {"v": 1})
+            with fs._lock:
+                fs._roll()
+            fs.delete("a")  # tombstone in the newer segment
+            fs.save("b", {"v": 2})
+            monkeypatch.setattr(Path, "unlink", recording_unlink)
+            monkeypatch.setattr(pack_compaction, "fsync_dir", lambda path: events.append("fsync"))
+            fs.compact(force=True)
+        assert events == [segment_name(1), "fsync", segment_name(2), "fsync"]
+
+    def test_compact_below_ratio_is_noop(self):
+        with tempfile.TemporaryDirectory() as tmpdir, PackFileSystem(tmpdir) as fs:
+            for i in range(10):
+                fs.save(f"k{i}", {})
+            fs.delete("k0")
+            assert fs.compact() == 0
+            assert fs.compact(force=True) > 0
+            assert fs.compact(force=True) == 0
+
+    def test_delete_after_compaction_survives_reopen(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with PackFileSystem(tmpdir) as fs:
+                fs.save("keep", {"v": 1})
+                fs.save("gone", {"v": 2})
+                fs.delete("gone")
+                fs.compact(force=True)
+                fs.delete("keep")
+                fs.save("keep", {"v": 3})
+            with PackFileSystem(tmpdir) as fs:
+                assert fs.get("keep") == {"v": 3}
+                assert not fs.exists("gone")
+
+    def test_background_compaction(self):
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            PackFileSystem(tmpdir, compact_interval=0.01) as fs,
+        ):
+            for i in range(10):
+                fs.save(f"k{i}", {"v": i})
+            for i in range(9):
+                fs.delete(f"k{i}")
+            for _ in range(500):
+                if fs.garbage_ratio == 0:
+                    break
+                threading.Event().wait(0.01)
+            assert fs.garbage_ratio == 0
+            assert fs.get("k9") == {"v": 9}
@@ -0,0 +1,107 @@
+"""Tests for process-pool serialization in batch saves."""
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+
+from files_api.files import LocalFileSystem
+from files_api.files.exceptions import FileExistsError, SerializationError
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.process_pool import SerializerPool, is_cpu_bound
+
+
+class _KillsWorker:
+    """Terminates the worker process that unpickles it."""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SerializerPool(max_workers=2)
+    yield pool
+    pool.close()
+
+
+class TestSerializerPool:
+    """Test serialization in worker processes."""
+
+    def test_is_cpu_bound(self):
+        factory = FileHandlerFactory(compression={"json": "gzip"})
+        assert is_cpu_bound(factory.get_handler_for_object({"a": 1}))
+        assert not is_cpu_bound(factory.get_handler_for_object(np.zeros(3)))
+
+    def test_serialize(self, pool):
+        handler = FileHandlerFactory().get_handler_for_object({})
+        jobs = {f"k{i}": (handler, {"i": i}) for i in range(50)}
+        outcomes = dict(pool.serialize(jobs))
+        assert sorted(outcomes) == sorted(jobs)
+        assert all(isinstance(data, bytes) for data in outcomes.values())
+
+    def test_errors_per_key(self, pool):
+        handler = FileHandlerFactory().get_handler_for_object({})
+        jobs = {"good": (handler, [1]), "bad": (handler, {1j: 2})}
+        outcomes = dict(pool.serialize(jobs))
+        assert isinstance(outcomes["good"], bytes)
+        assert isinstance(outcomes["bad"], SerializationError)
+
+    def test_unpicklable_falls_back_in_process(self, pool):
+        handler = FileHandlerFactory().get_handler_for_object({})
+        jobs = {"lock": (handler, {"v": threading.Lock()}), "ok": (handler, [1])}
+        outcomes = dict(pool.serialize(jobs))
+        assert isinstance(outcomes["ok"], bytes)
+        assert isinstance(outcomes["lock"], SerializationError)
+
+    def test_broken_pool_restarts(self, caplog):
+        pool = SerializerPool(max_workers=1)
+        handler = FileHandlerFactory().get_handler_for_object({})
+        try:
+            outcomes = dict(
+                pool.serialize({"crash": (handler, _KillsWorker()), "ok": (handler, [1])})
+            )
+            assert isinstance(outcomes["ok"], bytes)
+            assert isinstance(outcomes["crash"], SerializationError)
+            assert "restarting" in caplog.text
+            assert pool._executor is None
+            assert isinstance(dict(pool.serialize({"k": (handler, [2])}))["k"], bytes)
+        finally:
+            pool.close()
+
+
+class TestSaveManyExecutors:
+    """Test LocalFileSystem.save_many execution modes."""
+
+    @pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+    def test_round_trip(self, executor):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, max_processes=2)
+            fs.save("exists", [0])
+            items = {f"json-{i}": {"i": i, "nested": [{"x": i}] * 3} for i in range(40)}
+            items["array"] = np.arange(5)
+            items["exists"] = [1]
+            items["bad"] = object()
+            result = fs.save_many(items, executor=executor)
+            fs.close()
+
+            assert isinstance(result.errors["exists"], FileExistsError)
+            assert isinstance(result.errors["bad"], SerializationError)
+            assert len(result.values) == 41
+            assert fs.get("json-7") == items["json-7"]
+            np.testing.assert_array_equal(fs.get("array"), np.arange(5))
+            assert LocalFileSystem(tmpdir).count("json-") == 40
+
+    def test_process_with_compression(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = LocalFileSystem(tmpdir, max_processes=1)
+            assert fs.save_many({"k": {"a": 1}}, compression="gzip", executor="process").ok
+            fs.close()
+            assert fs.get("k") == {"a": 1}
+            assert fs.info("k").format == "json+gzip"
+
+    def test_unknown_executor(self):
+        with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(ValueError):
+            LocalFileSystem(tmpdir).save_many({"k": 1}, executor="gpu")
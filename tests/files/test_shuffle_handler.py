@@ -0,0 +1,146 @@
+"""Tests for ShuffleHandler."""
+
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from files_api.files import LocalFileSystem
+from files_api.files.exceptions import DeserializationError, SerializationError
+from files_api.files.factory import FileHandlerFactory
+from files_api.files.handlers.numpy_handler import NumpyHandler
+from files_api.files.handlers.shuffle_handler import (
+    COMPRESSORS,
+    ShuffleHandler,
+    delta_decode,
+    delta_encode,
+    shuffle_bytes,
+    unshuffle_bytes,
+)
+
+
+def roundtrip(handler: ShuffleHandler, arr: np.ndarray) -> np.ndarray:
+    buffer = BytesIO()
+    handler.to_file(arr, buffer)
+    buffer.seek(0)
+    return handler.from_file(buffer)
+
+
+class TestFilters:
+    """Test the shuffle and delta filters."""
+
+    def test_shuffle_groups_bytes(self):
+        data = np.array([0x0102, 0x0304], dtype="<u2")
+        assert shuffle_bytes(data).tolist() == [0x02, 0x04, 0x01, 0x03]
+
+    def test_shuffle_roundtrip(self):
+        data = np.linspace(0, 1, 100, dtype=np.float32)
+        restored = unshuffle_bytes(shuffle_bytes(data), data.dtype)
+        np.testing.assert_array_equal(restored, data)
+
+    @pytest.mark.parametrize("dtype", ["i8", "u1", "f4", "f8", "c16"])
+    def test_delta_is_lossless(self, dtype):
+        data = (np.random.default_rng(0).random(1000) * 1000).astype(dtype)
+        np.testing.assert_array_equal(delta_decode(delta_encode(data)), data)
+
+    def test_delta_wraps_around(self):
+        data = np.array([250, 3, 255, 0], dtype=np.uint8)
+        np.testing.assert_array_equal(delta_decode(delta_encode(data)), data)
+
+
+class TestShuffleHandlerRoundtrip:
+    """Test encode/decode across settings and array kinds."""
+
+    @pytest.mark.parametrize("compressor", list(COMPRESSORS))
+    @pytest.mark.parametrize("delta", [False, True])
+    def test_compressors_and_delta(self, compressor, delta):
+        handler = ShuffleHandler(compressor=compressor, delta=delta, chunk_bytes=1000)
+        arr = np.cumsum(np.random.default_rng(1).random(5000))
+        result = roundtrip(handler, arr)
+        np.testing.assert_array_equal(result, arr)
+        assert result.dtype == arr.dtype
+
+    @pytest.mark.parametrize(
+        "arr",
+        [
+            np.arange(24, dtype=np.int16).reshape(2, 3, 4),
+            np.asfortranarray(np.arange(12.0).reshape(3, 4)),
+            np.array([True, False, True]),
+            np.array(3.5),
+            np.zeros((0, 4), dtype=np.float32),
+            np.arange(10)[::2],
+            np.array([(1, 2.0)], dtype=[("a", "i4"), ("b", "f8")]),
+            np.arange(6, dtype=">u4"),
+        ],
+        ids=["3d", "fortran", "bool", "scalar", "empty", "strided", "structured", "big-endian"],
+    )
+    def test_array_kinds(self, arr):
+        result = roundtrip(ShuffleHandler(delta=True, chunk_bytes=7), arr)
+        np.testing.assert_array_equal(result, arr)
+        assert result.dtype == arr.dtype
+        if arr.ndim >= 2:
+            assert result.flags.f_contiguous == arr.flags.f_contiguous
+
+    def test_shuffle_improves_ratio(self):
+        arr = np.sin(np.linspace(0, 100, 100_000)).astype(np.float32)
+        shuffled, plain = BytesIO(), BytesIO()
+        ShuffleHandler().to_file(arr, shuffled)
+        ShuffleHandler(shuffle=False).to_file(arr, plain)
+        assert shuffled.tell() < plain.tell()
+
+
+class TestShuffleHandlerErrors:
+    """Test invalid input."""
+
+    def test_object_array_raises(self):
+        with pytest.raises(SerializationError):
+            ShuffleHandler().to_file(np.array([{}, 1], dtype=object), BytesIO())
+
+    def test_unknown_compressor_raises(self):
+        with pytest.raises(ValueError, match="Unknown compressor"):
+            ShuffleHandler(compressor="zstd")
+
+    def test_bad_magic_raises(self):
+        with pytest.raises(DeserializationError, match="Not a"):
+            ShuffleHandler().from_file(BytesIO(b"\x93NUMPY" + b"\0" * 20))
+
+    def test_truncated_file_raises(self):
+        buffer = BytesIO()
+        ShuffleHandler(chunk_bytes=100).to_file(np.arange(1000), buffer)
+        with pytest.raises(DeserializationError):
+            ShuffleHandler().from_file(BytesIO(buffer.getvalue()[:-5]))
+
+
+class TestFactoryArrayHandler:
+    """Test routing arrays to ShuffleHandler."""
+
+    def test_default_uses_npy(self):
+        assert isinstance(FileHandlerFactory().get_handler_for_object(np.ones(3)), NumpyHandler)
+
+    def test_shuffle_selected_when_configured(self):
+        factory = FileHandlerFactory(array_handler="shuffle")
+        assert isinstance(factory.get_handler_for_object(np.ones(3)), ShuffleHandler)
+
+    def test_object_arrays_fall_back_to_npy(self):
+        factory = FileHandlerFactory(array_handler="shuffle")
+        handler = factory.get_handler_for_object(np.array([None], dtype=object))
+        assert isinstance(handler, NumpyHandler)
+
+    def test_npc_extension_detected(self):
+        handler = FileHandlerFactory().get_handler_for_file(Path("a.npc"))
+        assert isinstance(handler, ShuffleHandler)
+
+    def test_unknown_array_handler_raises(self):
+        with pytest.raises(ValueError, match="Unknown array handler"):
+            FileHandlerFactory(array_handler="zarr")
+
+    def test_local_filesystem_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            handler = ShuffleHandler(delta=True)
+            fs = LocalFileSystem(tmpdir, factory=FileHandlerFactory(array_handler=handler))
+            arr = np.arange(100_000, dtype=np.int64)
+            fs.save("ts", arr)
+            assert (Path(tmpdir) / "ts.npc").exists()
+            np.testing.assert_array_equal(LocalFileSystem(tmpdir).get("ts"), arr)
@@ -0,0 +1,36 @@
+"""Tests for in-memory size estimation."""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from files_api.files.sizing import estimate_size
+
+
+class TestEstimateSize:
+    """Test estimate_size."""
+
+    def test_array_uses_nbytes(self):
+        assert estimate_size(np.zeros((10, 10), dtype=np.float32)) == 400
+
+    def test_nested_containers_are_walked(self):
+        payload = {"values": list(range(100)), "name": "x" * 1000}
+        assert estimate_size(payload) > sys.getsizeof("x" * 1000) + sys.getsizeof(list(range(100)))
+
+    def test_shared_objects_counted_once(self):
+        shared = "y" * 10_000
+        assert estimate_size([shared, shared]) < 2 * sys.getsizeof(shared)
+
+    def test_object_array_includes_elements(self):
+        arr = np.array([{"k": "v" * 1000}], dtype=object)
+        assert estimate_size(arr) > arr.nbytes + 1000
+
+    def test_polars_frame_counts_its_buffers(self):
+        df = pl.DataFrame({"x": np.zeros(100_000)})
+        assert estimate_size(df) == df.estimated_size() >= 800_000
+
+    def test_pandas_frame_counts_deep_memory(self):
+        df = pd.DataFrame({"x": np.zeros(100_000), "s": ["text"] * 100_000})
+        assert estimate_size(df) >= df.memory_usage(deep=True).sum() > 800_000
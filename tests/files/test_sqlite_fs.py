@@ -0,0 +1,174 @@
+"""Tests for SQLiteFileSystem."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+import numpy as np
+import polars as pl
+import pytest
+
+from files_api.files.exceptions import FileExistsError, FileNotFoundError, SerializationError
+from files_api.files.sqlite_fs import SQLiteFileSystem
+
+
+class TestSQLiteFileSystem:
+    """Tests for save, get, exists and count."""
+
+    def test_save_and_get(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            fs.save("cfg", {"a": [1, 2]})
+            fs.save("arr", np.arange(6).reshape(2, 3))
+            fs.save("df", pl.DataFrame({"x": [1, 2]}))
+            assert fs.get("cfg") == {"a": [1, 2]}
+            np.testing.assert_array_equal(fs.get("arr"), np.arange(6).reshape(2, 3))
+            assert fs.get("df").equals(pl.DataFrame({"x": [1, 2]}))
+
+    def test_wal_mode(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = f"{tmpdir}/db.sqlite"
+            with SQLiteFileSystem(path):
+                pass
+            conn = sqlite3.connect(path)
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            conn.close()
+
+    def test_collision(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            fs.save("k", [1])
+            with pytest.raises(FileExistsError):
+                fs.save("k", np.zeros(2))
+            assert fs.get("k") == [1]
+
+    def test_missing(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            assert not fs.exists("missing")
+            with pytest.raises(FileNotFoundError):
+                fs.get("missing")
+
+    def test_failed_serialization_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            with pytest.raises(SerializationError):
+                fs.save("bad", {"x": object()})
+            assert not fs.exists("bad")
+
+    def test_count_and_keys_by_prefix(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            for key in ["b/2", "a/1", "b/1", "b0", "c"]:
+                fs.save(key, {})
+            assert fs.count() == 5
+            assert fs.count("b/") == 2
+            assert fs.count("z") == 0
+            assert list(fs.keys("b")) == ["b/1", "b/2", "b0"]
+
+    def test_delete(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            fs.save("k", [1])
+            fs.delete("k")
+            assert not fs.exists("k")
+            with pytest.raises(FileNotFoundError):
+                fs.delete("k")
+            fs.save("k", [2])
+            assert fs.get("k") == [2]
+
+    def test_compressed(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            fs.save("items", list(range(100)), compression="lzma")
+            assert fs.get("items") == list(range(100))
+            with fs._open("items.json.xz", "rb") as f:
+                assert f.read(1) == b"\xfd"
+            with pytest.raises(FileNotFoundError):
+                fs._open("items.json", "rb")
+
+    def test_persists(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "nested", "db.sqlite")
+            with SQLiteFileSystem(path, durability="always") as fs:
+                fs.save("k", {"v": 1})
+            with SQLiteFileSystem(path) as fs:
+                assert fs.get("k") == {"v": 1}
+
+    @pytest.mark.parametrize(
+        "durability, synchronous, checkpoint",
+        [("none", 1, 1000), ("batch", 1, 100), ("always", 2, 1000)],
+    )
+    def test_durability_pragmas(self, durability, synchronous, checkpoint):
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            SQLiteFileSystem(f"{tmpdir}/db.sqlite", durability=durability) as fs,
+        ):
+            conn = fs._conn()
+            # synchronous is never OFF (0), which can corrupt on an OS crash
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == synchronous
+            assert conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == checkpoint
+
+    def test_unknown_durability(self):
+        with tempfile.TemporaryDirectory() as tmpdir, pytest.raises(ValueError):
+            SQLiteFileSystem(f"{tmpdir}/db.sqlite", durability="sometimes")
+
+
+class TestSQLiteFileSystemBatch:
+    """Tests for save_many and get_many."""
+
+    def test_save_many_collects_errors(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            fs.save("taken", {})
+            items = {f"k{i}": {"i": i} for i in range(1000)}
+            items["taken"] = {}
+            items["bad"] = {"x": object()}
+            result = fs.save_many(items)
+            assert len(result.values) == 1000
+            assert isinstance(result.errors["taken"], FileExistsError)
+            assert isinstance(result.errors["bad"], SerializationError)
+            assert fs.count() == 1001
+
+    def test_get_many(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            fs.save_many({f"k{i}": [i] for i in range(1200)})
+            result = fs.get_many([*(f"k{i}" for i in range(1200)), "missing", "k0"])
+            assert list(result.values)[:3] == ["k0", "k1", "k2"]
+            assert result.values["k1199"] == [1199]
+            assert isinstance(result.errors["missing"], FileNotFoundError)
+
+    def test_concurrent_threads(self):
+        with tempfile.TemporaryDirectory() as tmpdir, SQLiteFileSystem(f"{tmpdir}/db.sqlite") as fs:
+            errors: list[Exception] = []
+
+            def worker(t: int) -> None:
+                try:
+                    for i in range(50):
+                        fs.save(f"t{t}/{i}", {"i": i})
+                        assert fs.get(f"t{t}/{i}") == {"i": i}
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert errors == []
+            assert fs.count() == 200
+
+    def test_connections_of_exited_threads_are_closed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fs = SQLiteFileSystem(f"{tmpdir}/db.sqlite")
+            opened: list[sqlite3.Connection] = []
+
+            def worker(i: int) -> None:
+                fs.save(f"k{i}", [i])
+                opened.append(fs._conn())
+
+            for i in range(5):
+                thread = threading.Thread(target=worker, args=(i,))
+                thread.start()
+                thread.join()
+            # Each new thread closed the connection of the one before
+            for conn in opened[:-1]:
+                with pytest.raises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
+            fs.close()
+            for conn in opened:
+                with pytest.raises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
@@ -0,0 +1,223 @@
+"""Tests for TieredFileSystem."""
+
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from files_api.files import (
+    IFileSystem,
+    LocalFileSystem,
+    MemoryFileSystem,
+    Tier,
+    TieredFileSystem,
+)
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+
+
+@pytest.fixture
+def dirs():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir) / "local", Path(tmpdir) / "remote"
+
+
+class TestTieredFileSystemInit:
+    """Test construction."""
+
+    def test_requires_tiers(self):
+        with pytest.raises(ValueError):
+            TieredFileSystem([])
+
+    def test_last_tier_unbounded(self):
+        with pytest.raises(ValueError, match="source of truth"):
+            TieredFileSystem([MemoryFileSystem(), Tier(MemoryFileSystem(), max_keys=1)])
+
+    def test_unknown_policies(self):
+        with pytest.raises(ValueError):
+            TieredFileSystem([MemoryFileSystem()], write_policy="around")
+        with pytest.raises(ValueError):
+            TieredFileSystem([Tier(MemoryFileSystem(), policy="fifo"), MemoryFileSystem()])
+
+    def test_is_ifilesystem(self):
+        assert isinstance(TieredFileSystem([MemoryFileSystem()]), IFileSystem)
+
+
+class TestTieredFileSystemReads:
+    """Test lookups and promotion."""
+
+    def test_promotes_on_read(self, dirs):
+        local, remote = dirs
+        LocalFileSystem(remote).save("k", {"v": 1})
+        ram = MemoryFileSystem(mode="fast")
+        fs = TieredFileSystem([ram, LocalFileSystem(local), LocalFileSystem(remote)])
+        assert fs.get("k") == {"v": 1}
+        assert ram.exists("k")
+        assert LocalFileSystem(local).exists("k")
+        assert fs.get("k") == {"v": 1}
+        ram_stats, local_stats, remote_stats = fs.stats
+        assert (ram_stats.hits, ram_stats.misses, ram_stats.promotions) == (1, 1, 1)
+        assert (local_stats.hits, local_stats.misses) == (0, 1)
+        assert remote_stats.hits == 1
+        assert ram_stats.hit_rate == 0.5
+
+    def test_missing(self, dirs):
+        fs = TieredFileSystem([MemoryFileSystem(), LocalFileSystem(dirs[1])])
+        with pytest.raises(FileNotFoundError):
+            fs.get("missing")
+        assert [s.misses for s in fs.stats] == [1, 1]
+
+    def test_lru_eviction(self, dirs):
+        remote = LocalFileSystem(dirs[1])
+        for i in range(3):
+            remote.save(f"k{i}", {"v": i})
+        ram = MemoryFileSystem(mode="fast")
+        fs = TieredFileSystem([Tier(ram, max_keys=2), remote])
+        fs.get("k0")
+        fs.get("k1")
+        fs.get("k0")
+        fs.get("k2")  # evicts k1, the least recently used
+        assert sorted(ram.keys()) == ["k0", "k2"]
+        assert fs.stats[0].evictions == 1
+        assert fs.get("k1") == {"v": 1}
+
+    def test_byte_capacity(self, dirs):
+        remote = LocalFileSystem(dirs[1])
+        remote.save("big", np.zeros(1000))
+        remote.save("small", np.zeros(10))
+        ram = MemoryFileSystem(mode="fast")
+        fs = TieredFileSystem([Tier(ram, max_bytes=1000), remote])
+        fs.get("big")
+        fs.get("small")
+        assert list(ram.keys()) == ["small"]
+        assert fs.stats[0].current_bytes <= 1000
+
+    def test_existing_upper_tier_keys_are_tracked(self, dirs):
+        local, remote = dirs
+        LocalFileSystem(remote).save("k", [1])
+        LocalFileSystem(local).save("k", [1])
+        fs = TieredFileSystem([Tier(LocalFileSystem(local), max_keys=10), LocalFileSystem(remote)])
+        assert fs.get("k") == [1]
+        assert fs.stats[0].hits == 1
+        assert fs.stats[0].current_bytes > 0
+
+
+class TestTieredFileSystemWrites:
+    """Test write-through, write-back and delete."""
+
+    def test_write_through(self, dirs):
+        local, remote = dirs
+        fs = TieredFileSystem([LocalFileSystem(local), LocalFileSystem(remote)])
+        fs.save("k", {"v": 1})
+        assert LocalFileSystem(remote).get("k") == {"v": 1}
+        assert LocalFileSystem(local).exists("k")
+        with pytest.raises(FileExistsError):
+            fs.save("k", {"v": 2})
+
+    def test_write_back(self, dirs):
+        local, remote = dirs
+        source = LocalFileSystem(remote)
+        fs = TieredFileSystem(
+            [Tier(LocalFileSystem(local), max_keys=2), source], write_policy="back"
+        )
+        fs.save("a", [1])
+        fs.save("b", [2])
+        assert not source.exists("a")
+        assert fs.exists("a")
+        assert fs.count() == 2
+        assert list(fs.keys()) == ["a", "b"]
+        with pytest.raises(FileExistsError):
+            fs.save("a", [3])
+
+        fs.save("c", [3])  # evicts a, writing it back
+        assert source.get("a") == [1]
+        assert fs.get("a") == [1]
+
+        fs.flush()
+        assert sorted(source.keys()) == ["a", "b", "c"]
+        assert fs.count() == 3
+
+    def test_delete_from_every_tier(self, dirs):
+        local, remote = dirs
+        fs = TieredFileSystem([LocalFileSystem(local), LocalFileSystem(remote)])
+        fs.save("k", [1])
+        fs.delete("k")
+        assert not fs.exists("k")
+        assert not LocalFileSystem(local).exists("k")
+        with pytest.raises(FileNotFoundError):
+            fs.delete("k")
+
+
+class _BlockingFileSystem(MemoryFileSystem):
+    """MemoryFileSystem whose save() waits until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def save(self, key, obj):
+        self.entered.set()
+        assert self.release.wait(timeout=10)
+        super().save(key, obj)
+
+
+class TestTieredFileSystemConcurrency:
+    """Test that slow tier I/O doesn't block other keys."""
+
+    def test_slow_save_does_not_block_reads(self):
+        slow = _BlockingFileSystem()
+        ram = MemoryFileSystem()
+        fs = TieredFileSystem([ram, slow])
+        MemoryFileSystem.save(slow, "cached", 1)
+        assert fs.get("cached") == 1  # promoted to ram
+        saver = threading.Thread(target=fs.save, args=("new", 2))
+        saver.start()
+        assert slow.entered.wait(timeout=10)
+        try:
+            assert fs.get("cached") == 1
+            assert fs.stats[0].hits == 1
+        finally:
+            slow.release.set()
+            saver.join()
+        assert fs.get("new") == 2
+
+    def test_saves_of_one_key_are_serialized(self):
+        slow = _BlockingFileSystem()
+        fs = TieredFileSystem([MemoryFileSystem(), slow])
+        errors = []
+
+        def save():
+            try:
+                fs.save("k", 1)
+            except FileExistsError as e:
+                errors.append(e)
+
+        first = threading.Thread(target=save)
+        first.start()
+        assert slow.entered.wait(timeout=10)
+        second = threading.Thread(target=save)
+        second.start()
+        slow.release.set()
+        first.join()
+        second.join()
+        assert len(errors) == 1
+
+    def test_evicted_key_readable_during_write_back(self):
+        slow = _BlockingFileSystem()
+        ram = MemoryFileSystem()
+        fs = TieredFileSystem([Tier(ram, max_keys=1), slow], write_policy="back")
+        fs.save("a", 1)
+        saver = threading.Thread(target=fs.save, args=("b", 2))
+        saver.start()
+        assert slow.entered.wait(timeout=10)  # writing "a" back to make room
+        try:
+            assert fs.get("a") == 1
+            assert fs.count() == 1  # "b" is not saved yet
+        finally:
+            slow.release.set()
+            saver.join()
+        assert list(ram.keys()) == ["b"]
+        assert fs.stats[0].evictions == 1
+        assert list(fs.keys()) == ["a", "b"]
@@ -0,0 +1,170 @@
+"""Tests for WriteBehindFileSystem."""
+
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+
+from files_api.files import IFileSystem, LocalFileSystem, MemoryFileSystem, WriteBehindFileSystem
+from files_api.files.exceptions import FileExistsError, FileNotFoundError
+
+
+class _GatedFileSystem(MemoryFileSystem):
+    """MemoryFileSystem whose saves wait for a gate to open."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def save(self, key, obj):
+        self.gate.wait(5)
+        super().save(key, obj)
+
+
+class TestWriteBehindFileSystem:
+    """Test queued saves."""
+
+    def test_is_ifilesystem(self):
+        with WriteBehindFileSystem(MemoryFileSystem()) as fs:
+            assert isinstance(fs, IFileSystem)
+
+    def test_writes_reach_inner(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inner = LocalFileSystem(tmpdir)
+            with WriteBehindFileSystem(inner, workers=2) as fs:
+                for i in range(20):
+                    fs.save(f"k{i}", np.full(10, i))
+                assert fs.flush().ok
+                assert inner.count() == 20
+            np.testing.assert_array_equal(inner.get("k7"), np.full(10, 7))
+
+    def test_read_your_writes(self):
+        inner = _GatedFileSystem()
+        with WriteBehindFileSystem(inner) as fs:
+            fs.save("a/1", {"v": 1})
+            assert not inner.exists("a/1")
+            assert fs.pending == 1
+            assert fs.get("a/1") == {"v": 1}
+            assert fs.exists("a/1")
+            assert fs.count("a/") == 1
+            assert list(fs.keys()) == ["a/1"]
+            with pytest.raises(FileExistsError):
+                fs.save("a/1", {"v": 2})
+            inner.gate.set()
+            fs.flush()
+            assert fs.pending == 0
+            assert fs.count("a/") == 1
+            assert inner.get("a/1") == {"v": 1}
+
+    def test_get_returns_the_saved_object(self):
+        inner = _GatedFileSystem()
+        with WriteBehindFileSystem(inner) as fs:
+            obj = {"v": 1}
+            fs.save("k", obj)
+            assert fs.get("k") is obj
+            obj["v"] = 2  # aliasing: this is what gets written
+            inner.gate.set()
+            fs.flush()
+            assert inner.get("k") == {"v": 2}
+
+    def test_listing_does_not_block_saves(self):
+        listing = threading.Event()
+        release = threading.Event()
+
+        class SlowListing(MemoryFileSystem):
+            def keys(self, prefix=""):
+                listing.set()
+                release.wait(5)
+                return super().keys(prefix)
+
+            def count(self, prefix=""):
+                return sum(1 for _ in self.keys(prefix))
+
+        with WriteBehindFileSystem(SlowListing()) as fs:
+            for method in (fs.keys, fs.count):
+                listing.clear()
+                release.clear()
+                lister = threading.Thread(target=method)
+                lister.start()
+                assert listing.wait(5)
+                saver = threading.Thread(target=fs.save, args=(f"during-{method.__name__}", 1))
+                saver.start()
+                saver.join(2)
+                blocked = saver.is_alive()
+                release.set()
+                lister.join()
+                saver.join()
+                assert not blocked
+
+    def test_existing_key_in_inner(self):
+        inner = MemoryFileSystem()
+        inner.save("k", [1])
+        with WriteBehindFileSystem(inner) as fs, pytest.raises(FileExistsError):
+            fs.save("k", [2])
+
+    def test_backpressure(self):
+        inner = _GatedFileSystem()
+        fs = WriteBehindFileSystem(inner, max_pending=2)
+        fs.save("a", [1])
+        fs.save("b", [2])
+        queued = threading.Event()
+
+        def third():
+            fs.save("c", [3])
+            queued.set()
+
+        thread = threading.Thread(target=third)
+        thread.start()
+        assert not queued.wait(0.1)
+        inner.gate.set()
+        assert queued.wait(5)
+        thread.join()
+        assert fs.close().ok
+        assert inner.count() == 3
+
+    def test_byte_bound(self):
+        inner = _GatedFileSystem()
+        fs = WriteBehindFileSystem(inner, max_pending_bytes=1000)
+        fs.save("a", np.zeros(100))  # 800 bytes
+        blocked = threading.Thread(target=fs.save, args=("b", np.zeros(100)))
+        blocked.start()
+        blocked.join(0.1)
+        assert blocked.is_alive()
+        inner.gate.set()
+        blocked.join(5)
+        fs.close()
+        assert inner.count() == 2
+
+    def test_failed_writes_are_reported(self):
+        inner = MemoryFileSystem()
+        with WriteBehindFileSystem(inner) as fs:
+            fs.save("bad", object())
+            fs.save("good", [1])
+            result = fs.flush()
+            assert list(result.errors) == ["bad"]
+            assert fs.flush().ok
+            assert not fs.exists("bad")
+
+    def test_delete_waits_for_write(self):
+        inner = _GatedFileSystem()
+        with WriteBehindFileSystem(inner) as fs:
+            fs.save("k", [1])
+            threading.Timer(0.05, inner.gate.set).start()
+            fs.delete("k")
+            assert not fs.exists("k")
+            with pytest.raises(FileNotFoundError):
+                fs.delete("k")
+
+    def test_closed(self):
+        fs = WriteBehindFileSystem(MemoryFileSystem())
+        fs.close()
+        assert fs.close().ok
+        with pytest.raises(ValueError):
+            fs.save("k", [1])
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError):
+            WriteBehindFileSystem(MemoryFileSystem(), max_pending=0)
+        with pytest.raises(ValueError):
+            WriteBehindFileSystem(MemoryFileSystem(), max_pending_bytes=0)